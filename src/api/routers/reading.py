@@ -4,7 +4,8 @@ from typing import List, Dict, Any
 
 from core.domain.services.ai.llm_text_content_generator import LLMTextContentGenerator
 from core.infrastructure.db.connection import AsyncSessionLocal
-from core.infrastructure.db import text_log
+from core.infrastructure.db.user_ops import get_user_birthdate
+from core.infrastructure.storage.daily_quota import get_daily_count, reserve_daily_slot, release_daily_slot
 from config.constants import DAILY_LIMIT_PER_THEME
 
 router = APIRouter(
@@ -31,24 +32,25 @@ async def generate_reading_content(request: ReadingRequest):
     This endpoint is for external calls only.
     """
     async with AsyncSessionLocal.begin() as session:
-        # Check if users has exceeded daily limit
-        count = await text_log.count_generated_today(session, request.user_id, request.theme)
-        if count >= DAILY_LIMIT_PER_THEME:
-            raise HTTPException(
-                status_code=429, 
-                detail=f"Daily limit of {DAILY_LIMIT_PER_THEME} generations per theme exceeded"
-            )
-        
-        # Get users age
-        age = await get_user_age(request.user_id, session)
-    
+        # Get users birthdate
+        birthdate = await get_user_birthdate(request.user_id, session)
+    if birthdate is None:
+        raise HTTPException(status_code=404, detail="User not found")
+
     # Generate content
     generator = LLMTextContentGenerator(
         uid=request.user_id,
         theme=request.theme,
-        age=age
+        birthdate=birthdate
     )
-    
+
+    # Reserve a slot of the daily limit (atomic check-and-increment) right before generation
+    if not await reserve_daily_slot(request.user_id, request.theme, DAILY_LIMIT_PER_THEME):
+        raise HTTPException(
+            status_code=429,
+            detail=f"Daily limit of {DAILY_LIMIT_PER_THEME} generations per theme exceeded"
+        )
+
     try:
         content = await generator.generate_text(request.category)
         
@@ -58,8 +60,12 @@ async def generate_reading_content(request: ReadingRequest):
             card_title=content["card"],
             word_count=len(content["text"].split())
         )
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Error generating content: {str(e)}")
+    except BaseException as e:
+        # The slot is returned on any failure, including cancellation of the request
+        await release_daily_slot(request.user_id, request.theme)
+        if isinstance(e, Exception):
+            raise HTTPException(status_code=500, detail=f"Error generating content: {str(e)}")
+        raise
 
 class CheckLimitRequest(BaseModel):
     user_id: int
@@ -76,11 +82,10 @@ async def check_daily_limit(request: CheckLimitRequest):
     Check if a users has exceeded their daily limit for a specific theme.
     This endpoint is for external calls only.
     """
-    async with AsyncSessionLocal.begin() as session:
-        count = await text_log.count_generated_today(session, request.user_id, request.theme)
-        
-        return LimitResponse(
-            limit_exceeded=count >= DAILY_LIMIT_PER_THEME,
-            current_count=count,
-            max_limit=DAILY_LIMIT_PER_THEME
-        )
\ No newline at end of file
+    count = await get_daily_count(request.user_id, request.theme)
+
+    return LimitResponse(
+        limit_exceeded=count >= DAILY_LIMIT_PER_THEME,
+        current_count=count,
+        max_limit=DAILY_LIMIT_PER_THEME
+    )
\ No newline at end of file
@@ -1,21 +1,42 @@
+import asyncio
 import logging
-from contextlib import asynccontextmanager
+import time
+from contextlib import asynccontextmanager, suppress
 
-import aiohttp
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Request
 from starlette.middleware.authentication import AuthenticationMiddleware
 from starlette.middleware.cors import CORSMiddleware
 
-from config.settings import get_tg_settings, get_db_settings, get_minio_settings
+from config.constants import (
+    STATS_REFRESH_INTERVAL_SECONDS,
+    ACTIVITY_FLUSH_INTERVAL_SECONDS,
+    TEXT_LOG_PARTITIONS_AHEAD,
+    TEXT_LOG_RETENTION_MONTHS,
+    TEXT_LOG_MAINTENANCE_INTERVAL_SECONDS,
+    COUNTER_COALESCING_ENABLED,
+    COUNTER_FLUSH_INTERVAL_SECONDS
+)
+from config.settings import get_tg_settings, get_db_settings, get_minio_settings, get_http_client_settings
 from core.application.commands.notify_service import notify_admin_after_restart
+from core.infrastructure.clients.http_client import init_http_client, close_http_client
 from core.infrastructure.clients.minio_client import init_minio
 from core.infrastructure.clients.mongodb import init_mongo
 from core.infrastructure.clients.postgres import init_db, sqlalchemy_engine
 from core.infrastructure.clients.redis_client import init_redis
+from core.infrastructure.db.activity_buffer import activity_buffer
+from core.infrastructure.db.counters import run_counters_flush, flush_counters
+from core.infrastructure.db.stats_summary import run_stats_refresh
+from core.infrastructure.db.text_log import ensure_text_log_partitions, run_text_log_maintenance
+from core.infrastructure.metrics import http_request_seconds
 from core.infrastructure.security.backend import APIKeyAuthBackend
+from core.infrastructure.storage.daily_quota import close_quota_store
+from core.infrastructure.storage.identity_cache import identity_cache, close_identity_cache
+from core.infrastructure.storage.reading_state_store import close_store
 from core.infrastructure.telegram.telegram_client import TelegramClient, ensure_webhook
 from core.presentation.health.health_router import router as health_router
+from core.presentation.metrics.metrics_router import router as metrics_router
 from core.presentation.telegram.telegram_webhook import router as webhook_router
+from core.presentation.usage.usage_router import router as usage_router
 from core.presentation.user.create_account import router as create_account_router
 from core.presentation.user.user_profile import router as user_profile_router
 
@@ -29,6 +50,14 @@ logging.basicConfig(
 tg_settings = get_tg_settings()
 db_settings = get_db_settings()
 minio_settings = get_minio_settings()
+http_client_settings = get_http_client_settings()
+
+
+async def stop_task(task: asyncio.Task) -> None:
+    """Отменяет фоновую задачу и дожидается её завершения (в том числе незаконченного flush)."""
+    task.cancel()
+    with suppress(asyncio.CancelledError):
+        await task
 
 
 @asynccontextmanager
@@ -37,6 +66,8 @@ async def lifespan(app: FastAPI):
 
     # Инициализация PostgreSQL+SQLAlchemy
     await init_db()
+    # Секции журнала генераций должны существовать до первой записи
+    await ensure_text_log_partitions(TEXT_LOG_PARTITIONS_AHEAD)
 
     # Инициализация MongoDB
     mongo_client = await init_mongo(app, db_settings)
@@ -49,9 +80,8 @@ async def lifespan(app: FastAPI):
     redis_client = await init_redis(app, db_settings)
     app.state.redis = redis_client
 
-    # Инициализация aiohttp-сессии (глобально)
-    session = aiohttp.ClientSession()
-    app.state.aiohttp_session = session
+    # Инициализация общих HTTP-клиентов с пулом соединений (Telegram и AI-провайдеры)
+    session = await init_http_client(app, http_client_settings)
 
     # Глобальный TelegramClient
     tg_client = TelegramClient(tg_settings.bot_token, session)
@@ -67,12 +97,43 @@ async def lifespan(app: FastAPI):
     # Уведомление администратора о перезагрузке
     await notify_admin_after_restart(tg_client)
 
+    # Плановый пересчёт общей статистики (stats_summary)
+    stats_task = asyncio.create_task(run_stats_refresh(STATS_REFRESH_INTERVAL_SECONDS))
+    # Пакетная запись активности пользователей
+    activity_task = asyncio.create_task(activity_buffer.run(ACTIVITY_FLUSH_INTERVAL_SECONDS))
+    # Сброс кэша пользователей, опубликованный другими процессами
+    identity_task = asyncio.create_task(identity_cache.listen())
+    # Новые секции журнала генераций и удаление устаревших
+    text_log_task = asyncio.create_task(run_text_log_maintenance(
+        TEXT_LOG_PARTITIONS_AHEAD, TEXT_LOG_RETENTION_MONTHS, TEXT_LOG_MAINTENANCE_INTERVAL_SECONDS
+    ))
+    # Пакетная запись звёзд и счётчиков тем (если включена)
+    counters_task = None
+    if COUNTER_COALESCING_ENABLED:
+        counters_task = asyncio.create_task(run_counters_flush(COUNTER_FLUSH_INTERVAL_SECONDS))
+
     yield
 
+    for task in (stats_task, activity_task, identity_task, text_log_task):
+        await stop_task(task)
+    # Дописываем остаток буфера активности до закрытия пула соединений
+    try:
+        await activity_buffer.flush()
+    except Exception as e:
+        logging.warning(f"Не удалось записать активность пользователей при остановке: {e}")
+    if counters_task:
+        await stop_task(counters_task)
+        try:
+            await flush_counters()
+        except Exception as e:
+            logging.warning(f"Не удалось записать счётчики при остановке: {e}")
     await sqlalchemy_engine.dispose()
     await mongo_client.close()
     await redis_client.close()
-    await session.close()
+    await close_http_client()
+    await close_store()
+    await close_quota_store()
+    await close_identity_cache()
     logging.info("🛑 Shutting down. Database sessions have been closed.")
 
 
@@ -96,15 +157,33 @@ app.add_middleware(
 
 app.add_middleware(AuthenticationMiddleware, backend=APIKeyAuthBackend())
 
+
+@app.middleware("http")
+async def record_request_time(request: Request, call_next):
+    """Время обработки запроса по шаблону маршрута (webhook Telegram, API), без query и id в пути."""
+    started = time.perf_counter()
+    status_code = 500
+    try:
+        response = await call_next(request)
+        status_code = response.status_code
+        return response
+    finally:
+        route = request.scope.get("route")
+        http_request_seconds.observe(time.perf_counter() - started,
+                                     method=request.method,
+                                     path=getattr(route, "path", "unmatched"),
+                                     status=str(status_code))
+
 # --- Routers
 app.include_router(health_router)
+app.include_router(usage_router)
 app.include_router(create_account_router)
 app.include_router(user_profile_router)
 app.include_router(webhook_router)
+app.include_router(metrics_router)
 
 # --- Кастомный Swagger UI (docs) только для админа
 from fastapi.openapi.docs import get_swagger_ui_html
-from fastapi import Request
 
 
 @app.get("src/api/docs", include_in_schema=False)
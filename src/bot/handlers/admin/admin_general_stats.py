@@ -18,7 +18,7 @@ async def user_repo_dep():
 async def show_general_stats(call: CallbackQuery, is_admin: bool, user_repo = Depends(user_repo_dep)):
     try:
         await call.answer()
-        stats = await get_general_stats(user_repo)
+        stats = await get_general_stats()
 
         msg = (
             f"{hbold('📊 Общая статистика')}\n\n"
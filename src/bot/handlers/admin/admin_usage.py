@@ -0,0 +1,25 @@
+from aiogram import Router, F
+from aiogram.types import CallbackQuery
+
+from bot.handlers.ui.ui_admin import admin_back_menu_kb
+from core.application.security.admin_only import admin_only
+from core.application.services.admin.admin_usage import render_usage_report
+
+router = Router()
+
+
+@router.callback_query(F.data == "admin:usage")
+@admin_only()
+async def show_usage_report(call: CallbackQuery, is_admin: bool):
+    try:
+        await call.answer()
+        await call.message.edit_text(
+            await render_usage_report(),
+            reply_markup=admin_back_menu_kb(),
+            parse_mode="HTML"
+        )
+    except Exception:
+        await call.message.edit_text(
+            "❌ Произошла ошибка при получении расходов. Попробуйте позже.",
+            reply_markup=admin_back_menu_kb()
+        )
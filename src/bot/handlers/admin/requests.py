@@ -6,7 +6,9 @@ from config.settings import get_tg_settings
 from core.application.security.admin_only import admin_only
 from bot.handlers.ui.ui_main import main_menu_inline_kb
 from bot.handlers.ui.ui_admin import admin_back_menu_kb
+from core.domain.services.users.user_progress import invalidate_user_summary
 from core.infrastructure.db.repositories.sqlalchemy_user_repository import SQLAlchemyUserRepository
+from core.infrastructure.storage.identity_cache import identity_cache
 
 router = Router()
 
@@ -95,14 +97,18 @@ async def approve_user(call: CallbackQuery, is_admin: bool):
 
     async with SQLAlchemyUserRepository() as repo:
         user = await repo.get_by_id(user_id)
+        already_approved = bool(user) and user.status == "approved"
+        if user and not already_approved:
+            await repo.update_user_status(user_id, "approved")
 
     if not user:
         await call.answer("❌ Пользователь не найден", show_alert=True)
         return
-    if user.is_approved:
+    if already_approved:
         await call.answer("Уже одобрен", show_alert=True)
         return
-    user.is_approved = True
+    await identity_cache.invalidate(user_id)
+    invalidate_user_summary(user_id)
 
     # Сообщаем в админском чате
     await call.message.edit_text(f"✅ Пользователь {user.name or user.id} одобрен.")
@@ -125,12 +131,15 @@ async def deny_user(call: CallbackQuery, is_admin: bool):
     user_id = int(call.data.split(":", 1)[1])
 
     async with SQLAlchemyUserRepository() as repo:
-        user = repo.get_by_id(user_id)
+        user = await repo.get_by_id(user_id)
+        if user:
+            await repo.delete_user(user_id)
 
     if not user:
         await call.answer("❌ Пользователь не найден", show_alert=True)
         return
-    await s.delete(user)
+    await identity_cache.invalidate(user_id)
+    invalidate_user_summary(user_id)
 
     # Сообщаем в админском чате
     await call.message.edit_text(f"🚫 Пользователь {user.name or user.id} был отклонён и удалён.")
@@ -11,6 +11,8 @@ from core.infrastructure.db.models import User
 from core.application.security.admin_only import admin_only
 from core.domain.models.pagination import PageParams
 from core.application.services.admin.admin_stats import render_user_stats
+from core.domain.services.users.user_progress import invalidate_user_summary
+from core.infrastructure.storage.identity_cache import identity_cache
 from core.domain.services.admin.admin_user_service import fetch_user_stats
 from bot.handlers.ui.ui_admin import admin_pagination_kb, admin_back_menu_kb
 from core.infrastructure.db.repository_factory import RepositoryFactory
@@ -25,9 +27,15 @@ async def user_repo_dep():
 @admin_only()
 async def show_all_users(call: CallbackQuery, is_admin: bool, user_repo = Depends(user_repo_dep)):
     await call.answer()
+    # admin:all_users:<page>[:n|p:<cursor>]
     parts = call.data.split(":")
     page = int(parts[2]) if len(parts) > 2 else 0
     pp = PageParams(page=page, page_size=PAGE_SIZE)
+    if len(parts) > 4:
+        if parts[3] == "n":
+            pp.after_id = int(parts[4])
+        else:
+            pp.before_id = int(parts[4])
 
     user_stats, total = await fetch_user_stats(pp)
     if not user_stats:
@@ -39,7 +47,7 @@ async def show_all_users(call: CallbackQuery, is_admin: bool, user_repo = Depend
 
     await call.message.edit_text(
         text,
-        reply_markup=admin_pagination_kb(pp.page, total, PAGE_SIZE),
+        reply_markup=admin_pagination_kb(pp.page, total, PAGE_SIZE, user_stats[0].key, user_stats[-1].key),
         parse_mode="HTML"
     )
 
@@ -60,6 +68,7 @@ async def reset_user(call: CallbackQuery, is_admin: bool, user_repo = Depends(us
         user.streak = 0
         await s.execute(user_ops.delete_theme_stats_for_user(user_id))
 
+    invalidate_user_summary(user_id)
     await call.answer("♻️ Статистика сброшена")
     # После сброса показываем обновлённую информацию
     text, user = await render_user_stats(user_id)
@@ -84,6 +93,9 @@ async def delete_user(call: CallbackQuery, is_admin: bool, state: FSMContext):
             await s.execute(user_ops.delete_theme_stats_for_user(user_id))
             await s.delete(user)
 
+    if user:
+        await identity_cache.invalidate(user.telegram_id)
+        invalidate_user_summary(user.telegram_id)
     await call.answer("🗑 Удалён")
     await call.message.edit_text(f"🗑 Пользователь {user_id} удалён.")
     await state.set_state("awaiting_user_id")
@@ -8,16 +8,17 @@ from aiogram.types import CallbackQuery
 from fastapi import Depends
 
 from bot.handlers.ui.ui_main import reading, topics_kb, categories_kb
-from config.constants import ACTIVE_QUESTION_KEY, MAX_ATTEMPTS
+from bot.utils.telegram_helpers import ThrottledTextEditor
+from config.constants import MAX_ATTEMPTS
 from config.content import CATEGORIES
 from core.application.decorators.block import async_with_generating_flag
 from core.application.security.approved_user_only import is_approved_user
-from core.application.services.users.user_flags import delete_blocking_message
+from core.application.services.users.user_flags import delete_blocking_message, set_active_question
 from core.domain.services.reading.reading_result import save_card_and_notify
 from core.domain.services.reading.reading_service import prepare_next_question, prepare_first_question, \
-    has_exceeded_daily_limit
-from core.domain.services.users.user_progress import accuracy
-from core.infrastructure.clients.redis_client import rc as redis_client
+    reserve_daily_reading
+from core.infrastructure.storage.daily_quota import release_daily_slot
+from core.infrastructure.storage.reading_state_store import save_session, load_session
 from core.infrastructure.db.repository_factory import RepositoryFactory
 
 router = Router()
@@ -43,7 +44,8 @@ async def questions_handler(call: CallbackQuery,
     # if await block_if_pending_message(call.message, state):
     #     return
 
-    if await has_exceeded_daily_limit(call.from_user.id, theme):
+    # Слот лимита резервируется сразу, чтобы параллельные чтения не прошли сверх лимита
+    if not await reserve_daily_reading(call.from_user.id, theme):
         # 1) показываем alert (ждём завершения этого запроса)
         await call.answer(
             f"❗Ты ответил на все вопросы по этой теме.\n🦸🏻 Попробуй завтра",
@@ -67,19 +69,8 @@ async def questions_handler(call: CallbackQuery,
             )
         return
     await call.answer()
-    await redis_client.set(ACTIVE_QUESTION_KEY.format(user_id=call.from_user.id), 1, ex=600)
-    await call.message.edit_text("✍️ Генерирую текст…", protect_content=True)
-    try:
-        reading_state = await prepare_first_question(call.from_user.id, category, theme)
-        await delete_blocking_message(dispatcher["redis"], call.from_user.id, call.message.bot, call.message.chat.id)
-    except RuntimeError as err:
-        await call.message.edit_text(str(err))
-        return
-
-    # сохраняем всё в FSM
-    await state.update_data(**reading_state.__dict__)
-
-    # Удаляем старое сообщение-заглушку
+    await set_active_question(dispatcher["redis"], call.from_user.id)
+    # Удаляем меню и сразу создаём **новое** защищённое сообщение, в котором текст появится по мере генерации
     try:
         await call.bot.delete_message(
             chat_id=call.message.chat.id,
@@ -87,16 +78,31 @@ async def questions_handler(call: CallbackQuery,
         )
     except:
         pass
-
-    # Создаём **новое** сообщение с защитой и полным текстом
     gen_msg = await call.bot.send_message(
         chat_id=call.message.chat.id,
-        text=reading_state.full_text,
+        text="✍️ Генерирую текст…",
         protect_content=True
     )
+    editor = ThrottledTextEditor(call.bot, call.message.chat.id, gen_msg.message_id, placeholder=gen_msg.text)
+    try:
+        reading_state = await prepare_first_question(call.from_user.id, category, theme, on_text=editor.update)
+        await delete_blocking_message(dispatcher["redis"], call.from_user.id, call.message.bot, call.message.chat.id)
+    except BaseException as err:
+        # Слот лимита возвращается при любом сбое, в том числе при отмене хендлера
+        await release_daily_slot(call.from_user.id, theme)
+        if isinstance(err, RuntimeError):
+            await editor.finish(str(err))
+            return
+        raise
+
+    # Выставляем полный нормализованный текст
+    await editor.finish(reading_state.full_text)
     # перед показом первого вопроса
     keyboard, shuffled_options = reading(reading_state.qa[0]["options"])
-    await state.update_data(reading_options=shuffled_options)
+
+    # Сессия чтения хранится в Redis отдельно от FSM, в FSM — только маркер theme для guards
+    await save_session(reading_state, shuffled_options)
+    await state.update_data(theme=reading_state.theme)
 
     # показываем первый вопрос
     try:
@@ -120,22 +126,21 @@ async def questions_handler(call: CallbackQuery,
 @is_approved_user()
 async def answer_handler(call: CallbackQuery, is_approved: bool, state: FSMContext, dispatcher: Dispatcher):
     # await call.answer()
-    data = await state.get_data()
+    session = await load_session(call.from_user.id)
+    if session is None:
+        await call.answer("Вопрос устарел. Выбери тему заново.", show_alert=True)
+        await state.clear()
+        return
+    reading_state, options = session
     chosen_idx = int(call.data.split("|", 1)[1])
-    options = data['reading_options']
     chosen = options[chosen_idx]
 
-    # Остальные поля — для reading_state
-    reading_data = {k: v for k, v in data.items() if k not in ('reading_options', 'category')}
-    reading_state = ReadingState(**reading_data)
-
+    # Точность записывается один раз в конце викторины (save_card_and_notify)
     if chosen == reading_state.correct:
-        await accuracy(reading_state.uid, True)
         await save_card_and_notify(call, state, reading_state, dispatcher)
         return
 
     # Если дошли сюда — ответ неверный
-    await accuracy(reading_state.uid, False)
     reading_state.wrong += 1
 
     # Если ошибок >= лимита (например, 2) — финал
@@ -143,8 +148,7 @@ async def answer_handler(call: CallbackQuery, is_approved: bool, state: FSMConte
         await save_card_and_notify(call, state, reading_state, dispatcher)
         return
 
-    # Не достигли лимита ошибок — задаём следующий вопрос
-    await state.update_data(wrong=reading_state.wrong)
+    # Не достигли лимита ошибок — задаём следующий вопрос (ошибки сохраняются вместе с прогрессом)
     await prepare_next_question(call, state, reading_state)
 
 
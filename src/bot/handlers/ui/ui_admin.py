@@ -11,11 +11,12 @@ def admin_panel_inline_kb():
     kb.button(text="  📊 Все пользователи  ", callback_data="admin:all_users:0")
     kb.button(text="ℹ️ Пользователь", callback_data="admin:lookup_user")
     kb.button(text="📈 Статистика", callback_data="admin:stats")
+    kb.button(text="💰 Расходы LLM", callback_data="admin:usage")
     kb.button(text="🔄 Перезагрузить бота", callback_data="admin:restart")
     kb.button(text="🔑 Сбросить ключи Redis", callback_data="admin:redis_del")
     # Кнопка "Назад" последней
     kb.button(text="🔙 В меню", callback_data="admin:back")
-    kb.adjust(2, 2, 1, 1)  # 2 в ряд, потом 1 отдельная кнопка
+    kb.adjust(2, 2, 2, 1)  # 2 в ряд, потом 1 отдельная кнопка
     return kb.as_markup()
 
 def admin_back_menu_kb():
@@ -28,18 +29,22 @@ def admin_back_menu_kb():
         ]
     )
 
-def admin_pagination_kb(page: int, total: int, page_size: int):
+def admin_pagination_kb(page: int, total: int, page_size: int, first_id: int, last_id: int):
     """
     Возвращает инлайн-клавиатуру для пагинации с кнопкой "В меню".
+    В callback_data кроме номера страницы передаётся курсор keyset-пагинации:
+    p:<id первой записи> для предыдущей страницы и n:<id последней записи> для следующей.
     :param page: текущая страница
     :param total: общее количество элементов
     :param page_size: количество на странице
+    :param first_id: id первой записи на странице
+    :param last_id: id последней записи на странице
     """
     kb = InlineKeyboardBuilder()
     if page > 0:
-        kb.button(text="◀️ Назад", callback_data=f"admin:all_users:{page - 1}")
+        kb.button(text="◀️ Назад", callback_data=f"admin:all_users:{page - 1}:p:{first_id}")
     if (page + 1) * page_size < total:
-        kb.button(text="▶️ Вперёд", callback_data=f"admin:all_users:{page + 1}")
+        kb.button(text="▶️ Вперёд", callback_data=f"admin:all_users:{page + 1}:n:{last_id}")
     kb.row(
         InlineKeyboardButton(text="🔙 Назад", callback_data="admin")
     )
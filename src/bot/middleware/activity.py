@@ -1,11 +1,9 @@
-from datetime import datetime, timezone
 from typing import Callable, Dict, Any, Awaitable
 
 from aiogram import BaseMiddleware
 from aiogram.types import TelegramObject
 
-from core.infrastructure.db.connection import AsyncSessionLocal
-from core.infrastructure.db.models import User
+from core.infrastructure.db.activity_buffer import activity_buffer
 
 
 class LastActiveMiddleware(BaseMiddleware):
@@ -17,11 +15,6 @@ class LastActiveMiddleware(BaseMiddleware):
     ) -> Any:
         user = data.get("event_from_user")
         if user:
-            async with AsyncSessionLocal.begin() as session:
-                db_user = await session.get(User, user.id)
-                if db_user:
-                    now = datetime.now(timezone.utc)
-                    if not db_user.first_active:
-                        db_user.first_active = now
-                    db_user.last_active = now
+            # В БД активность пишется пакетно фоновой задачей (см. activity_buffer)
+            activity_buffer.touch(user.id)
         return await handler(event, data)
@@ -1,8 +1,8 @@
 from aiogram import BaseMiddleware
 from aiogram.types import Message
 
-from config.constants import KIND_TO_MESSAGE, BLOCK_MSG_KEY
-from core.application.services.users.user_flags import get_generating_status
+from config.constants import KIND_TO_MESSAGE
+from core.application.services.users.user_flags import get_user_flags, set_blocking_message
 
 
 class CommandBlockerMiddleware(BaseMiddleware):
@@ -11,20 +11,18 @@ class CommandBlockerMiddleware(BaseMiddleware):
             dispatcher = data["dispatcher"]
             redis = dispatcher["redis"]
             user_id = event.from_user.id
-            kind = await get_generating_status(redis, user_id)
-            if kind in KIND_TO_MESSAGE:
-                key = BLOCK_MSG_KEY.format(user_id=user_id)
-                # 1. Удаляем предыдущее сообщение, если есть
-                prev_msg_id = await redis.get(key)
-                if prev_msg_id:
+            # Все флаги пользователя — одним запросом к Redis
+            flags = await get_user_flags(redis, user_id)
+            if flags.generating in KIND_TO_MESSAGE:
+                # 1. Отправляем новое сообщение
+                sent = await event.answer(KIND_TO_MESSAGE[flags.generating])
+                # 2. Сохраняем новое message_id и атомарно получаем предыдущее
+                previous = await set_blocking_message(redis, user_id, sent.message_id)
+                # 3. Удаляем предыдущее сообщение, если есть
+                if previous and previous != sent.message_id:
                     try:
-                        await event.bot.delete_message(event.chat.id, int(prev_msg_id))
+                        await event.bot.delete_message(event.chat.id, previous)
                     except Exception:
                         pass
-                    await redis.delete(key)
-                # 2. Отправляем новое сообщение
-                sent = await event.answer(KIND_TO_MESSAGE[kind])
-                # 3. Сохраняем новое message_id
-                await redis.set(key, sent.message_id, ex=60)
                 return
         return await handler(event, data)
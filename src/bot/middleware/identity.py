@@ -0,0 +1,14 @@
+from typing import Any, Dict, Optional
+
+from core.infrastructure.storage.identity_cache import identity_cache, UserIdentity
+
+
+async def resolve_identity(data: Dict[str, Any]) -> Optional[UserIdentity]:
+    """
+    Возвращает UserIdentity автора апдейта. Загружается один раз на апдейт
+    и сохраняется в data["identity"], остальные middleware берут её оттуда.
+    """
+    if "identity" not in data:
+        user = data.get("event_from_user")
+        data["identity"] = await identity_cache.get(user.id) if user else None
+    return data["identity"]
@@ -0,0 +1,35 @@
+import time
+from typing import Callable, Dict, Any, Awaitable
+
+from aiogram import BaseMiddleware
+from aiogram.types import TelegramObject
+
+from core.infrastructure.metrics import handler_seconds, handler_failures
+
+
+class HandlerMetricsMiddleware(BaseMiddleware):
+    """
+    Замеряет время работы хендлера (bot_handler_duration_seconds) и считает упавшие хендлеры.
+    Регистрируется как inner-middleware роутера, чтобы в data уже был выбранный handler.
+    """
+
+    async def __call__(
+            self,
+            handler: Callable[[TelegramObject, Dict[str, Any]], Awaitable[Any]],
+            event: TelegramObject,
+            data: Dict[str, Any]
+    ) -> Any:
+        handler_object = data.get("handler")
+        callback = getattr(handler_object, "callback", None)
+        labels = {
+            "handler": getattr(callback, "__name__", "unknown"),
+            "event": type(event).__name__,
+        }
+        started = time.perf_counter()
+        try:
+            return await handler(event, data)
+        except Exception:
+            handler_failures.inc(**labels)
+            raise
+        finally:
+            handler_seconds.observe(time.perf_counter() - started, **labels)
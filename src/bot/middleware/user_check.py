@@ -2,9 +2,8 @@ from typing import Callable, Awaitable, Dict, Any
 
 from aiogram import BaseMiddleware
 from aiogram.types import TelegramObject
-from async_lru import alru_cache
 
-from core.infrastructure.db.repositories.sqlalchemy_user_repository import SQLAlchemyUserRepository
+from bot.middleware.identity import resolve_identity
 
 
 class UserCheckMiddleware(BaseMiddleware):
@@ -14,12 +13,6 @@ class UserCheckMiddleware(BaseMiddleware):
             event: TelegramObject,
             data: Dict[str, Any]
     ) -> Any:
-        user = data.get("event_from_user")
-        data["is_approved"] = await self.is_approved(user.id) if user else False
+        identity = await resolve_identity(data)
+        data["is_approved"] = bool(identity and identity.is_approved)
         return await handler(event, data)
-
-    @alru_cache(maxsize=1024)
-    async def is_approved(self, user_id: int) -> bool:
-        async with SQLAlchemyUserRepository() as repo:
-            user = await repo.get_by_id(user_id)
-            return user and user.is_approved
@@ -1,7 +1,16 @@
+import asyncio
+import logging
+import time
+
 from aiogram import Bot
-from aiogram.exceptions import TelegramBadRequest
+from aiogram.exceptions import TelegramBadRequest, TelegramRetryAfter
 from aiogram.types import InputMedia
 
+from config.constants import STREAM_EDIT_INTERVAL_SECONDS, STREAM_MIN_CHARS_DELTA
+
+logger = logging.getLogger(__name__)
+
+
 async def safe_edit_text(
     bot: Bot,
     chat_id: int,
@@ -49,4 +58,70 @@ async def safe_edit_media(
         if "Message is not modified" in str(e):
             return
         # Пробрасываем прочие ошибки
-        raise
\ No newline at end of file
+        raise
+
+
+class ThrottledTextEditor:
+    """
+    Постепенно обновляет текст сообщения, пока он генерируется.
+
+    Telegram ограничивает частоту edit_message_text, поэтому промежуточные
+    правки отправляются не чаще раза в interval секунд и только если текст
+    вырос хотя бы на min_delta символов. Финальный текст выставляет finish.
+    Пустой текст означает новую попытку генерации: черновик заменяется на placeholder.
+    """
+
+    CURSOR = " ▌"
+
+    def __init__(self,
+                 bot: Bot,
+                 chat_id: int,
+                 message_id: int,
+                 interval: float = STREAM_EDIT_INTERVAL_SECONDS,
+                 min_delta: int = STREAM_MIN_CHARS_DELTA,
+                 placeholder: str = "…"):
+        self.bot = bot
+        self.chat_id = chat_id
+        self.message_id = message_id
+        self.interval = interval
+        self.min_delta = min_delta
+        self.placeholder = placeholder
+        self._last_at = 0.0
+        self._last_len = 0
+
+    async def update(self, text: str) -> None:
+        """Промежуточная правка: пропускается, если с прошлой прошло слишком мало времени."""
+        if not text:
+            await self.reset()
+            return
+        if time.monotonic() - self._last_at < self.interval or len(text) - self._last_len < self.min_delta:
+            return
+        self._last_at = time.monotonic()
+        self._last_len = len(text)
+        try:
+            await safe_edit_text(self.bot, self.chat_id, self.message_id, text + self.CURSOR)
+        except TelegramRetryAfter as e:
+            self._last_at = time.monotonic() + e.retry_after
+        except TelegramBadRequest as e:
+            logger.warning(f"Не удалось обновить сообщение {self.message_id}: {e}")
+
+    async def reset(self) -> None:
+        """Убирает черновик неудавшейся попытки и начинает отсчёт правок заново."""
+        if self._last_len == 0:
+            return
+        self._last_len = 0
+        self._last_at = time.monotonic()
+        try:
+            await safe_edit_text(self.bot, self.chat_id, self.message_id, self.placeholder)
+        except TelegramRetryAfter as e:
+            self._last_at = time.monotonic() + e.retry_after
+        except TelegramBadRequest as e:
+            logger.warning(f"Не удалось очистить черновик сообщения {self.message_id}: {e}")
+
+    async def finish(self, text: str, **kwargs) -> None:
+        """Выставляет окончательный текст сообщения, дожидаясь окна при флуд-лимите."""
+        try:
+            await safe_edit_text(self.bot, self.chat_id, self.message_id, text, **kwargs)
+        except TelegramRetryAfter as e:
+            await asyncio.sleep(e.retry_after)
+            await safe_edit_text(self.bot, self.chat_id, self.message_id, text, **kwargs)
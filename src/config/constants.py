@@ -1,6 +1,7 @@
 # Limits and Paging
 DEFAULT_PROMPT_LENGTH: int = 150
 DAILY_LIMIT_PER_THEME: int = 5
+DAILY_QUOTA_TIMEZONE: str = "Europe/Moscow"  # полночь в этой зоне сбрасывает дневной лимит
 MAX_ATTEMPTS: int = 3
 MAX_RETRIES: int = 5
 BACKOFF_BASE_SECONDS: int = 1
@@ -8,6 +9,88 @@ PAGE_SIZE: int = 5
 CARDS_PER_PAGE: int = 4
 CARDS_ROW_WIDTH: int = 2
 
+# Reading text pool
+TEXT_POOL_SIZE: int = 3
+TEXT_POOL_LENGTH_STEP: int = 100
+TEXT_POOL_REFILL_RETRIES: int = 3  # подряд неудачных генераций, после которых пополнение откладывается
+
+# Text generation log (месячные секции text_generations)
+TEXT_LOG_PARTITIONS_AHEAD: int = 2
+TEXT_LOG_RETENTION_MONTHS: int = 12
+TEXT_LOG_MAINTENANCE_INTERVAL_SECONDS: int = 24 * 60 * 60
+
+# Text history: весь массив entries живёт в одном документе (лимит MongoDB — 16 МБ).
+# Запись — только отпечатки текста (hash, minhash ~0.8 КБ, emb float16 до ~6 КБ), без самого текста:
+# 1000 записей занимают не больше ~7 МБ
+HISTORY_MAX_ITEMS: int = 1000
+
+# Text uniqueness (MinHash/LSH)
+MINHASH_SIMILARITY_THRESHOLD: float = 0.5
+MINHASH_INDEX_USERS: int = 1000
+
+# Semantic uniqueness (локальные эмбеддинги, extras "semantic")
+SEMANTIC_MODEL_NAME: str = "sentence-transformers/paraphrase-multilingual-MiniLM-L12-v2"
+SEMANTIC_SIMILARITY_THRESHOLD: float = 0.85
+SEMANTIC_INDEX_USERS: int = 500
+
+# LLM hedging
+HEDGE_ENABLED: bool = True
+HEDGE_DEADLINE_MULTIPLIER: float = 1.5
+HEDGE_DEFAULT_DEADLINE_SECONDS: float = 8.0
+HEDGE_MIN_SAMPLES: int = 5
+LATENCY_WINDOW_SIZE: int = 50
+
+# LLM provider router
+ROUTER_MIN_WEIGHT: float = 0.05
+# Априорные веса провайдеров (множитель к адаптивному весу), по умолчанию 1
+ROUTER_PRIOR_WEIGHTS: dict[str, float] = {"deepseek": 0.2}
+ROUTER_BREAKER_FAILURES: int = 3
+ROUTER_BREAKER_COOLDOWN_SECONDS: float = 60.0
+ROUTER_RATE_LIMIT_COOLDOWN_SECONDS: float = 30.0
+
+# LLM usage accounting: цены в USD
+# Текст: (за 1M входных токенов, за 1M выходных); ключ — префикс имени модели
+LLM_TEXT_PRICES = {
+    "gpt-4.1-nano": (0.10, 0.40),
+    "gemini-2.0-flash": (0.10, 0.40),
+    "deepseek/deepseek-r1:free": (0.0, 0.0),
+}
+# Картинки: за одно изображение
+LLM_IMAGE_PRICES = {
+    "dall-e-3": 0.04,
+    "stable-diffusion-xl-lightning": 0.0,
+}
+USAGE_REPORT_DAYS: int = 7
+
+# User summary read model (профиль и /stats)
+USER_SUMMARY_CACHE_TTL: int = 60
+USER_SUMMARY_CACHE_SIZE: int = 1024
+
+# General stats (таблица stats_summary)
+STATS_REFRESH_INTERVAL_SECONDS: int = 5 * 60
+
+# User activity (last_active/first_active пишутся пакетно)
+ACTIVITY_FLUSH_INTERVAL_SECONDS: float = 5.0
+
+# User identity cache (middleware и проверки доступа)
+IDENTITY_CACHE_TTL_SECONDS: float = 300.0
+IDENTITY_CACHE_SIZE: int = 4096
+
+# Avatar generation attempts (скользящее окно)
+AVATAR_ATTEMPTS_WINDOW_SECONDS: int = 24 * 60 * 60
+
+# Counters (звёзды и счётчики тем): при включении инкременты копятся в памяти и пишутся пачкой
+COUNTER_COALESCING_ENABLED: bool = False
+COUNTER_FLUSH_INTERVAL_SECONDS: float = 2.0
+
+# Metrics (/metrics): границы бакетов гистограмм задержек, секунды
+METRICS_LATENCY_BUCKETS: tuple[float, ...] = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+METRICS_LLM_BUCKETS: tuple[float, ...] = (0.5, 1.0, 2.5, 5.0, 10.0, 20.0, 30.0, 60.0, 120.0)
+
+# Streaming
+STREAM_EDIT_INTERVAL_SECONDS: float = 1.0
+STREAM_MIN_CHARS_DELTA: int = 20
+
 KIND_TO_MESSAGE = {
     "text": "❗Пожалуйста, дождись завершения генерации текста!",
     "card": "❗Пожалуйста, дождись завершения генерации карточки!",
@@ -16,4 +99,9 @@ KIND_TO_MESSAGE = {
 
 # Redis keys
 BLOCK_MSG_KEY = "users:{user_id}:block_message_id"
-ACTIVE_QUESTION_KEY = "users:{user_id}:has_active_question"
\ No newline at end of file
+ACTIVE_QUESTION_KEY = "users:{user_id}:has_active_question"
+READING_SESSION_KEY = "users:{user_id}:reading_session"
+READING_SESSION_TTL: int = 6 * 60 * 60
+IDENTITY_INVALIDATE_CHANNEL = "users:identity:invalidate"
+AVATAR_ATTEMPTS_KEY = "users:{user_id}:avatar_attempts"
+DAILY_QUOTA_KEY = "users:{user_id}:quota:{theme}:{day}"
\ No newline at end of file
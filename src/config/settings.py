@@ -24,6 +24,7 @@ class ProjectBaseSettings(BaseSettings):
 
 class TextModelConfig(BaseModel):
     model_name: str
+    max_tokens: int = 1500
 
 
 class ImageModelConfig(BaseModel):
@@ -128,6 +129,14 @@ class DBSettings(ProjectBaseSettings):
     postgres_port: int
     postgres_db: str
 
+    # ---- POSTGRES POOL SETTINGS ----
+    db_pool_size: int = 10
+    db_max_overflow: int = 10
+    db_pool_timeout: float = 10.0
+    db_pool_recycle: int = 1800
+    db_pool_pre_ping: bool = True
+    db_statement_cache_size: int = 500
+
     @property
     def db_url(self) -> str:
         password = quote_plus(self.postgres_password.get_secret_value())
@@ -185,6 +194,17 @@ class DBSettings(ProjectBaseSettings):
         return self.redis_password.get_secret_value()
 
 
+class HttpClientSettings(ProjectBaseSettings):
+    http_pool_limit: int = 100
+    http_pool_limit_per_host: int = 20  # aiohttp: лимит соединений на один хост
+    http_max_keepalive: int = 20  # httpx: всего простаивающих keep-alive соединений в пуле
+    http_dns_cache_ttl: int = 300
+    http_keepalive_timeout: float = 30.0
+    http_total_timeout: float = 90.0
+    http_connect_timeout: float = 10.0
+    http_read_timeout: float = 60.0
+
+
 class ImgBBSettings(ProjectBaseSettings):
     imgbb_api_key: SecretStr
 
@@ -250,6 +270,10 @@ def get_db_settings():
     return DBSettings()
 
 
+def get_http_client_settings():
+    return HttpClientSettings()
+
+
 def get_imgbb_settings():
     return ImgBBSettings()
 
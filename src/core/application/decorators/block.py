@@ -1,5 +1,5 @@
 import functools
-from aiogram.types import Message
+from aiogram.types import Message, CallbackQuery
 
 from config.constants import KIND_TO_MESSAGE
 
@@ -7,6 +7,8 @@ from config.constants import KIND_TO_MESSAGE
 def async_with_generating_flag(get_user_id, kind):
     """
     Асинхронный декоратор для работы с Redis-флагом генерации.
+    Флаг ставится атомарно (SET NX EX): если генерация этого вида уже идёт,
+    handler не вызывается, а пользователь получает предупреждение.
     Требует передачи dispatcher через kwargs в функцию.
     get_user_id — функция (lambda), которая по аргументам возвращает user_id.
     kind — тип генерации ('card', 'text', ...)
@@ -20,7 +22,14 @@ def async_with_generating_flag(get_user_id, kind):
             user_id = get_user_id(*args, **kwargs)
             from core.application.services.users.user_flags import set_generating, clear_generating
 
-            await set_generating(dispatcher["redis"], user_id, kind=kind)
+            if not await set_generating(dispatcher["redis"], user_id, kind=kind):
+                event = next((arg for arg in args if isinstance(arg, (Message, CallbackQuery))), None)
+                if event:
+                    try:
+                        await event.answer(KIND_TO_MESSAGE.get(kind))
+                    except Exception:
+                        pass
+                return None
             try:
                 return await func(*args, **kwargs)
             finally:
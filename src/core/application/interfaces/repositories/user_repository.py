@@ -3,7 +3,7 @@ from typing import Optional
 
 from sqlalchemy import select
 
-from core.domain.models.user import User
+from core.domain.models.user import User, UserSummary
 
 
 class UserRepositoryInterface(ABC):
@@ -27,6 +27,10 @@ class UserRepositoryInterface(ABC):
     async def update_user_status(self, user_id: int, status: str):
         pass
 
+    @abstractmethod
+    async def delete_user(self, user_id: int):
+        pass
+
     @abstractmethod
     async def get_all(self) -> Optional[list[User]]:
         pass
@@ -55,6 +59,14 @@ class UserRepositoryInterface(ABC):
     async def get_stars_count_by_user(self, user_id: int) -> int:
         pass
 
+    @abstractmethod
+    async def get_summary(self, uid: int) -> Optional[UserSummary]:
+        pass
+
+    @abstractmethod
+    async def get_users_page(self, limit: int, after_id: Optional[int] = None, before_id: Optional[int] = None):
+        pass
+
     @abstractmethod
     async def get_generated_count_today_by_user(self, user_id: int, theme: str) -> int:
         pass
@@ -3,7 +3,7 @@ from typing import Callable, Any
 from aiogram.types import Message, CallbackQuery
 from aiogram.fsm.context import FSMContext
 
-from core.infrastructure.db.repositories.sqlalchemy_user_repository import SQLAlchemyUserRepository
+from core.infrastructure.storage.identity_cache import identity_cache
 
 
 def is_approved_user():
@@ -36,11 +36,10 @@ def is_approved_user():
             if user_id is None:
                 return await func(*args, **kwargs)
 
-            # 3) Читаем из БД актуальную запись users.is_approved
-            async with SQLAlchemyUserRepository() as repo:
-                user = await repo.get_by_id(user_id)
+            # 3) Статус пользователя из общего кэша (сбрасывается при модерации)
+            identity = await identity_cache.get(user_id)
 
-            if not user or not user.is_approved:
+            if not identity or not identity.is_approved:
                 # отказ
                 if isinstance(event, CallbackQuery):
                     await event.answer(
@@ -0,0 +1,34 @@
+from aiogram.utils.markdown import hbold
+
+from config.constants import USAGE_REPORT_DAYS
+from core.domain.models.usage import UsageRollup
+from core.infrastructure.storage.usage_service import get_usage_rollups
+
+TOP_THEMES: int = 5
+
+
+def _format_rollup(r: UsageRollup) -> str:
+    failed = f" | ❌ {r.failed}" if r.failed else ""
+    return (
+        f"• {r.key}\n"
+        f"   {r.calls} выз.{failed} | 🔤 {r.tokens_in}→{r.tokens_out} | ⏱ {r.avg_latency_ms} мс | 💵 ${r.cost:.4f}"
+    )
+
+
+async def render_usage_report(days: int = USAGE_REPORT_DAYS) -> str:
+    """Текст отчёта о расходах LLM за days дней: по моделям и самые дорогие темы."""
+    by_model = await get_usage_rollups(days, "model")
+    by_theme = await get_usage_rollups(days, "theme")
+    total = sum(r.cost for r in by_model)
+
+    lines = [f"{hbold(f'💰 Расходы LLM за {days} дн.')}: ${total:.4f}", ""]
+    if not by_model:
+        lines.append("Пока нет данных.")
+        return "\n".join(lines)
+
+    lines.append(hbold("По моделям:"))
+    lines.extend(_format_rollup(r) for r in by_model)
+    lines.append("")
+    lines.append(hbold("Самые дорогие темы:"))
+    lines.extend(_format_rollup(r) for r in by_theme[:TOP_THEMES])
+    return "\n".join(lines)
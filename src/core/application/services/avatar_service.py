@@ -1,5 +1,8 @@
+import time
 import uuid
 
+from core.domain.services.ai.usage import track_usage, set_usage_context
+
 
 class AvatarService:
     def __init__(self, image_generator, image_storage, image_tools):
@@ -8,7 +11,10 @@ class AvatarService:
         self.image_tools = image_tools
 
     async def generate_avatar_and_cache(self, prompt: str, user_id: int) -> tuple[str | None, str | None]:
+        set_usage_context(uid=user_id, theme="avatar")
+        started = time.monotonic()
         img_url = await self.image_generator.generate(prompt)
+        track_usage("image", "openai", "dall-e-3", time.monotonic() - started, img_url is not None)
         if img_url is None:
             return None, None
 
@@ -1,11 +1,44 @@
+from dataclasses import dataclass
+from typing import Optional
+
 from redis.asyncio import Redis
 
 from config.constants import ACTIVE_QUESTION_KEY, BLOCK_MSG_KEY
 
 GENERATING_FLAG = "users:{user_id}:is_generating_{kind}"  # kind: card, text, image, ...
+GENERATING_KINDS = ("text", "card", "read")
+
+
+@dataclass
+class UserFlags:
+    """Все флаги пользователя в Redis, прочитанные одним запросом."""
+    generating: Optional[str] = None  # первый установленный kind из GENERATING_KINDS
+    active_question: bool = False
+    block_msg_id: Optional[int] = None
+
+
+async def get_user_flags(redis: Redis, user_id: int) -> UserFlags:
+    """Читает флаги генерации, активного вопроса и id блокирующего сообщения одним пайплайном."""
+    pipe = redis.pipeline(transaction=False)
+    for kind in GENERATING_KINDS:
+        pipe.exists(GENERATING_FLAG.format(user_id=user_id, kind=kind))
+    pipe.get(ACTIVE_QUESTION_KEY.format(user_id=user_id))
+    pipe.get(BLOCK_MSG_KEY.format(user_id=user_id))
+    *generating, active_question, block_msg_id = await pipe.execute()
 
-async def set_generating(redis: Redis, user_id: int, kind: str):
-    await redis.set(GENERATING_FLAG.format(user_id=user_id, kind=kind), "1", ex=600)
+    return UserFlags(
+        generating=next((kind for kind, flag in zip(GENERATING_KINDS, generating) if flag), None),
+        active_question=bool(active_question),
+        block_msg_id=int(block_msg_id) if block_msg_id else None,
+    )
+
+
+async def set_generating(redis: Redis, user_id: int, kind: str) -> bool:
+    """
+    Ставит флаг генерации одной командой SET NX EX.
+    Возвращает False, если генерация этого вида у пользователя уже идёт.
+    """
+    return bool(await redis.set(GENERATING_FLAG.format(user_id=user_id, kind=kind), "1", ex=600, nx=True))
 
 async def clear_generating(redis: Redis, user_id: int, kind: str):
     await redis.delete(GENERATING_FLAG.format(user_id=user_id, kind=kind))
@@ -13,23 +46,38 @@ async def clear_generating(redis: Redis, user_id: int, kind: str):
 async def is_generating(redis: Redis, user_id: int, kind: str) -> bool:
     return await redis.exists(GENERATING_FLAG.format(user_id=user_id, kind=kind)) > 0
 
+async def set_active_question(redis: Redis, user_id: int):
+    await redis.set(ACTIVE_QUESTION_KEY.format(user_id=user_id), 1, ex=600)
+
 async def has_active_question(redis, user_id: int) -> bool:
     return bool(await redis.get(ACTIVE_QUESTION_KEY.format(user_id=user_id)))
 
 async def get_generating_status(redis: Redis, user_id: int):
     # Вернёт строку статуса, если какой-то из известных флагов установлен
-    for kind in ["text", "card", "read"]:
-        if await is_generating(redis, user_id, kind=kind):
-            return kind
-    return None
+    return (await get_user_flags(redis, user_id)).generating
+
+
+async def set_blocking_message(redis: Redis, user_id: int, msg_id: int, ex: int = 60) -> Optional[int]:
+    """
+    Сохраняет id блокирующего сообщения и возвращает предыдущий одной командой SET ... GET,
+    чтобы параллельные команды не потеряли id сообщения, которое нужно удалить.
+    """
+    previous = await redis.set(BLOCK_MSG_KEY.format(user_id=user_id), msg_id, ex=ex, get=True)
+    return int(previous) if previous else None
 
 
-async def delete_blocking_message(redis, user_id, bot, chat_id):
+async def delete_blocking_message(redis, user_id, bot, chat_id, msg_id: Optional[int] = None):
+    """
+    Удаляет блокирующее сообщение. Если msg_id уже известен (из get_user_flags),
+    он передаётся явно; иначе id читается и удаляется из Redis одной командой GETDEL.
+    """
     key = BLOCK_MSG_KEY.format(user_id=user_id)
-    msg_id = await redis.get(key)
+    if msg_id is None:
+        msg_id = await redis.getdel(key)
+    else:
+        await redis.delete(key)
     if msg_id:
         try:
             await bot.delete_message(chat_id=chat_id, message_id=int(msg_id))
         except Exception:
             pass
-        await redis.delete(key)
\ No newline at end of file
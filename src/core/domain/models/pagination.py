@@ -1,9 +1,17 @@
 from dataclasses import dataclass
+from typing import Optional
+
 
 @dataclass
 class PageParams:
+    """
+    Параметры страницы. Для keyset-пагинации задаётся курсор:
+    after_id — следующая страница (записи с id больше), before_id — предыдущая (записи с id меньше).
+    """
     page: int
     page_size: int
+    after_id: Optional[int] = None
+    before_id: Optional[int] = None
 
     @property
     def offset(self) -> int:
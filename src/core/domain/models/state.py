@@ -25,4 +25,5 @@ class ReadingState:
     word_count: int
     full_text: str
     age_prompt_id: int = field(default=None)
-    feedback_msg_id: Optional[int] = None  # ID предыдущего мотивационного сообщения
\ No newline at end of file
+    feedback_msg_id: Optional[int] = None  # ID предыдущего мотивационного сообщения
+    current: int = 0  # индекс текущего вопроса в qa
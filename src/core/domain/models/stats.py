@@ -24,6 +24,7 @@ class UserStat:
     q_ok: int
     q_tot: int
     streak: int
+    key: int = 0  # users.id — курсор keyset-пагинации
 
     def format_html(self) -> str:
         acc = f"{(self.q_ok/self.q_tot*100):.0f}%" if self.q_tot else "—"
@@ -0,0 +1,32 @@
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Optional
+
+
+@dataclass
+class UsageRecord:
+    """Расход одного вызова LLM или генерации картинки."""
+    kind: str  # "text" | "image"
+    provider: str
+    model: str
+    latency_ms: int
+    success: bool
+    tokens_in: Optional[int] = None
+    tokens_out: Optional[int] = None
+    cost: float = 0.0
+    retries: int = 0
+    uid: Optional[int] = None
+    theme: Optional[str] = None
+    created_at: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
+
+
+@dataclass
+class UsageRollup:
+    """Суммарный расход за период по провайдеру/модели или по теме."""
+    key: str
+    calls: int
+    failed: int
+    tokens_in: int
+    tokens_out: int
+    cost: float
+    avg_latency_ms: int
@@ -1,4 +1,4 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import datetime, date
 from enum import Enum
 from typing import Optional, Literal
@@ -30,6 +30,19 @@ class User(BaseModel):
     registered_at: Optional[datetime] = None
 
 
+@dataclass
+class UserSummary:
+    """Профиль пользователя вместе со статистикой: звёзды, карточки, вопросы, точность, серия, темы."""
+    user: User
+    stars: int = 0
+    card_count: int = 0
+    questions_count: int = 0
+    q_ok: int = 0
+    q_tot: int = 0
+    streak: int = 0
+    themes: dict[str, int] = field(default_factory=dict)
+
+
 class TelegramUser(BaseModel):
     id: int
     first_name: str
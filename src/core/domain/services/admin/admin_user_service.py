@@ -7,23 +7,20 @@ from core.infrastructure.db.repositories.sqlalchemy_user_repository import SQLAl
 
 async def fetch_user_stats(page_params: PageParams) -> Tuple[List[UserStat], int]:
     async with SQLAlchemyUserRepository() as repo:
-        users = repo.get_all()
-        slice_users = users[page_params.offset:page_params.offset + page_params.page_size]
+        rows, total = await repo.get_users_page(page_params.page_size,
+                                                after_id=page_params.after_id,
+                                                before_id=page_params.before_id)
 
-        stats = []
-        for user in slice_users:
-            cards = await repo.get_card_count_by_user(user.id)
-            stars = await repo.get_stars_count_by_user(user.id)
-            stats.append(UserStat(
-                id=user.id,
-                name=user.name or "—",
-                is_approved=user.is_approved,
-                stars=stars,
-                cards=cards or 0,
-                q_ok=user.q_ok or 0,
-                q_tot=user.q_tot or 0,
-                streak=user.streak or 0
-            ))
-        total = len(users)
+    stats = [UserStat(
+        id=row.telegram_id,
+        name=row.name or "—",
+        is_approved=row.status == "approved",
+        stars=row.stars,
+        cards=row.cards,
+        q_ok=row.q_ok or 0,
+        q_tot=row.q_tot or 0,
+        streak=row.streak or 0,
+        key=row.id
+    ) for row in rows]
     # Возвращаем статистику + общий размер для навигации
     return stats, total
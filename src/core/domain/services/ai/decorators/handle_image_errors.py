@@ -6,6 +6,8 @@ import httpx
 import openai
 
 from config.constants import MAX_RETRIES, BACKOFF_BASE_SECONDS
+from core.domain.services.ai.usage import set_usage_context
+from core.infrastructure.metrics import llm_retries
 from core.infrastructure.clients.redis_client import rc as redis_client
 
 logger = logging.getLogger(__name__)
@@ -22,6 +24,7 @@ def handle_image_errors(func):
         self = args[0] if args else None
         user_id = getattr(self, 'uid', None)
         for attempt in range(1, MAX_RETRIES + 1):
+            set_usage_context(retries=attempt - 1)
             try:
                 return await func(*args, **kwargs)
             except (
@@ -35,6 +38,7 @@ def handle_image_errors(func):
                     await clear_user_redis_client_keys(redis_client, user_id)
                 if attempt == MAX_RETRIES:
                     raise RuntimeError(f"Image generation failed after {MAX_RETRIES} attempts: {exc}") from exc
+                llm_retries.inc(kind="image")
                 await asyncio.sleep(BACKOFF_BASE_SECONDS * 2 ** (attempt - 1))
             except httpx.HTTPStatusError as exc:
                 logger.error(f"Ошибка генерации изображения (HTTP): {exc}")
@@ -6,6 +6,8 @@ import httpx
 import openai
 
 from config.constants import MAX_RETRIES, BACKOFF_BASE_SECONDS
+from core.domain.services.ai.usage import set_usage_context
+from core.infrastructure.metrics import llm_retries
 from core.infrastructure.clients.redis_client import rc as redis_client
 
 logger = logging.getLogger(__name__)
@@ -20,6 +22,7 @@ def handle_text_errors(func):
         self = args[0] if args else None
         user_id = getattr(self, 'uid', None)
         for attempt in range(1, MAX_RETRIES + 1):
+            set_usage_context(retries=attempt - 1)
             try:
                 result = await func(*args, **kwargs)
                 # Удаляем ключ после успешного выполнения
@@ -37,6 +40,7 @@ def handle_text_errors(func):
                     await clear_user_redis_client_keys(redis_client, user_id)
                 if attempt == MAX_RETRIES:
                     raise RuntimeError(f"Text generation failed after {MAX_RETRIES} attempts: {exc}") from exc
+                llm_retries.inc(kind="text")
                 await asyncio.sleep(BACKOFF_BASE_SECONDS * 2 ** (attempt - 1))
             except httpx.HTTPStatusError as exc:
                 logger.error(f"Ошибка 404 или иная HTTP-ошибка: {exc}")
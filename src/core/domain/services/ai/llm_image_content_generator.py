@@ -1,5 +1,6 @@
 import logging
 import random
+import time
 from typing import Any
 
 from aiogram.types import InputMediaPhoto
@@ -7,6 +8,7 @@ from aiogram.types import InputMediaPhoto
 from config.settings import get_ai_settings
 from core.domain.services.ai.llm_providers import LLM_IMAGE_PROVIDERS
 from core.domain.services.ai.prompt.prompt import CARD_PROMPT
+from core.domain.services.ai.usage import track_usage, set_usage_context
 from config.constants import MAX_RETRIES
 from config.content import IMAGE_FORMATS, IMAGE_STYLES
 from core.domain.services.ai.decorators.handle_image_errors import handle_image_errors
@@ -75,5 +77,13 @@ class LLMImageContentGenerator:
         prompt = self._build_prompt(title, self.age)
         provider_name, params = random.choice(list(self.ai_settings.get_all_image_models().items()))
         provider = LLM_IMAGE_PROVIDERS[provider_name]
-        response = await provider['get_response'](params['image']['model_name'], prompt)
+        model_name = params['image']['model_name']
+        set_usage_context(uid=self.uid, theme=self.theme)
+        started = time.monotonic()
+        success = False
+        try:
+            response = await provider['get_response'](model_name, prompt)
+            success = True
+        finally:
+            track_usage("image", provider_name, model_name, time.monotonic() - started, success)
         return response[0], response[1]
@@ -1,30 +1,54 @@
 from core.infrastructure.clients.ai.clodflare import get_cloudflare_worker_image_response
-from core.infrastructure.clients.ai.gemini import get_google_gemini_text_response
-from core.infrastructure.clients.ai.gpt import get_openai_gpt_text_response, get_openai_dalle_image_response
-from core.infrastructure.clients.ai.openrouter import get_openrouter_deepseek_text_response
+from core.infrastructure.clients.ai.gemini import get_google_gemini_text_response, stream_google_gemini_text_response
+from core.infrastructure.clients.ai.gpt import (
+    get_openai_gpt_text_response,
+    get_openai_dalle_image_response,
+    stream_openai_gpt_text_response
+)
+from core.infrastructure.clients.ai.openrouter import (
+    get_openrouter_deepseek_text_response,
+    stream_openrouter_deepseek_text_response
+)
 from core.infrastructure.clients.ai.utils.normalize_and_validate import (
     normalize_llm_chatgpt_response,
-    normalize_llm_gemini_response
+    normalize_llm_gemini_response,
+    format_text_paragraphs
 )
 
+# structured_output: провайдер сам возвращает JSON по READING_RESPONSE_SCHEMA,
+# normalize_response тогда лишь страховка (обрезанный ответ и т.п.),
+# а postprocess выполняет то же оформление, что normalize_response (например, разбивку на абзацы)
 LLM_TEXT_PROVIDERS = {
     'openai': {
+        'structured_output': True,
         'get_response': get_openai_gpt_text_response,
+        'stream_response': stream_openai_gpt_text_response,
         'normalize_response': normalize_llm_chatgpt_response,
+        'postprocess': format_text_paragraphs,
         'extract_text': lambda r: r.choices[0].message.content.strip(),
         'get_model': lambda r: r.model,
+        'get_usage': lambda r: (r.usage.prompt_tokens, r.usage.completion_tokens) if r.usage else (None, None),
     },
     'gemini': {
+        'structured_output': True,
         'get_response': get_google_gemini_text_response,
+        'stream_response': stream_google_gemini_text_response,
         'normalize_response': normalize_llm_gemini_response,
+        'postprocess': None,
         'extract_text': lambda r: r['candidates'][0]['content']['parts'][0]['text'].strip(),
         'get_model': lambda r: r.get('modelVersion'),
+        'get_usage': lambda r: (r.get('usageMetadata', {}).get('promptTokenCount'),
+                                r.get('usageMetadata', {}).get('candidatesTokenCount')),
     },
     'deepseek': {
+        'structured_output': False,
         'get_response': get_openrouter_deepseek_text_response,
+        'stream_response': stream_openrouter_deepseek_text_response,
         'normalize_response': normalize_llm_chatgpt_response,
+        'postprocess': None,
         'extract_text': lambda r: r.choices[0].message.content.strip(),
         'get_model': lambda r: r.model,
+        'get_usage': lambda r: (r.usage.prompt_tokens, r.usage.completion_tokens) if r.usage else (None, None),
     },
 }
 
@@ -1,16 +1,200 @@
-import random
+import asyncio
+import json
+import logging
+import time
 from datetime import date
-from typing import Optional, Any
+from typing import Optional, Any, Awaitable, Callable
 
 from config.settings import get_ai_settings
+from core.domain.services.ai.provider_router import (
+    provider_router,
+    classify_request_error,
+    OUTCOME_PARSE,
+    OUTCOME_VALIDATION
+)
 from core.domain.services.ai.llm_providers import LLM_TEXT_PROVIDERS
 from core.domain.services.ai.prompt.prompt_builder import build_prompt
+from core.domain.services.ai.text_pool import ReadingTextPool
+from core.domain.services.ai.usage import track_usage, set_usage_context
 from core.infrastructure.clients.ai.utils.normalize_and_validate import validate_generated_data
-from config.constants import MAX_RETRIES
+from core.infrastructure.clients.ai.utils.stream_json import JsonStringFieldStream
+from config.constants import MAX_RETRIES, HEDGE_ENABLED
 from core.domain.services.ai.decorators.handle_text_errors import handle_text_errors
-from core.infrastructure.storage.history_service import remember_text
+from core.infrastructure.storage.history_service import remember_text, text_is_semantically_similar
+from core.infrastructure.storage.semantic_index import embed_text, text_is_semantic_duplicate
+
+logger = logging.getLogger(__name__)
 
 ResultType = dict[str, Any]
+# Получает весь текст, сгенерированный к текущему моменту; пустая строка — начало новой попытки
+TextCallback = Callable[[str], Awaitable[None]]
+
+
+def _choose_text_provider(exclude: tuple[str, ...] = ()) -> tuple[str, dict, str] | None:
+    """
+    Выбирает текстового провайдера через provider_router.
+    Возвращает имя провайдера, сам провайдер и имя модели либо None, если выбирать не из чего.
+    """
+    models = {name: params['text']['model_name']
+              for name, params in get_ai_settings().get_all_text_models().items()
+              if name not in exclude}
+    key = provider_router.choose(list(models.items()))
+    if key is None:
+        return None
+    provider_name, model_name = key
+    return provider_name, LLM_TEXT_PROVIDERS[provider_name], model_name
+
+
+def _model_label(model_name: str) -> str:
+    """Имя модели без суффикса метода API (gemini-...:generateContent)."""
+    return model_name.replace(":generateContent", "")
+
+
+async def _call_text_provider(provider_name: str, provider: dict, model_name: str, prompt: str) -> ResultType:
+    """
+    Один запрос к провайдеру: ответ нормализуется и проверяется.
+    Задержка и исход запроса (успех, ошибка запроса/429, парсинга, валидации) передаются в provider_router,
+    расход токенов — в track_usage (в том числе для неудачных и отменённых запросов).
+    """
+    key = (provider_name, model_name)
+    started = time.monotonic()
+    tokens = (None, None)
+    success = False
+    try:
+        try:
+            response = await provider['get_response'](model_name, prompt)
+        except Exception as exc:
+            provider_router.record_failure(key, classify_request_error(exc))
+            raise
+        tokens = provider['get_usage'](response)
+        try:
+            raw_text = provider['extract_text'](response)
+        except Exception:
+            provider_router.record_failure(key, OUTCOME_PARSE)
+            raise
+        result = _parse_and_validate(key, provider, raw_text, provider['get_model'](response))
+        provider_router.record_success(key, time.monotonic() - started)
+        success = True
+        return result
+    finally:
+        track_usage("text", provider_name, _model_label(model_name), time.monotonic() - started, success, *tokens)
+
+
+def _parse_and_validate(key: tuple[str, str], provider: dict, raw_text: str, model: str) -> ResultType:
+    """
+    Нормализует и проверяет ответ провайдера, сообщая provider_router об ошибках парсинга и валидации.
+    Ответ провайдера со structured_output уже является JSON по схеме и разбирается напрямую
+    (с оформлением через postprocess), normalize_response используется только если это не удалось.
+    """
+    normalize_response_json = None
+    if provider['structured_output']:
+        try:
+            normalize_response_json = json.loads(raw_text)
+        except json.JSONDecodeError:
+            logger.info(f"Structured output {key} не разобран напрямую, используем нормализатор")
+        if isinstance(normalize_response_json, dict) and provider['postprocess']:
+            normalize_response_json = provider['postprocess'](normalize_response_json)
+    try:
+        if not isinstance(normalize_response_json, dict):
+            normalize_response_json = provider['normalize_response'](raw_text)
+    except Exception:
+        provider_router.record_failure(key, OUTCOME_PARSE)
+        raise
+    normalize_response_json.update({'model': model})
+    try:
+        validate_generated_data(normalize_response_json)
+    except ValueError:
+        provider_router.record_failure(key, OUTCOME_VALIDATION)
+        raise
+    return normalize_response_json
+
+
+async def request_llm_text(prompt: str) -> ResultType:
+    """
+    Асинхронно отправляет prompt в одну из LLM и возвращает нормализованный и проверенный результат.
+    Провайдер выбирает provider_router по задержкам и доле ошибок.
+
+    Если HEDGE_ENABLED и первый провайдер не ответил до дедлайна (p50 его задержки
+    с множителем) или ответил ошибкой, параллельно запускается запрос к другому
+    провайдеру. Берётся первый ответ, прошедший validate_generated_data, второй запрос отменяется.
+    """
+    primary = _choose_text_provider()
+    if primary is None:
+        raise RuntimeError("no available text provider")
+    first = asyncio.create_task(_call_text_provider(*primary, prompt))
+    if not HEDGE_ENABLED:
+        return await first
+
+    pending = {first}
+    last_exc: BaseException | None = None
+    try:
+        await asyncio.wait(pending, timeout=provider_router.hedge_deadline((primary[0], primary[2])))
+        if not first.done() or first.exception() is not None:
+            hedge = _choose_text_provider(exclude=(primary[0],))
+            if hedge:
+                logger.info(f"Hedged-запрос к {hedge[0]}: {primary[0]} не ответил вовремя")
+                pending.add(asyncio.create_task(_call_text_provider(*hedge, prompt)))
+
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.exception() is None:
+                    return task.result()
+                last_exc = task.exception()
+    finally:
+        for task in pending:
+            task.cancel()
+    raise last_exc
+
+
+async def request_llm_text_stream(prompt: str, on_text: TextCallback) -> ResultType:
+    """
+    Как request_llm_text, но получает ответ LLM потоком.
+    По мере поступления JSON из него извлекается поле "text" и передаётся в on_text,
+    пока блок qa ещё генерируется. Итоговый ответ нормализуется и проверяется целиком.
+    Перед началом потока on_text получает пустую строку, чтобы убрать черновик предыдущей попытки.
+    """
+    chosen = _choose_text_provider()
+    if chosen is None:
+        raise RuntimeError("no available text provider")
+    provider_name, provider, model_name = chosen
+    key = (provider_name, model_name)
+    started = time.monotonic()
+    usage: dict = {}
+    success = False
+    field = JsonStringFieldStream("text")
+    chunks = []
+    await on_text("")
+    try:
+        try:
+            async for chunk in provider['stream_response'](model_name, prompt, usage):
+                chunks.append(chunk)
+                before = field.value
+                if not field.done and field.feed(chunk) != before:
+                    await on_text(field.value)
+        except Exception as exc:
+            provider_router.record_failure(key, classify_request_error(exc))
+            raise
+
+        result = _parse_and_validate(key, provider, ''.join(chunks).strip(), _model_label(model_name))
+        provider_router.record_success(key, time.monotonic() - started)
+        success = True
+        return result
+    finally:
+        track_usage("text", provider_name, _model_label(model_name), time.monotonic() - started, success,
+                    usage.get("tokens_in"), usage.get("tokens_out"))
+
+
+async def _produce_pooled_text(category: str, theme: str, age: int) -> ResultType:
+    """Генерирует текст для пула, не привязанный к конкретному пользователю."""
+    set_usage_context(uid=None, theme=theme, retries=0)
+    result = await request_llm_text(build_prompt(category, theme, age))
+    # Эмбеддинг считается заранее, при пополнении пула, а не при выдаче текста
+    result["embedding"] = await embed_text(result["text"].strip())
+    return result
+
+
+text_pool = ReadingTextPool(producer=_produce_pooled_text)
 
 
 class LLMTextContentGenerator:
@@ -47,41 +231,44 @@ class LLMTextContentGenerator:
         return build_prompt(category, self.theme, self.age)
 
     @handle_text_errors
-    async def generate_text(self, category) -> ResultType:
+    async def generate_text(self, category, on_text: Optional[TextCallback] = None) -> ResultType:
         """
         Асинхронно генерирует уникальный и корректно структурированный текст по заданной категории и теме.
+        Сначала пытается взять готовый текст из пула, иначе обращается к LLM.
+        Если передан on_text, ответ LLM запрашивается потоком и текст отдаётся в on_text по частям.
         Повторяет попытку генерации до MAX_RETRIES раз при возникновении ошибок.
         Сохраняет сгенерированный текст в историю пользователя.
         """
+        set_usage_context(uid=self.uid, theme=self.theme)
+        pooled = await text_pool.take(category, self.theme, self.age, self.uid)
+        text_pool.schedule_refill(category, self.theme, self.age)
+        if pooled:
+            await remember_text(self.uid, pooled["text"].strip(), pooled.pop("embedding", None))
+            return pooled
+
         last: Optional[dict] = None
         for _ in range(MAX_RETRIES):
-            result = await self.get_llm_raw_text(category)
+            result = await self.get_llm_raw_text(category, on_text)
             text = result.get("text", "").strip()
 
-            # TODO: Проверка уникальности текста
-            # if await text_is_semantically_similar(self.uid, text):
-            #     last = result
-            #     continue
+            # Проверка уникальности текста: MinHash (почти дословные повторы), затем смысловая по эмбеддингам
+            if await text_is_semantically_similar(self.uid, text):
+                last = result
+                continue
+            embedding = await embed_text(text)
+            if await text_is_semantic_duplicate(self.uid, embedding):
+                last = result
+                continue
 
-            await remember_text(self.uid, text)
-            # await remember_text_with_embedding(self.uid, text)
+            await remember_text(self.uid, text, embedding)
             return result
         return last or {"text": "", "card": "", "qa": []}
 
-    async def get_llm_raw_text(self, category) -> dict[str, Any] | None:
+    async def get_llm_raw_text(self, category, on_text: Optional[TextCallback] = None) -> dict[str, Any] | None:
         """
         Асинхронно отправляет запрос к LLM и получает сырые данные для заданной категории.
         Оборачивает вызов в обработчик ошибок с ретраями.
         """
-        prompt = self._build_prompt(category)
-        models = list(self.ai_settings.get_all_text_models().items())
-        # Присвоим веса: по умолчанию 1, для openrouter — 0.2 (или 1/5)
-        weights = [0.2 if name == "deepseek" else 1 for name, _ in models]
-        provider_name, params = random.choices(models, weights=weights, k=1)[0]
-        provider = LLM_TEXT_PROVIDERS[provider_name]
-        response = await provider['get_response'](params['text']['model_name'], prompt)
-        raw_text = provider['extract_text'](response)
-        normalize_response_json = provider['normalize_response'](raw_text)
-        normalize_response_json.update({'model': provider['get_model'](response)})
-        validate_generated_data(normalize_response_json)
-        return normalize_response_json
+        if on_text:
+            return await request_llm_text_stream(self._build_prompt(category), on_text)
+        return await request_llm_text(self._build_prompt(category))
@@ -0,0 +1,142 @@
+import logging
+import random
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from statistics import median, quantiles
+from typing import Optional
+
+from config.constants import (
+    HEDGE_DEADLINE_MULTIPLIER,
+    HEDGE_DEFAULT_DEADLINE_SECONDS,
+    HEDGE_MIN_SAMPLES,
+    LATENCY_WINDOW_SIZE,
+    ROUTER_MIN_WEIGHT,
+    ROUTER_PRIOR_WEIGHTS,
+    ROUTER_BREAKER_FAILURES,
+    ROUTER_BREAKER_COOLDOWN_SECONDS,
+    ROUTER_RATE_LIMIT_COOLDOWN_SECONDS
+)
+
+logger = logging.getLogger(__name__)
+
+RouteKey = tuple[str, str]
+
+OUTCOME_OK = "ok"
+OUTCOME_PARSE = "parse"
+OUTCOME_VALIDATION = "validation"
+OUTCOME_RATE_LIMIT = "rate_limit"
+OUTCOME_ERROR = "error"
+
+
+def classify_request_error(exc: BaseException) -> str:
+    """Относит ошибку запроса к провайдеру к 429 или к прочим ошибкам (openai и aiohttp)."""
+    status = getattr(exc, "status_code", None) or getattr(exc, "status", None)
+    return OUTCOME_RATE_LIMIT if status == 429 else OUTCOME_ERROR
+
+
+@dataclass
+class ProviderStats:
+    """Скользящая статистика одной пары провайдер/модель."""
+    latencies: deque[float] = field(default_factory=lambda: deque(maxlen=LATENCY_WINDOW_SIZE))
+    outcomes: deque[str] = field(default_factory=lambda: deque(maxlen=LATENCY_WINDOW_SIZE))
+    consecutive_failures: int = 0
+    open_until: float = 0.0
+
+    def rate(self, outcome: str) -> float:
+        if not self.outcomes:
+            return 0.0
+        return self.outcomes.count(outcome) / len(self.outcomes)
+
+    @property
+    def failure_rate(self) -> float:
+        return 1.0 - self.rate(OUTCOME_OK) if self.outcomes else 0.0
+
+    @property
+    def p50(self) -> Optional[float]:
+        if len(self.latencies) < HEDGE_MIN_SAMPLES:
+            return None
+        return median(self.latencies)
+
+    @property
+    def p95(self) -> Optional[float]:
+        if len(self.latencies) < HEDGE_MIN_SAMPLES:
+            return None
+        return quantiles(self.latencies, n=20)[-1]
+
+
+class ProviderRouter:
+    """
+    Адаптивный выбор текстового LLM-провайдера.
+
+    По каждой паре (провайдер, модель) хранится окно задержек и исходов запросов
+    (успех, ошибка парсинга, ошибка валидации, 429, прочие ошибки). Вес провайдера
+    обратно пропорционален p95 задержки и пропорционален квадрату доли успешных ответов,
+    поэтому трафик сам уходит от медленных и сломанных провайдеров. Адаптивный вес
+    умножается на априорный вес провайдера из ROUTER_PRIOR_WEIGHTS (deepseek — 0.2).
+
+    Circuit breaker: после ROUTER_BREAKER_FAILURES ошибок подряд (или сразу после 429)
+    провайдер исключается на время охлаждения. После охлаждения он снова получает
+    запросы; первая же ошибка снова его выключает, успех — сбрасывает счётчик.
+    """
+
+    def __init__(self):
+        self._stats: dict[RouteKey, ProviderStats] = {}
+
+    def stats(self, key: RouteKey) -> ProviderStats:
+        return self._stats.setdefault(key, ProviderStats())
+
+    def snapshot(self) -> dict[RouteKey, ProviderStats]:
+        return dict(self._stats)
+
+    def is_open(self, key: RouteKey) -> bool:
+        return self.stats(key).open_until > time.monotonic()
+
+    def weight(self, key: RouteKey) -> float:
+        stats = self.stats(key)
+        p95 = stats.p95 or HEDGE_DEFAULT_DEADLINE_SECONDS
+        success = 1.0 - stats.failure_rate
+        prior = ROUTER_PRIOR_WEIGHTS.get(key[0], 1.0)
+        return prior * max(ROUTER_MIN_WEIGHT, success * success / p95)
+
+    def choose(self, candidates: list[RouteKey]) -> Optional[RouteKey]:
+        """Выбирает провайдера с учётом весов среди тех, у кого не сработал circuit breaker."""
+        if not candidates:
+            return None
+        healthy = [key for key in candidates if not self.is_open(key)]
+        if not healthy:
+            # Все выключены — пробуем того, чьё охлаждение закончится раньше
+            return min(candidates, key=lambda key: self.stats(key).open_until)
+        return random.choices(healthy, weights=[self.weight(key) for key in healthy], k=1)[0]
+
+    def hedge_deadline(self, key: RouteKey) -> float:
+        """Дедлайн ожидания ответа провайдера: p50 * HEDGE_DEADLINE_MULTIPLIER или значение по умолчанию."""
+        p50 = self.stats(key).p50
+        if p50 is None:
+            return HEDGE_DEFAULT_DEADLINE_SECONDS
+        return p50 * HEDGE_DEADLINE_MULTIPLIER
+
+    def record_success(self, key: RouteKey, seconds: float) -> None:
+        stats = self.stats(key)
+        stats.latencies.append(seconds)
+        stats.outcomes.append(OUTCOME_OK)
+        stats.consecutive_failures = 0
+        stats.open_until = 0.0
+
+    def record_failure(self, key: RouteKey, outcome: str) -> None:
+        stats = self.stats(key)
+        stats.outcomes.append(outcome)
+        stats.consecutive_failures += 1
+        now = time.monotonic()
+        if outcome == OUTCOME_RATE_LIMIT:
+            cooldown = ROUTER_RATE_LIMIT_COOLDOWN_SECONDS
+        elif stats.consecutive_failures >= ROUTER_BREAKER_FAILURES or stats.open_until:
+            # open_until != 0 — провайдер уже выключался, ошибка после охлаждения выключает его снова
+            cooldown = ROUTER_BREAKER_COOLDOWN_SECONDS
+        else:
+            return
+        stats.open_until = now + cooldown
+        logger.warning(f"LLM-провайдер {key} исключён на {cooldown:.0f} с: {outcome}")
+
+
+provider_router = ProviderRouter()
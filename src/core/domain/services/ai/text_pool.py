@@ -0,0 +1,95 @@
+import asyncio
+import logging
+from collections import deque
+from typing import Any, Awaitable, Callable, Optional
+
+from config.constants import TEXT_POOL_SIZE, TEXT_POOL_LENGTH_STEP, TEXT_POOL_REFILL_RETRIES, BACKOFF_BASE_SECONDS
+from core.domain.services.ai.prompt.prompt_builder import get_length_by_age
+from core.infrastructure.storage.history_service import text_is_semantically_similar
+from core.infrastructure.storage.semantic_index import text_is_semantic_duplicate
+
+logger = logging.getLogger(__name__)
+
+ResultType = dict[str, Any]
+PoolKey = tuple[str, str, int]
+Producer = Callable[[str, str, int], Awaitable[ResultType]]
+
+
+def age_band(age: int) -> int:
+    """
+    Возвращает возрастную группу для пула: длину текста из get_length_by_age,
+    округлённую до TEXT_POOL_LENGTH_STEP. Читатели с близкой длиной текста
+    получают тексты из одного пула.
+    """
+    return get_length_by_age(age) // TEXT_POOL_LENGTH_STEP * TEXT_POOL_LENGTH_STEP
+
+
+class ReadingTextPool:
+    """
+    Пул заранее сгенерированных текстов по ключу (категория, тема, возрастная группа).
+
+    Тексты в пуле уже прошли validate_generated_data, поэтому выдаются сразу,
+    без ожидания LLM. После каждой выдачи пул асинхронно дополняется до size.
+    Пользователю не выдаются тексты, похожие на тексты из его истории.
+
+    Attrs:
+        producer: Корутина (category, theme, age) -> валидный результат генерации.
+        size (int): Сколько текстов держать на каждый ключ.
+    """
+
+    def __init__(self, producer: Producer, size: int = TEXT_POOL_SIZE):
+        self.producer = producer
+        self.size = size
+        self._items: dict[PoolKey, deque[ResultType]] = {}
+        self._refills: dict[PoolKey, asyncio.Task] = {}
+
+    @staticmethod
+    def _key(category: str, theme: str, age: int) -> PoolKey:
+        return category, theme, age_band(age)
+
+    async def take(self, category: str, theme: str, age: int, uid: int) -> Optional[ResultType]:
+        """
+        Забирает из пула первый текст, не похожий на тексты из истории пользователя.
+        Текст извлекается из пула до проверок (без await между выбором и извлечением),
+        поэтому параллельные take не получат один и тот же текст; отклонённые тексты возвращаются в пул.
+        """
+        items = self._items.get(self._key(category, theme, age))
+        if not items:
+            return None
+
+        rejected: list[ResultType] = []
+        try:
+            for _ in range(len(items)):
+                if not items:
+                    break
+                item = items.popleft()
+                if (await text_is_semantically_similar(uid, item["text"].strip())
+                        or await text_is_semantic_duplicate(uid, item.get("embedding"))):
+                    rejected.append(item)
+                    continue
+                return item
+            return None
+        finally:
+            items.extendleft(reversed(rejected))
+
+    def schedule_refill(self, category: str, theme: str, age: int) -> None:
+        """Запускает фоновое пополнение пула, если оно ещё не идёт."""
+        key = self._key(category, theme, age)
+        task = self._refills.get(key)
+        if task and not task.done():
+            return
+        self._refills[key] = asyncio.create_task(self._refill(key, category, theme, age))
+
+    async def _refill(self, key: PoolKey, category: str, theme: str, age: int) -> None:
+        items = self._items.setdefault(key, deque())
+        failures = 0
+        while len(items) < self.size:
+            try:
+                items.append(await self.producer(category, theme, age))
+                failures = 0
+            except Exception as exc:
+                failures += 1
+                logger.warning(f"Не удалось пополнить пул текстов {key} (попытка {failures}): {exc}")
+                if failures >= TEXT_POOL_REFILL_RETRIES:
+                    return
+                await asyncio.sleep(BACKOFF_BASE_SECONDS * 2 ** (failures - 1))
@@ -0,0 +1,76 @@
+import asyncio
+import logging
+from contextvars import ContextVar
+from typing import Optional
+
+from config.constants import LLM_TEXT_PRICES, LLM_IMAGE_PRICES
+from core.domain.models.usage import UsageRecord
+from core.infrastructure.metrics import llm_request_seconds, llm_requests
+from core.infrastructure.storage.usage_service import save_usage
+
+logger = logging.getLogger(__name__)
+
+# uid, theme и номер попытки текущей генерации; задаются генераторами и декораторами ретраев
+_usage_context: ContextVar[dict] = ContextVar("llm_usage_context", default={})
+_pending: set[asyncio.Task] = set()
+
+
+def set_usage_context(**fields) -> None:
+    """Дополняет контекст, который попадёт во все записи расхода текущей задачи."""
+    _usage_context.set({**_usage_context.get(), **fields})
+
+
+def _price(prices: dict, model: str):
+    """Цена модели: самый длинный ключ прайса, с которого начинается имя модели."""
+    matches = [name for name in prices if model and model.startswith(name)]
+    return prices[max(matches, key=len)] if matches else None
+
+
+def compute_cost(kind: str, model: str, tokens_in: Optional[int], tokens_out: Optional[int]) -> float:
+    """Стоимость вызова в USD по таблицам LLM_TEXT_PRICES / LLM_IMAGE_PRICES (0, если цена неизвестна)."""
+    if kind == "image":
+        return _price(LLM_IMAGE_PRICES, model) or 0.0
+    price = _price(LLM_TEXT_PRICES, model)
+    if not price:
+        return 0.0
+    price_in, price_out = price
+    return ((tokens_in or 0) * price_in + (tokens_out or 0) * price_out) / 1_000_000
+
+
+def track_usage(kind: str,
+                provider: str,
+                model: str,
+                seconds: float,
+                success: bool,
+                tokens_in: Optional[int] = None,
+                tokens_out: Optional[int] = None) -> None:
+    """
+    Записывает расход вызова в фоне, не задерживая генерацию.
+    Ошибки записи только логируются. Задержка и исход вызова сразу попадают в /metrics.
+    """
+    llm_request_seconds.observe(seconds, kind=kind, provider=provider, model=model)
+    llm_requests.inc(kind=kind, provider=provider, model=model, status="ok" if success else "error")
+    context = _usage_context.get()
+    record = UsageRecord(
+        kind=kind,
+        provider=provider,
+        model=model,
+        latency_ms=int(seconds * 1000),
+        success=success,
+        tokens_in=tokens_in,
+        tokens_out=tokens_out,
+        cost=compute_cost(kind, model, tokens_in, tokens_out),
+        retries=context.get("retries", 0),
+        uid=context.get("uid"),
+        theme=context.get("theme"),
+    )
+    task = asyncio.create_task(_save(record))
+    _pending.add(task)
+    task.add_done_callback(_pending.discard)
+
+
+async def _save(record: UsageRecord) -> None:
+    try:
+        await save_usage(record)
+    except Exception as exc:
+        logger.warning(f"Не удалось записать расход LLM: {exc}")
@@ -4,6 +4,8 @@ from typing import Any, Optional
 from aiogram.types import CallbackQuery
 
 from core.domain.services.ai.llm_image_content_generator import LLMImageContentGenerator
+from core.domain.services.users.user_progress import invalidate_user_summary
+from core.infrastructure.db.stats_summary import bump_stats_summary
 from core.application.decorators.block import async_with_generating_flag
 
 @async_with_generating_flag(lambda call, qs, logger, dispatcher: qs.uid, kind="card")
@@ -53,7 +55,9 @@ async def process_card_generation(
 
         # Сохраняем карточку в БД
         try:
+            await bump_stats_summary(cards=1, session=session)
             await save_card(qs.uid, qs.theme, qs.card_title, url.media, session)
+            invalidate_user_summary(qs.uid)
             return True
         except Exception as err:
             await call.message.edit_text(str(err))
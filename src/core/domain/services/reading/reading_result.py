@@ -7,7 +7,9 @@ from aiogram.types import CallbackQuery
 from config.constants import MAX_ATTEMPTS
 from core.domain.models.state import ReadingState
 from core.domain.services.cards.card_generator import process_card_generation
-from core.infrastructure.db import themes
+from core.domain.services.users.user_progress import invalidate_user_summary
+from core.infrastructure.db.reading_ops import save_reading_result
+from core.infrastructure.storage.reading_state_store import delete_session
 from bot.handlers.ui.ui_main import categories_kb
 
 logger = logging.getLogger(__name__)
@@ -18,14 +20,13 @@ async def save_card_and_notify(call: CallbackQuery, state: FSMContext, qs: Readi
     Сохраняет результаты, начисляет звезды, уведомляет пользователя,
     сохраняет карточку при победе, очищает состояние.
     """
-    async with AsyncSessionLocal() as session:
-        await log_text_generation(session, qs.uid, qs.theme)
-        bonus = await update_streak(qs.uid, session)
-        stars = calculate_stars(qs)
-        earned = stars + bonus
-        await add_user_stars(qs.uid, earned, session)
+    # Викторина заканчивается верным ответом либо исчерпанием попыток
+    answered_ok = int(qs.wrong < MAX_ATTEMPTS)
+    earned, bonus = await save_reading_result(qs.uid, qs.theme, calculate_stars(qs),
+                                              answered_ok=answered_ok,
+                                              answered_total=qs.wrong + answered_ok)
 
-    await themes.inc_theme(qs.uid, qs.theme)
+    invalidate_user_summary(qs.uid)
 
     message = build_result_message(qs, earned, bonus)
     await call.message.edit_text(message)
@@ -34,10 +35,12 @@ async def save_card_and_notify(call: CallbackQuery, state: FSMContext, qs: Readi
         if not await process_card_generation(call, qs, logger, dispatcher=dispatcher):
             await call.message.answer("📂 Выбери раздел:", reply_markup=categories_kb())
             await state.clear()
+            await delete_session(qs.uid)
             return
 
     await call.message.answer("📂 Выбери раздел:", reply_markup=categories_kb())
     await state.clear()
+    await delete_session(qs.uid)
 
 
 def calculate_stars(qs: ReadingState) -> int:
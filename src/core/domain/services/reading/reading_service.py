@@ -1,4 +1,5 @@
 import asyncio
+from typing import Optional
 
 from aiogram.fsm.context import FSMContext
 from aiogram.types import CallbackQuery
@@ -6,29 +7,37 @@ from aiogram.types import CallbackQuery
 from bot.handlers.ui.ui_main import reading
 from config.constants import DAILY_LIMIT_PER_THEME
 from core.domain.models.state import ReadingState
-from core.domain.services.ai.llm_text_content_generator import LLMTextContentGenerator
+from core.domain.services.ai.llm_text_content_generator import LLMTextContentGenerator, TextCallback
 from core.infrastructure.db.repositories.sqlalchemy_user_repository import SQLAlchemyUserRepository
-
-
-async def has_exceeded_daily_limit(uid: int, theme: str) -> bool:
-    """Проверяет, превышен ли дневной лимит генерации по теме для пользователя."""
-    async with SQLAlchemyUserRepository() as repo:
-        count = await repo.get_generated_count_today_by_user(uid, theme)
-        return count >= DAILY_LIMIT_PER_THEME
-
-
-async def prepare_first_question(uid: int, category: str, theme: str) -> ReadingState:
-    """Создаёт и возвращает начальное состояние викторины по теме для пользователя."""
+from core.infrastructure.storage.daily_quota import reserve_daily_slot
+from core.infrastructure.storage.reading_state_store import save_progress
+
+
+async def reserve_daily_reading(uid: int, theme: str) -> bool:
+    """
+    Резервирует чтение из дневного лимита по теме (счётчик в Redis).
+    Возвращает False, если лимит исчерпан. При неудачной генерации резерв возвращается release_daily_slot.
+    """
+    return await reserve_daily_slot(uid, theme, DAILY_LIMIT_PER_THEME)
+
+
+async def prepare_first_question(uid: int,
+                                 category: str,
+                                 theme: str,
+                                 on_text: Optional[TextCallback] = None) -> ReadingState:
+    """
+    Создаёт и возвращает начальное состояние викторины по теме для пользователя.
+    on_text получает текст по частям, пока он генерируется.
+    """
     async with SQLAlchemyUserRepository() as repo:
-        get_age = await repo.get_by_id(uid)
-        age = get_age.age
+        user = await repo.get_by_id(uid)
 
     generator = LLMTextContentGenerator(
         uid=uid,
         theme=theme,
-        age=age
+        birthdate=user.birth_date
     )
-    e = await generator.generate_text(category)
+    e = await generator.generate_text(category, on_text=on_text)
     first = e["qa"][0]
 
     return ReadingState(
@@ -40,7 +49,8 @@ async def prepare_first_question(uid: int, category: str, theme: str) -> Reading
         wrong=0,
         card_title=e["card"],
         word_count=len(e["text"].split()),
-        full_text=e["text"]
+        full_text=e["text"],
+        current=0
     )
 
 
@@ -53,7 +63,7 @@ async def prepare_next_question(call: CallbackQuery, state: FSMContext, qs: Read
         pass
 
     # Удаляем предыдущее мотивационное сообщение (если есть)
-    prev_fb_id = (await state.get_data()).get("feedback_msg_id")
+    prev_fb_id = qs.feedback_msg_id
     if prev_fb_id:
         try:
             await call.bot.delete_message(chat_id=call.message.chat.id, message_id=prev_fb_id)
@@ -61,13 +71,14 @@ async def prepare_next_question(call: CallbackQuery, state: FSMContext, qs: Read
             pass
 
     # Находим следующий не заданный вопрос, иначе — докидываем новые
-    next_q = next((qa for qa in qs.qa if qa["question"] not in qs.asked), None)
+    next_idx, next_q = next(((i, qa) for i, qa in enumerate(qs.qa) if qa["question"] not in qs.asked), (None, None))
     # if not next_q:
     #     # Если вдруг вопросы закончились — добавим ещё (или обработаем как надо)
     #     extra = await entry(qs.uid, qs.theme)
     #     qs.qa.extend(extra["qa"])
     #     next_q = extra["qa"][0]
 
+    qs.current = next_idx
     qs.correct = next_q["options"][0]
     qs.asked.add(next_q["question"])
 
@@ -75,10 +86,9 @@ async def prepare_next_question(call: CallbackQuery, state: FSMContext, qs: Read
     sent_fb = await call.message.answer("💪 Не сдавайся!", protect_content=True)
     qs.feedback_msg_id = sent_fb.message_id
 
-    # Сохраняем state и варианты для проверки ответа
-    await state.update_data(**qs.__dict__)
+    # Сохраняем прогресс и варианты для проверки ответа (текст и вопросы сессии не переписываются)
     keyboard, options = reading(next_q["options"])
-    await state.update_data(reading_options=options)
+    await save_progress(qs, options)
 
     # Пауза
     await asyncio.sleep(1)
@@ -1,38 +1,51 @@
-from typing import Any
+from typing import Any, Optional
 
+from async_lru import alru_cache
+
+from config.constants import USER_SUMMARY_CACHE_TTL, USER_SUMMARY_CACHE_SIZE
 from config.content import BADGES
-from core.infrastructure.db.connection import AsyncSessionLocal
+from core.domain.models.user import UserSummary
 from core.infrastructure.db.repositories.sqlalchemy_user_repository import SQLAlchemyUserRepository
-from core.infrastructure.db.user_ops import update_user_accuracy
 
 
-async def accuracy(uid: int, correct: bool):
-    """Обновляет статистику точности пользователя."""
-    async with AsyncSessionLocal.begin() as session:
-        await update_user_accuracy(uid, correct, session)
+@alru_cache(maxsize=USER_SUMMARY_CACHE_SIZE, ttl=USER_SUMMARY_CACHE_TTL)
+async def _load_user_summary(uid: int) -> Optional[UserSummary]:
+    async with SQLAlchemyUserRepository() as repo:
+        return await repo.get_summary(uid)
+
+
+async def get_user_summary(uid: int) -> Optional[UserSummary]:
+    """
+    Возвращает профиль пользователя со статистикой (один запрос к БД).
+    Результат кэшируется на USER_SUMMARY_CACHE_TTL секунд; после изменения статистики или статуса
+    вызывайте invalidate_user_summary. «Пользователь не найден» не кэшируется.
+    """
+    summary = await _load_user_summary(uid)
+    if summary is None:
+        _load_user_summary.cache_invalidate(uid)
+    return summary
+
+
+def invalidate_user_summary(uid: int) -> None:
+    """Сбрасывает закэшированный профиль пользователя."""
+    _load_user_summary.cache_invalidate(uid)
 
 
 async def user_summary(uid: int) -> dict[str, Any]:
     """Возвращает статистику пользователя: имя, звезды, карточки, вопросы, точность, серии, темы."""
-    async with SQLAlchemyUserRepository() as repo:
-        user = await repo.get_by_id(uid)
-        if not user:
-            return {}
-
-        themes = await repo.get_theme_by_user(uid)
-        questions_count = await repo.get_questions_count_by_user(uid)
-        card_count = await repo.get_card_count_by_user(uid)
-        stars_count = await repo.get_stars_count_by_user(uid)
+    summary = await get_user_summary(uid)
+    if not summary:
+        return {}
 
     return {
-        "name": user.name,
-        "stars": stars_count,
-        "q_ok": user.q_ok,
-        "q_tot": user.q_tot,
-        "streak": user.streak,
-        "questions_count": questions_count,
-        "card_count": card_count,
-        "themes": {t.theme: t.texts for t in themes}
+        "name": summary.user.name,
+        "stars": summary.stars,
+        "q_ok": summary.q_ok,
+        "q_tot": summary.q_tot,
+        "streak": summary.streak,
+        "questions_count": summary.questions_count,
+        "card_count": summary.card_count,
+        "themes": summary.themes
     }
 
 
@@ -1,6 +1,5 @@
-import aiohttp
-
 from config.settings import get_cloudflare_settings
+from core.infrastructure.clients.http_client import get_http_session
 
 
 async def get_cloudflare_worker_image_response(model, prompt):
@@ -17,7 +16,6 @@ async def get_cloudflare_worker_image_response(model, prompt):
     payload = {
         "prompt": prompt
     }
-    async with aiohttp.ClientSession() as session:
-        async with session.post(url, json=payload, headers=headers) as response:
-            response.raise_for_status()
-            return await response.read(), response.url.name
\ No newline at end of file
+    async with get_http_session().post(url, json=payload, headers=headers) as response:
+        response.raise_for_status()
+        return await response.read(), response.url.name
\ No newline at end of file
@@ -1,9 +1,12 @@
-from aiogram.client.session import aiohttp
+import json
+from typing import AsyncIterator
 
 from config.settings import get_gemini_settings
+from core.infrastructure.clients.http_client import get_http_session
+from core.infrastructure.clients.ai.utils.response_schema import GEMINI_READING_GENERATION_CONFIG
 
 
-async def _get_gemini_response(url, prompt):
+async def _get_gemini_response(url, prompt, generation_config=None):
     """Выполняет асинхронный POST-запрос к Google Gemini API."""
     headers = {
         'Content-Type': 'application/json'
@@ -17,18 +20,50 @@ async def _get_gemini_response(url, prompt):
             }
         ]
     }
-    async with aiohttp.ClientSession() as session:
-        async with session.post(url, json=payload, headers=headers) as response:
-            response.raise_for_status()
-            return await response.json()
+    if generation_config:
+        payload["generationConfig"] = generation_config
+    async with get_http_session().post(url, json=payload, headers=headers) as response:
+        response.raise_for_status()
+        return await response.json()
 
 
 async def get_google_gemini_text_response(model, prompt):
-    """Получает ответ от текстовой модели Google Gemini."""
+    """Получает ответ от текстовой модели Google Gemini в виде JSON по схеме ответа (responseSchema)."""
     ai_settings = get_gemini_settings()
 
     compose_url = f"{ai_settings.google_gemini_proxy_url}{model}?key={ai_settings.google_gemini_api_key}"
-    return await _get_gemini_response(compose_url, prompt)
+    generation_config = {**GEMINI_READING_GENERATION_CONFIG, "maxOutputTokens": ai_settings.text.max_tokens}
+    return await _get_gemini_response(compose_url, prompt, generation_config)
+
+
+async def stream_google_gemini_text_response(model, prompt, usage: dict | None = None) -> AsyncIterator[str]:
+    """
+    Получает ответ от текстовой модели Google Gemini в потоковом режиме (SSE) по фрагментам.
+    Если передан usage, в него записываются токены из usageMetadata (последнее событие — итог).
+    """
+    ai_settings = get_gemini_settings()
+
+    stream_model = model.replace(":generateContent", ":streamGenerateContent")
+    compose_url = (f"{ai_settings.google_gemini_proxy_url}{stream_model}"
+                   f"?alt=sse&key={ai_settings.google_gemini_api_key}")
+    payload = {
+        "contents": [{"parts": [{"text": prompt}]}],
+        "generationConfig": {**GEMINI_READING_GENERATION_CONFIG, "maxOutputTokens": ai_settings.text.max_tokens},
+    }
+    async with get_http_session().post(compose_url, json=payload) as response:
+        response.raise_for_status()
+        async for line in response.content:
+            line = line.decode().strip()
+            if not line.startswith("data:"):
+                continue
+            event = json.loads(line[len("data:"):])
+            if "usageMetadata" in event and usage is not None:
+                usage.update(tokens_in=event["usageMetadata"].get("promptTokenCount"),
+                             tokens_out=event["usageMetadata"].get("candidatesTokenCount"))
+            for candidate in event.get("candidates", []):
+                for part in candidate.get("content", {}).get("parts", []):
+                    if part.get("text"):
+                        yield part["text"]
 
 
 # TODO Imagen model need pay
@@ -1,25 +1,55 @@
-from typing import Literal
+from functools import lru_cache
+from typing import Literal, AsyncIterator
 
 from openai import AsyncOpenAI
 
 from config.settings import get_openai_settings
+from core.infrastructure.clients.http_client import get_httpx_client
+from core.infrastructure.clients.ai.utils.response_schema import OPENAI_READING_RESPONSE_FORMAT
 
 
 ai_settings = get_openai_settings()
-client_open_ai = AsyncOpenAI(api_key=ai_settings.openai_api_key)
+
+
+@lru_cache
+def get_client_open_ai() -> AsyncOpenAI:
+    """Клиент OpenAI поверх общего пула HTTP-соединений (создаётся после инициализации пула)."""
+    return AsyncOpenAI(api_key=ai_settings.openai_api_key, http_client=get_httpx_client())
 
 
 async def get_openai_gpt_text_response(model, prompt):
-    """Асинхронно вызывает OpenAI GPT и возвращает сгенерированный текст."""
-    response = await client_open_ai.chat.completions.create(
+    """Асинхронно вызывает OpenAI GPT и возвращает сгенерированный текст (JSON по схеме ответа)."""
+    response = await get_client_open_ai().chat.completions.create(
         model=model,
-        messages=[{"role": "users", "content": prompt}],
+        messages=[{"role": "user", "content": prompt}],
         temperature=0.8,
-        max_tokens=600,
+        max_tokens=ai_settings.text.max_tokens,
+        response_format=OPENAI_READING_RESPONSE_FORMAT,
     )
     return response
 
 
+async def stream_openai_gpt_text_response(model, prompt, usage: dict | None = None) -> AsyncIterator[str]:
+    """
+    Асинхронно вызывает OpenAI GPT в потоковом режиме и отдаёт фрагменты текста по мере генерации.
+    Если передан usage, в него записываются токены из последнего чанка.
+    """
+    stream = await get_client_open_ai().chat.completions.create(
+        model=model,
+        messages=[{"role": "user", "content": prompt}],
+        temperature=0.8,
+        max_tokens=ai_settings.text.max_tokens,
+        response_format=OPENAI_READING_RESPONSE_FORMAT,
+        stream=True,
+        stream_options={"include_usage": True},
+    )
+    async for chunk in stream:
+        if chunk.usage and usage is not None:
+            usage.update(tokens_in=chunk.usage.prompt_tokens, tokens_out=chunk.usage.completion_tokens)
+        if chunk.choices and chunk.choices[0].delta.content:
+            yield chunk.choices[0].delta.content
+
+
 async def get_openai_dalle_image_response(model,
                                           prompt: str,
                                           n: int = 1,
@@ -28,7 +58,7 @@ async def get_openai_dalle_image_response(model,
     """
     Асинхронно вызывает OpenAI DALL-E и возвращает URL сгенерированного изображения.
     """
-    response = await client_open_ai.images.generate(
+    response = await get_client_open_ai().images.generate(
         model=model,
         prompt=prompt,
         n=n,
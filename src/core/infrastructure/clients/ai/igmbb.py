@@ -1,8 +1,7 @@
 import base64
 
-from aiogram.client.session import aiohttp
-
 from config.settings import get_imgbb_settings
+from core.infrastructure.clients.http_client import get_http_session
 
 imgbb_settings = get_imgbb_settings()
 
@@ -13,10 +12,9 @@ async def upload_to_imgbb(raw):
         "key": imgbb_settings.imgbb_api_key,
         "image": image_base64
     }
-    async with aiohttp.ClientSession() as session:
-        async with session.post(url, data=payload) as resp:
-            data = await resp.json()
-            if not data.get('success', False):
-                error_message = data.get('error', {}).get('message', 'Unknown error')
-                raise f"Failed to upload to imgbb: {error_message}"
-            return data
+    async with get_http_session().post(url, data=payload) as resp:
+        data = await resp.json()
+        if not data.get('success', False):
+            error_message = data.get('error', {}).get('message', 'Unknown error')
+            raise f"Failed to upload to imgbb: {error_message}"
+        return data
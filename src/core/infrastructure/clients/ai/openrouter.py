@@ -1,19 +1,46 @@
+from functools import lru_cache
+from typing import AsyncIterator
+
 from openai import AsyncOpenAI
 
 from config.settings import get_deepseek_settings
+from core.infrastructure.clients.http_client import get_httpx_client
 
 ai_settings = get_deepseek_settings()
 
-client_openrouter_ai = AsyncOpenAI(
-    base_url=ai_settings.openrouter_url,
-    api_key=ai_settings.openrouter_api_key
-)
+
+@lru_cache
+def get_client_openrouter_ai() -> AsyncOpenAI:
+    """Клиент OpenRouter поверх общего пула HTTP-соединений (создаётся после инициализации пула)."""
+    return AsyncOpenAI(
+        base_url=ai_settings.openrouter_url,
+        api_key=ai_settings.openrouter_api_key,
+        http_client=get_httpx_client()
+    )
 
 
 async def get_openrouter_deepseek_text_response(model, prompt):
     """Асинхронно вызывает OpenRouter (deepseek) и возвращает сгенерированный текст."""
-    response = await client_openrouter_ai.chat.completions.create(
+    response = await get_client_openrouter_ai().chat.completions.create(
         model=model,
-        messages=[{"role": "users", "content": prompt}],
+        messages=[{"role": "user", "content": prompt}],
     )
     return response
+
+
+async def stream_openrouter_deepseek_text_response(model, prompt, usage: dict | None = None) -> AsyncIterator[str]:
+    """
+    Асинхронно вызывает OpenRouter (deepseek) в потоковом режиме и отдаёт фрагменты текста.
+    Если передан usage, в него записываются токены из последнего чанка.
+    """
+    stream = await get_client_openrouter_ai().chat.completions.create(
+        model=model,
+        messages=[{"role": "user", "content": prompt}],
+        stream=True,
+        stream_options={"include_usage": True},
+    )
+    async for chunk in stream:
+        if chunk.usage and usage is not None:
+            usage.update(tokens_in=chunk.usage.prompt_tokens, tokens_out=chunk.usage.completion_tokens)
+        if chunk.choices and chunk.choices[0].delta.content:
+            yield chunk.choices[0].delta.content
@@ -1,64 +1,72 @@
-import json
+import logging
 import re
 
-import dirtyjson
+from core.infrastructure.clients.ai.utils.tolerant_json import parse_llm_json
+
+logger = logging.getLogger(__name__)
+
+REPAIR_QA_SALVAGED = "qa_salvaged"
+QA_SIZE = 3
 
 
 def normalize_llm_chatgpt_response(llm_response: str) -> dict | None:
     """
-    Парсит строку ответа модели LLM, сначала очищая её с помощью внутренней функции _clean_llm_json,
-    а затем пытаясь загрузить как JSON с помощью dirtyjson.
+    Парсит строку ответа модели LLM толерантным парсером parse_llm_json
+    (исправляет ограждения, кавычки, запятые и обрезанный хвост) и разбивает текст на абзацы.
     Возвращает распарсенный объект, либо вызывает исключение, если парсинг не удался.
     """
-    cleaned = _clean_llm_json(llm_response)
     try:
-        raw = dirtyjson.loads(cleaned)
-        if paragraphs := split_into_paragraphs(raw.get('text')):
-            raw['text'] = paragraphs
-        return raw
-    except Exception as e:
-        raise RuntimeError(f"Ошибка парсинга LLM-JSON Open AI: {llm_response}")
+        raw = _parse_and_salvage(llm_response)
+    except ValueError as e:
+        raise RuntimeError(f"Ошибка парсинга LLM-JSON Open AI: {e}\n{llm_response}")
+    return format_text_paragraphs(raw)
 
 
-def escape_control_characters(text: str) -> str:
-    # Заменяем невалидные управляющие символы на их escape-последовательности
-    return text.replace('\r\n', '\\n').replace('\n', '\\n').replace('\r', '\\n')
+def format_text_paragraphs(data: dict) -> dict:
+    """Разбивает data['text'] на абзацы (по 3 предложения), если в нём есть предложения."""
+    if paragraphs := split_into_paragraphs(data.get('text') or ''):
+        data['text'] = paragraphs
+    return data
 
 
 def normalize_llm_gemini_response(llm_response: str) -> dict | None:
-    if not llm_response or not isinstance(llm_response, str):
-        raise ValueError("Входная строка отсутствует или не является строкой.")
-
-    response = llm_response.strip()
-    response = re.sub(r"^```(?:json)?\s*", "", response, flags=re.IGNORECASE)
-    response = re.sub(r"\s*```$", "", response)
-    response = response.strip()
-    if not response:
-        raise ValueError("Пустой ответ после удаления маркеров.")
-
-    # ВАЖНО: экранируем только управляющие символы в тексте (желательно только внутри значений!)
-    response = escape_control_characters(response)
-
+    """Парсит ответ Gemini толерантным парсером parse_llm_json."""
     try:
-        return json.loads(response)
-    except Exception as e:
-        raise ValueError(f"Не удалось преобразовать строку в JSON: {e}\nСтрока: {response}")
+        return _parse_and_salvage(llm_response)
+    except ValueError as e:
+        raise ValueError(f"Не удалось преобразовать строку в JSON: {e}\nСтрока: {llm_response}")
+
+
+def _parse_and_salvage(llm_response: str) -> dict:
+    """Разбирает JSON ответа, спасает корректные элементы qa и логирует применённые исправления."""
+    raw, repairs = parse_llm_json(llm_response)
+    if salvage_qa(raw):
+        repairs.append(REPAIR_QA_SALVAGED)
+    if repairs:
+        logger.info(f"LLM-JSON исправлен: {', '.join(repairs)}")
+    return raw
 
 
-def _clean_llm_json(raw: str) -> str:
+def salvage_qa(data: dict) -> bool:
     """
-    Очищает исходную строку, содержащую JSON-данные, для последующего парсинга.
-    Выполняет следующие действия:
-    - Вырезает только часть строки, содержащую JSON (от первой открывающейся до последней закрывающейся скобки).
-    - Заменяет одинарные кавычки ' на двойные ", чтобы соответствовать стандарту JSON.
-    - Удаляет запятые, расположенные перед закрывающими скобками ] или }, что делает JSON синтаксис корректным.
+    Оставляет в data['qa'] только полные вопросы (question + 3 варианта) и не больше QA_SIZE.
+    Так обрезанный или лишний последний вопрос не отбрасывает всю генерацию.
+    Возвращает True, если qa пришлось изменить.
     """
-    match = re.search(r'(\{[\s\S]*\})', raw)
-    if match:
-        raw = match.group(1)
-    raw = raw.replace("'", '"')
-    raw = re.sub(r',(\s*[\]\}])', r'\1', raw)
-    return raw
+    qa = data.get("qa")
+    if not isinstance(qa, list):
+        return False
+    complete = [
+        item for item in qa
+        if isinstance(item, dict)
+        and isinstance(item.get("question"), str)
+        and isinstance(item.get("options"), list)
+        and len(item["options"]) == 3
+    ][:QA_SIZE]
+    if len(complete) == len(qa):
+        return False
+    data["qa"] = complete
+    return True
 
 
 def split_into_paragraphs(text, sentences_per_paragraph=3):
@@ -79,7 +87,7 @@ def validate_generated_data(data: dict[str, object]) -> None:
     Если структура некорректна — выбрасывает исключение ValueError.
     """
     qa = data.get("qa")
-    if not isinstance(qa, list) or len(qa) != 3:
+    if not isinstance(qa, list) or len(qa) != QA_SIZE:
         raise ValueError("Поле 'qa' должно быть списком из 3 элементов.")
     for idx, item in enumerate(qa, 1):
         if not (
@@ -0,0 +1,74 @@
+# Схема ответа с текстом для чтения: та же форма, что проверяет validate_generated_data
+READING_RESPONSE_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "text": {"type": "string"},
+        "card": {"type": "string"},
+        "qa": {
+            "type": "array",
+            "minItems": 3,
+            "maxItems": 3,
+            "items": {
+                "type": "object",
+                "properties": {
+                    "question": {"type": "string"},
+                    "options": {
+                        "type": "array",
+                        "minItems": 3,
+                        "maxItems": 3,
+                        "items": {"type": "string"},
+                    },
+                },
+                "required": ["question", "options"],
+                "additionalProperties": False,
+            },
+        },
+    },
+    "required": ["text", "card", "qa"],
+    "additionalProperties": False,
+}
+
+# OpenAI Structured Outputs (response_format)
+OPENAI_READING_RESPONSE_FORMAT = {
+    "type": "json_schema",
+    "json_schema": {
+        "name": "reading_text",
+        "strict": True,
+        "schema": READING_RESPONSE_SCHEMA,
+    },
+}
+
+# Gemini responseSchema (подмножество OpenAPI: без additionalProperties, с порядком полей)
+GEMINI_READING_RESPONSE_SCHEMA = {
+    "type": "OBJECT",
+    "properties": {
+        "text": {"type": "STRING"},
+        "card": {"type": "STRING"},
+        "qa": {
+            "type": "ARRAY",
+            "minItems": 3,
+            "maxItems": 3,
+            "items": {
+                "type": "OBJECT",
+                "properties": {
+                    "question": {"type": "STRING"},
+                    "options": {
+                        "type": "ARRAY",
+                        "minItems": 3,
+                        "maxItems": 3,
+                        "items": {"type": "STRING"},
+                    },
+                },
+                "required": ["question", "options"],
+                "propertyOrdering": ["question", "options"],
+            },
+        },
+    },
+    "required": ["text", "card", "qa"],
+    "propertyOrdering": ["text", "card", "qa"],
+}
+
+GEMINI_READING_GENERATION_CONFIG = {
+    "responseMimeType": "application/json",
+    "responseSchema": GEMINI_READING_RESPONSE_SCHEMA,
+}
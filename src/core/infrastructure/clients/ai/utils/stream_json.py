@@ -0,0 +1,94 @@
+_ESCAPES = {
+    '"': '"',
+    '\\': '\\',
+    '/': '/',
+    'b': '\b',
+    'f': '\f',
+    'n': '\n',
+    'r': '\r',
+    't': '\t',
+}
+
+
+class JsonStringFieldStream:
+    """
+    Инкрементально извлекает значение строкового поля из JSON, который приходит частями.
+
+    Ответ LLM не парсится целиком: достаточно найти ключ field и декодировать
+    его строковое значение по мере поступления символов. Незавершённые
+    escape-последовательности на границе чанков откладываются до следующего feed.
+
+    Пример:
+        stream = JsonStringFieldStream("text")
+        stream.feed('{"text": "Прив')   # -> 'Прив'
+        stream.feed('ет\\nмир", "qa"')  # -> 'Привет\\nмир'
+    """
+
+    def __init__(self, field: str):
+        self._marker = f'"{field}"'
+        self._buffer = ""
+        self._pos = 0
+        self._started = False
+        self.value = ""
+        self.done = False
+
+    def feed(self, chunk: str) -> str:
+        """Добавляет очередной фрагмент ответа и возвращает декодированное значение поля."""
+        self._buffer += chunk
+        if self.done:
+            return self.value
+        if not self._started and not self._find_value_start():
+            return self.value
+        self._decode()
+        return self.value
+
+    def _find_value_start(self) -> bool:
+        idx = self._buffer.find(self._marker, self._pos)
+        if idx == -1:
+            # Ключ может быть разрезан между чанками — оставляем хвост длиной в маркер
+            self._pos = max(0, len(self._buffer) - len(self._marker))
+            return False
+        pos = idx + len(self._marker)
+        while pos < len(self._buffer) and self._buffer[pos] in ' \t\r\n:':
+            pos += 1
+        if pos >= len(self._buffer):
+            self._pos = idx
+            return False
+        if self._buffer[pos] != '"':
+            # Это не строковое значение (или ключ внутри другого текста) — ищем дальше
+            self._pos = pos
+            return self._find_value_start()
+        self._pos = pos + 1
+        self._started = True
+        return True
+
+    def _decode(self) -> None:
+        buf = self._buffer
+        pos = self._pos
+        parts = []
+        while pos < len(buf):
+            ch = buf[pos]
+            if ch == '"':
+                self.done = True
+                pos += 1
+                break
+            if ch != '\\':
+                parts.append(ch)
+                pos += 1
+                continue
+            if pos + 1 >= len(buf):
+                break
+            esc = buf[pos + 1]
+            if esc == 'u':
+                if pos + 6 > len(buf):
+                    break
+                try:
+                    parts.append(chr(int(buf[pos + 2:pos + 6], 16)))
+                except ValueError:
+                    parts.append(buf[pos:pos + 6])
+                pos += 6
+                continue
+            parts.append(_ESCAPES.get(esc, esc))
+            pos += 2
+        self._pos = pos
+        self.value += ''.join(parts)
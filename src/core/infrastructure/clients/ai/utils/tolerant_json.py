@@ -0,0 +1,232 @@
+import json
+import re
+from dataclasses import dataclass
+
+# Названия исправлений, которые возвращает repair_json
+REPAIR_FENCE = "fence"
+REPAIR_TRAILING_TEXT = "trailing_text"
+REPAIR_SINGLE_QUOTES = "single_quotes"
+REPAIR_INNER_QUOTES = "inner_quotes"
+REPAIR_CONTROL_CHARS = "control_chars"
+REPAIR_TRAILING_COMMAS = "trailing_commas"
+REPAIR_TRUNCATED = "truncated"
+
+_ESCAPED_CONTROL = {'\n': '\\n', '\r': '\\n', '\t': '\\t'}
+_WHITESPACE = ' \t\r\n'
+# Число или литерал, за которым следует разделитель: продолжение массива после запятой
+_SCALAR_AHEAD = re.compile(r'(?:-?\d+(?:\.\d+)?(?:[eE][+-]?\d+)?|true|false|null)[ \t\r\n]*(?:[,\]}]|$)')
+
+
+@dataclass
+class _Frame:
+    kind: str  # '{' или '['
+    expect_key: bool
+    safe_len: int  # длина вывода после последнего завершённого элемента
+
+
+def _skip_ws(raw: str, i: int) -> int:
+    while i < len(raw) and raw[i] in _WHITESPACE:
+        i += 1
+    return i
+
+
+def _is_key_ahead(raw: str, i: int) -> bool:
+    """С позиции i начинается ключ объекта: строка в кавычках, за которой идёт двоеточие."""
+    quote = raw[i]
+    if quote not in '"\'':
+        return False
+    j = i + 1
+    while j < len(raw) and raw[j] != quote:
+        if raw[j] == '\n':
+            return False
+        j += 2 if raw[j] == '\\' else 1
+    if j >= len(raw):
+        return True  # ввод обрезан внутри ключа
+    j = _skip_ws(raw, j + 1)
+    return j >= len(raw) or raw[j] == ':'
+
+
+def _is_value_ahead(raw: str, i: int) -> bool:
+    """С позиции i начинается следующий элемент массива (или массив закрывается)."""
+    return raw[i] in '"\'{[]' or _SCALAR_AHEAD.match(raw, i) is not None
+
+
+def _is_closing_quote(raw: str, pos: int, stack: list[_Frame], is_value: bool) -> bool:
+    """
+    Решает, закрывает ли кавычка в позиции pos строку или это неэкранированная
+    кавычка внутри текста (например, «Он сказал "привет" и ушёл»).
+    После ключа должно идти двоеточие. После значения — конец ввода, закрывающая скобка
+    текущего контейнера или запятая, за которой следует правдоподобное продолжение:
+    в объекте — следующий ключ "...":, в массиве — следующий элемент.
+    """
+    n = len(raw)
+    i = _skip_ws(raw, pos + 1)
+    if i >= n:
+        return True
+    if not is_value:
+        return raw[i] == ':'
+
+    frame = stack[-1]
+    if raw[i] in '}]':
+        if raw[i] != ('}' if frame.kind == '{' else ']'):
+            return False
+        if len(stack) == 1:
+            # Корневой объект закрывается последней } в ответе, дальше может быть только текст
+            return '}' not in raw[i + 1:]
+        j = _skip_ws(raw, i + 1)
+        return j >= n or raw[j] in ',}]'
+    if raw[i] != ',':
+        return False
+
+    i = _skip_ws(raw, i + 1)
+    if i >= n:
+        return True
+    if frame.kind == '{':
+        return raw[i] == '}' or _is_key_ahead(raw, i)
+    return _is_value_ahead(raw, i)
+
+
+def repair_json(raw: str) -> tuple[str, list[str]]:
+    """
+    Исправляет типичные дефекты JSON от LLM за один линейный проход.
+
+    - текст и ```-ограждения до первой { и после закрытия корневого объекта;
+    - строки в одинарных кавычках;
+    - неэкранированные двойные кавычки внутри строк;
+    - сырые переводы строк и табуляции внутри строк;
+    - запятые перед } и ];
+    - обрезанный хвост: незакрытая строка закрывается, недописанный элемент
+      отбрасывается, открытые объекты и массивы закрываются.
+
+    Возвращает исправленную строку и список применённых исправлений (REPAIR_*).
+    """
+    repairs: list[str] = []
+
+    def note(repair: str) -> None:
+        if repair not in repairs:
+            repairs.append(repair)
+
+    start = raw.find('{')
+    if start == -1:
+        raise ValueError("В ответе нет JSON-объекта.")
+    if raw[:start].strip():
+        note(REPAIR_FENCE)
+
+    out: list[str] = []
+    stack: list[_Frame] = []
+    quote: str | None = None  # символ, открывший текущую строку
+    string_is_value = False
+    n = len(raw)
+    pos = start
+
+    def complete_value() -> None:
+        frame = stack[-1]
+        frame.safe_len = len(out)
+
+    while pos < n:
+        ch = raw[pos]
+
+        if quote:
+            if ch == '\\' and pos + 1 < n:
+                out.append(raw[pos:pos + 2])
+                pos += 2
+                continue
+            if ch == quote and _is_closing_quote(raw, pos, stack, string_is_value):
+                out.append('"')
+                quote = None
+                if string_is_value:
+                    complete_value()
+            elif ch == '"':
+                # Кавычка внутри строки в одинарных кавычках или неэкранированная кавычка в тексте
+                if quote == '"':
+                    note(REPAIR_INNER_QUOTES)
+                out.append('\\"')
+            elif ch in _ESCAPED_CONTROL:
+                note(REPAIR_CONTROL_CHARS)
+                if ch == '\r' and raw[pos + 1:pos + 2] == '\n':
+                    pos += 1
+                out.append(_ESCAPED_CONTROL[ch])
+            elif ch < ' ':
+                note(REPAIR_CONTROL_CHARS)
+            else:
+                out.append(ch)
+            pos += 1
+            continue
+
+        if ch in '"\'':
+            if ch == "'":
+                note(REPAIR_SINGLE_QUOTES)
+            quote = ch
+            frame = stack[-1] if stack else None
+            string_is_value = frame is not None and (frame.kind == '[' or not frame.expect_key)
+            out.append('"')
+        elif ch in '{[':
+            out.append(ch)
+            stack.append(_Frame(kind=ch, expect_key=ch == '{', safe_len=len(out)))
+        elif ch in '}]':
+            while out and out[-1] in ' \t\r\n':
+                out.pop()
+            if out and out[-1] == ',':
+                note(REPAIR_TRAILING_COMMAS)
+                out.pop()
+            out.append(ch)
+            stack.pop()
+            if not stack:
+                if raw[pos + 1:].strip():
+                    note(REPAIR_TRAILING_TEXT if raw[pos + 1:].strip().strip('`') else REPAIR_FENCE)
+                break
+            complete_value()
+        elif ch == ':':
+            out.append(ch)
+            stack[-1].expect_key = False
+        elif ch == ',':
+            frame = stack[-1]
+            if frame.kind == '[' or not frame.expect_key:
+                # Числа и литералы завершаются запятой
+                frame.safe_len = len(out)
+            frame.expect_key = frame.kind == '{'
+            out.append(ch)
+        else:
+            out.append(ch)
+        pos += 1
+
+    if stack:
+        note(REPAIR_TRUNCATED)
+        if quote:
+            out.append('"')
+            if string_is_value:
+                complete_value()
+        while stack:
+            frame = stack.pop()
+            del out[frame.safe_len:]
+            while out and out[-1] in ' \t\r\n,':
+                out.pop()
+            out.append('}' if frame.kind == '{' else ']')
+            if stack:
+                complete_value()
+
+    return ''.join(out), repairs
+
+
+def parse_llm_json(raw: str) -> tuple[dict, list[str]]:
+    """
+    Разбирает JSON-объект из ответа LLM, при необходимости исправляя его через repair_json.
+    Возвращает объект и список применённых исправлений; ValueError, если восстановить JSON не удалось.
+    """
+    if not raw or not isinstance(raw, str):
+        raise ValueError("Входная строка отсутствует или не является строкой.")
+    try:
+        data = json.loads(raw)
+        if isinstance(data, dict):
+            return data, []
+    except json.JSONDecodeError:
+        pass
+
+    repaired, repairs = repair_json(raw)
+    try:
+        data = json.loads(repaired)
+    except json.JSONDecodeError as e:
+        raise ValueError(f"Не удалось восстановить JSON ({', '.join(repairs)}): {e}") from e
+    if not isinstance(data, dict):
+        raise ValueError("Ответ LLM не является JSON-объектом.")
+    return data, repairs
@@ -0,0 +1,74 @@
+import logging
+
+import aiohttp
+import httpx
+
+logger = logging.getLogger(__name__)
+
+_http_session: aiohttp.ClientSession | None = None
+_httpx_client: httpx.AsyncClient | None = None
+
+
+async def init_http_client(app, http_settings):
+    """
+    Инициализация общих HTTP-клиентов с пулом соединений.
+
+    aiohttp-сессия используется Telegram, Gemini, Cloudflare, imgbb и загрузкой изображений,
+    httpx-клиент — SDK OpenAI (OpenAI и OpenRouter). Соединения переиспользуются
+    (keep-alive), число соединений ограничено в целом и на хост, DNS кэшируется.
+    """
+    global _http_session, _httpx_client
+
+    connector = aiohttp.TCPConnector(
+        limit=http_settings.http_pool_limit,
+        limit_per_host=http_settings.http_pool_limit_per_host,
+        ttl_dns_cache=http_settings.http_dns_cache_ttl,
+        keepalive_timeout=http_settings.http_keepalive_timeout,
+    )
+    timeout = aiohttp.ClientTimeout(
+        total=http_settings.http_total_timeout,
+        connect=http_settings.http_connect_timeout,
+        sock_read=http_settings.http_read_timeout,
+    )
+    _http_session = aiohttp.ClientSession(connector=connector, timeout=timeout)
+    app.state.aiohttp_session = _http_session
+
+    _httpx_client = httpx.AsyncClient(
+        limits=httpx.Limits(
+            max_connections=http_settings.http_pool_limit,
+            max_keepalive_connections=http_settings.http_max_keepalive,
+            keepalive_expiry=http_settings.http_keepalive_timeout,
+        ),
+        timeout=httpx.Timeout(
+            http_settings.http_total_timeout,
+            connect=http_settings.http_connect_timeout,
+            read=http_settings.http_read_timeout,
+        ),
+    )
+    app.state.httpx_client = _httpx_client
+
+    logger.info("✅ HTTP client pools initialized")
+    return _http_session
+
+
+async def close_http_client():
+    """Закрывает общие HTTP-клиенты при остановке приложения."""
+    global _http_session, _httpx_client
+    if _http_session is not None:
+        await _http_session.close()
+        _http_session = None
+    if _httpx_client is not None:
+        await _httpx_client.aclose()
+        _httpx_client = None
+
+
+def get_http_session() -> aiohttp.ClientSession:
+    if _http_session is None:
+        raise RuntimeError("HTTP client is not initialized")
+    return _http_session
+
+
+def get_httpx_client() -> httpx.AsyncClient:
+    if _httpx_client is None:
+        raise RuntimeError("HTTP client is not initialized")
+    return _httpx_client
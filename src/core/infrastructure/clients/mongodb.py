@@ -5,6 +5,8 @@ from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorDatabase
 
 logger = logging.getLogger(__name__)
 
+_mongo_db: AsyncIOMotorDatabase | None = None
+
 
 async def init_mongo(app, db_settings):
     """
@@ -14,6 +16,9 @@ async def init_mongo(app, db_settings):
     app.state.mongo_client = mongo_client
     app.state.db = mongo_client[db_settings.mongodb_name]
 
+    global _mongo_db
+    _mongo_db = app.state.db
+
     try:
         await app.state.db.command("ping")
         logger.info(f"✅ MongoDB connected to {db_settings.mongodb_name}")
@@ -23,10 +28,19 @@ async def init_mongo(app, db_settings):
     await app.state.db["quiz_questions_history"].update_one({"_id": "__init__"},
                                                             {"$setOnInsert": {}},
                                                             upsert=True)
+    await app.state.db["history"].create_index("entries.hash")
+    await app.state.db["llm_usage_daily"].create_index("day")
 
     return mongo_client
 
 
+# Доступ к базе вне контекста запроса (фоновые задачи, сервисы)
+def get_mongo_db() -> AsyncIOMotorDatabase:
+    if _mongo_db is None:
+        raise RuntimeError("MongoDB is not initialized")
+    return _mongo_db
+
+
 # Доступ к базе
 def get_db(request: Request) -> AsyncIOMotorDatabase:
     return request.app.state.db
@@ -1,12 +1,40 @@
+import time
+
 import redis.asyncio as redis
 import logging
 
+from core.infrastructure.metrics import redis_roundtrip_seconds
+
+
+class TimedConnection(redis.Connection):
+    """
+    Соединение Redis, замеряющее время от отправки команды до первого ответа.
+    Пайплайн отправляется одним пакетом и считается одним round trip;
+    сообщения pubsub без предшествующей команды не замеряются.
+    """
+
+    _sent_at: float | None = None
+
+    async def send_packed_command(self, *args, **kwargs):
+        self._sent_at = time.perf_counter()
+        return await super().send_packed_command(*args, **kwargs)
+
+    async def read_response(self, *args, **kwargs):
+        try:
+            return await super().read_response(*args, **kwargs)
+        finally:
+            if self._sent_at is not None:
+                redis_roundtrip_seconds.observe(time.perf_counter() - self._sent_at)
+                self._sent_at = None
+
+
 async def init_redis(app, redis_settings):
     """
     Инициализация Redis клиента и проверка соединения.
     """
     redis_url = redis_settings.redis_url
-    redis_client = redis.from_url(redis_url, encoding="utf-8", decode_responses=True)
+    redis_client = redis.from_url(redis_url, encoding="utf-8", decode_responses=True,
+                                  connection_class=TimedConnection)
     app.state.redis = redis_client
 
     try:
@@ -0,0 +1,61 @@
+import asyncio
+import logging
+from datetime import datetime, timezone
+
+from sqlalchemy import update, bindparam, func
+
+from core.infrastructure.db.connection import AsyncSessionLocal
+from core.infrastructure.db.models import User
+
+logger = logging.getLogger(__name__)
+
+_users = User.__table__
+
+
+class ActivityBuffer:
+    """
+    Буфер активности пользователей (write-behind).
+
+    touch только запоминает время последнего апдейта пользователя в памяти:
+    повторные апдейты одного пользователя схлопываются в одну запись.
+    flush записывает накопленное одним пакетным UPDATE (executemany),
+    first_active выставляется, только если ещё не задан.
+    """
+
+    def __init__(self):
+        self._pending: dict[int, datetime] = {}
+
+    def touch(self, uid: int, at: datetime | None = None) -> None:
+        """Отмечает активность пользователя (без обращения к БД)."""
+        self._pending[uid] = at or datetime.now(timezone.utc)
+
+    async def flush(self) -> int:
+        """Записывает накопленную активность в БД. Возвращает число обновлённых пользователей."""
+        if not self._pending:
+            return 0
+        batch, self._pending = self._pending, {}
+        stmt = (update(_users)
+                .where(_users.c.telegram_id == bindparam("uid"))
+                .values(last_active=bindparam("ts"),
+                        first_active=func.coalesce(_users.c.first_active, bindparam("ts"))))
+        try:
+            async with AsyncSessionLocal.begin() as session:
+                await session.execute(stmt, [{"uid": uid, "ts": ts} for uid, ts in batch.items()])
+        except BaseException:
+            # Возвращаем пакет в буфер (и при отмене задачи), не затирая более свежие отметки
+            for uid, ts in batch.items():
+                self._pending.setdefault(uid, ts)
+            raise
+        return len(batch)
+
+    async def run(self, interval: float) -> None:
+        """Фоновая задача: сбрасывает буфер каждые interval секунд."""
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await self.flush()
+            except Exception as e:
+                logger.warning(f"Не удалось записать активность пользователей: {e}")
+
+
+activity_buffer = ActivityBuffer()
@@ -0,0 +1,35 @@
+"""Add stats_summary table
+
+Revision ID: add_stats_summary
+Revises: restore_user_progress_columns
+Create Date: 2026-10-18 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'add_stats_summary'
+down_revision = 'restore_user_progress_columns'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'stats_summary',
+        sa.Column('id', sa.Integer(), primary_key=True),
+        sa.Column('total_users', sa.BigInteger(), nullable=False, server_default='0'),
+        sa.Column('approved_users', sa.BigInteger(), nullable=False, server_default='0'),
+        sa.Column('avg_accuracy', sa.Float(), nullable=False, server_default='0'),
+        sa.Column('total_stars', sa.BigInteger(), nullable=False, server_default='0'),
+        sa.Column('avg_active_seconds', sa.Float(), nullable=False, server_default='0'),
+        sa.Column('total_questions', sa.BigInteger(), nullable=False, server_default='0'),
+        sa.Column('total_cards', sa.BigInteger(), nullable=False, server_default='0'),
+        sa.Column('refreshed_at', sa.DateTime(timezone=True), nullable=True),
+    )
+
+
+def downgrade():
+    op.drop_table('stats_summary')
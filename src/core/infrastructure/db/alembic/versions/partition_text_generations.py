@@ -0,0 +1,86 @@
+"""Partition text_generations by month and add composite index
+
+Revision ID: partition_text_generations
+Revises: add_stats_summary
+Create Date: 2026-10-18 00:00:00.000000
+
+"""
+from datetime import date
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'partition_text_generations'
+down_revision = 'add_stats_summary'
+branch_labels = None
+depends_on = None
+
+MONTHS_AHEAD = 2
+
+
+def _add_months(month: date, months: int) -> date:
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def upgrade():
+    conn = op.get_bind()
+
+    # Старая таблица переименовывается, её последовательность id переходит к новой
+    op.execute("ALTER TABLE text_generations RENAME TO text_generations_legacy")
+    op.execute("DROP INDEX IF EXISTS ix_text_generations_user_id")
+    op.execute("DROP INDEX IF EXISTS ix_text_generations_theme")
+    op.execute("""
+        CREATE TABLE text_generations (
+            id INTEGER NOT NULL DEFAULT nextval('text_generations_id_seq'),
+            user_id INTEGER NOT NULL,
+            theme VARCHAR NOT NULL,
+            created_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT now(),
+            PRIMARY KEY (id, created_at)
+        ) PARTITION BY RANGE (created_at)
+    """)
+    op.execute(
+        "CREATE INDEX ix_text_generations_user_theme_created "
+        "ON text_generations (user_id, theme, created_at)"
+    )
+
+    # Секции: от месяца самой старой записи до текущего месяца + MONTHS_AHEAD
+    current = date.today().replace(day=1)
+    oldest = conn.execute(sa.text("SELECT min(created_at) FROM text_generations_legacy")).scalar()
+    month = oldest.date().replace(day=1) if oldest else current
+    while month <= _add_months(current, MONTHS_AHEAD):
+        end = _add_months(month, 1)
+        op.execute(
+            f"CREATE TABLE text_generations_y{month.year:04d}m{month.month:02d} PARTITION OF text_generations "
+            f"FOR VALUES FROM ('{month.isoformat()}') TO ('{end.isoformat()}')"
+        )
+        month = end
+
+    op.execute("""
+        INSERT INTO text_generations (id, user_id, theme, created_at)
+        SELECT id, user_id, theme, coalesce(created_at, now()) FROM text_generations_legacy
+    """)
+    op.execute("ALTER SEQUENCE text_generations_id_seq OWNED BY text_generations.id")
+    op.execute("DROP TABLE text_generations_legacy")
+
+
+def downgrade():
+    op.execute("ALTER TABLE text_generations RENAME TO text_generations_partitioned")
+    op.execute("""
+        CREATE TABLE text_generations (
+            id INTEGER NOT NULL DEFAULT nextval('text_generations_id_seq') PRIMARY KEY,
+            user_id INTEGER NOT NULL,
+            theme VARCHAR NOT NULL,
+            created_at TIMESTAMP WITH TIME ZONE DEFAULT now()
+        )
+    """)
+    op.execute("CREATE INDEX ix_text_generations_user_id ON text_generations (user_id)")
+    op.execute("CREATE INDEX ix_text_generations_theme ON text_generations (theme)")
+    op.execute("""
+        INSERT INTO text_generations (id, user_id, theme, created_at)
+        SELECT id, user_id, theme, created_at FROM text_generations_partitioned
+    """)
+    op.execute("ALTER SEQUENCE text_generations_id_seq OWNED BY text_generations.id")
+    op.execute("DROP TABLE text_generations_partitioned")
@@ -0,0 +1,30 @@
+"""Restore user progress columns
+
+Revision ID: restore_user_progress_columns
+Revises: make_birthdate_required
+Create Date: 2026-10-18 00:00:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'restore_user_progress_columns'
+down_revision = 'make_birthdate_required'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Колонки могли остаться в БД с тех пор, как были закомментированы в модели
+    op.execute("ALTER TABLE users ADD COLUMN IF NOT EXISTS q_ok INTEGER NOT NULL DEFAULT 0")
+    op.execute("ALTER TABLE users ADD COLUMN IF NOT EXISTS q_tot INTEGER NOT NULL DEFAULT 0")
+    op.execute("ALTER TABLE users ADD COLUMN IF NOT EXISTS streak INTEGER NOT NULL DEFAULT 0")
+    op.execute("ALTER TABLE users ADD COLUMN IF NOT EXISTS last DATE")
+
+
+def downgrade():
+    op.drop_column('users', 'last')
+    op.drop_column('users', 'streak')
+    op.drop_column('users', 'q_tot')
+    op.drop_column('users', 'q_ok')
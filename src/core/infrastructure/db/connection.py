@@ -1,14 +1,29 @@
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine, AsyncEngine
 
 from config.settings import get_db_settings
+from core.infrastructure.db.pool_metrics import MeteredQueuePool, attach_pool_metrics
+from core.infrastructure.db.query_metrics import attach_query_metrics
 
 db_settings = get_db_settings()
 
 sqlalchemy_engine: AsyncEngine = create_async_engine(
     db_settings.db_url,
     echo=False,
-    future=True
+    future=True,
+    poolclass=MeteredQueuePool,
+    pool_size=db_settings.db_pool_size,
+    max_overflow=db_settings.db_max_overflow,
+    pool_timeout=db_settings.db_pool_timeout,
+    pool_recycle=db_settings.db_pool_recycle,
+    pool_pre_ping=db_settings.db_pool_pre_ping,
+    # Кэш подготовленных выражений: asyncpg на соединении и адаптер SQLAlchemy поверх него
+    connect_args={
+        "statement_cache_size": db_settings.db_statement_cache_size,
+        "prepared_statement_cache_size": db_settings.db_statement_cache_size,
+    },
 )
+attach_pool_metrics(sqlalchemy_engine)
+attach_query_metrics(sqlalchemy_engine)
 
 AsyncSessionLocal = async_sessionmaker(
     bind=sqlalchemy_engine,
@@ -0,0 +1,69 @@
+import asyncio
+import logging
+from typing import Callable
+
+from sqlalchemy.dialects.postgresql import Insert
+
+from core.infrastructure.db.connection import AsyncSessionLocal
+from core.infrastructure.db.user_ops import upsert_user_stars, upsert_theme_stat
+
+logger = logging.getLogger(__name__)
+
+
+class CounterCoalescer:
+    """
+    Складывает инкременты счётчиков в памяти процесса и записывает их пачкой.
+
+    Несколько инкрементов одного ключа (например, звёзды активного пользователя)
+    превращаются в одну строку upsert'а; flush выполняет один executemany в одной транзакции.
+    Строки сортируются по ключу, чтобы параллельные flush разных процессов не взаимоблокировались.
+    """
+
+    def __init__(self, statement: Callable[[], Insert], key_fields: tuple[str, ...], value_field: str):
+        self._statement = statement
+        self._key_fields = key_fields
+        self._value_field = value_field
+        self._pending: dict[tuple, int] = {}
+
+    def add(self, delta: int = 1, **key) -> None:
+        k = tuple(key[f] for f in self._key_fields)
+        self._pending[k] = self._pending.get(k, 0) + delta
+
+    async def flush(self) -> int:
+        """Записывает накопленные инкременты. Возвращает число записанных ключей."""
+        if not self._pending:
+            return 0
+        batch, self._pending = self._pending, {}
+        rows = [{**dict(zip(self._key_fields, k)), self._value_field: delta} for k, delta in sorted(batch.items())]
+        try:
+            async with AsyncSessionLocal.begin() as session:
+                await session.execute(self._statement(), rows)
+        except BaseException:
+            # Возвращаем неудачный (или прерванный отменой) пакет, складывая с инкрементами, пришедшими во время flush
+            for k, delta in batch.items():
+                self._pending[k] = self._pending.get(k, 0) + delta
+            raise
+        return len(rows)
+
+    async def run(self, interval: float) -> None:
+        """Фоновая задача: сбрасывает инкременты каждые interval секунд."""
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await self.flush()
+            except Exception as e:
+                logger.warning(f"Не удалось записать счётчики: {e}")
+
+
+star_counter = CounterCoalescer(upsert_user_stars, ("user_id",), "count")
+theme_counter = CounterCoalescer(upsert_theme_stat, ("user_id", "theme"), "texts")
+
+
+async def flush_counters() -> None:
+    await star_counter.flush()
+    await theme_counter.flush()
+
+
+async def run_counters_flush(interval: float) -> None:
+    """Фоновая задача: сбрасывает звёзды и счётчики тем каждые interval секунд."""
+    await asyncio.gather(star_counter.run(interval), theme_counter.run(interval))
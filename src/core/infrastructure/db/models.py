@@ -1,8 +1,8 @@
 from datetime import datetime, UTC, date
 from typing import Optional
 
-from sqlalchemy import Date, Boolean, JSON, Text, BigInteger, Enum
-from sqlalchemy import ForeignKey, UniqueConstraint, String, Integer, Column, DateTime, func
+from sqlalchemy import Date, Boolean, JSON, Text, BigInteger, Enum, Float, Index
+from sqlalchemy import ForeignKey, UniqueConstraint, String, Integer, Column, DateTime, Sequence, func
 
 from core.domain.models.user import Gender
 from sqlalchemy.orm import Mapped, mapped_column, relationship, DeclarativeBase
@@ -62,10 +62,10 @@ class User(Base):
     # has_requested_access = Column(Boolean, default=False)
     is_admin: Mapped[bool] = mapped_column(default=False)
     avatar: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
-    # q_ok: Mapped[int] = mapped_column(default=0)
-    # q_tot: Mapped[int] = mapped_column(default=0)
-    # streak: Mapped[int] = mapped_column(default=0)
-    # last: Mapped[date | None] = mapped_column(Date, nullable=True)
+    q_ok: Mapped[int] = mapped_column(default=0)
+    q_tot: Mapped[int] = mapped_column(default=0)
+    streak: Mapped[int] = mapped_column(default=0)
+    last: Mapped[date | None] = mapped_column(Date, nullable=True)
     # cards: Mapped[list["UserCards"]] = relationship(back_populates="owner", cascade="all,delete")
     quizzes: Mapped[list["UserQuizzes"]] = relationship(back_populates="user", cascade="all,delete")
     stars: Mapped[list["UserStars"]] = relationship(back_populates="user", cascade="all,delete")
@@ -89,15 +89,42 @@ class ThemeStat(Base):
     texts: Mapped[int] = mapped_column(default=0)
 
 
+TEXT_GENERATIONS_ID_SEQ = Sequence("text_generations_id_seq")
+
+
 class TextGeneration(Base):
+    """Журнал генераций текстов. Секционирован по месяцам created_at (см. text_log.ensure_text_log_partitions)."""
     __tablename__ = "text_generations"
 
-    id = Column(Integer, primary_key=True)
-    user_id = Column(Integer, index=True, nullable=False)
-    theme = Column(String, index=True, nullable=False)
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    # В составном ключе SQLAlchemy не считает id автоинкрементом — последовательность задаётся явно
+    # (та же, что в миграции partition_text_generations)
+    id = Column(Integer, TEXT_GENERATIONS_ID_SEQ, server_default=TEXT_GENERATIONS_ID_SEQ.next_value(),
+                primary_key=True, autoincrement=True)
+    user_id = Column(Integer, nullable=False)
+    theme = Column(String, nullable=False)
+    # Ключ секционирования обязан входить в первичный ключ
+    created_at = Column(DateTime(timezone=True), primary_key=True, server_default=func.now())
+
+    __table_args__ = (
+        Index("ix_text_generations_user_theme_created", "user_id", "theme", "created_at"),
+        {"postgresql_partition_by": "RANGE (created_at)"},
+    )
 
 
 class History(Base):
     __tablename__ = "history"
     hash: Mapped[str] = mapped_column(String, primary_key=True)
+
+
+class StatsSummary(Base):
+    """Материализованная общая статистика (одна строка id=1) для админ-панели."""
+    __tablename__ = "stats_summary"
+    id: Mapped[int] = mapped_column(primary_key=True, default=1)
+    total_users: Mapped[int] = mapped_column(BigInteger, default=0)
+    approved_users: Mapped[int] = mapped_column(BigInteger, default=0)
+    avg_accuracy: Mapped[float] = mapped_column(Float, default=0)
+    total_stars: Mapped[int] = mapped_column(BigInteger, default=0)
+    avg_active_seconds: Mapped[float] = mapped_column(Float, default=0)
+    total_questions: Mapped[int] = mapped_column(BigInteger, default=0)
+    total_cards: Mapped[int] = mapped_column(BigInteger, default=0)
+    refreshed_at = mapped_column(DateTime(timezone=True), default=lambda: datetime.now(UTC))
@@ -0,0 +1,125 @@
+import time
+from collections import deque
+from dataclasses import dataclass, asdict
+
+from sqlalchemy import event
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+from core.infrastructure.metrics import registry
+
+# Сколько последних ожиданий соединения учитывается в p95
+_WAIT_WINDOW = 1000
+
+# Поля PoolSnapshot: текущее состояние пула (gauge) и монотонные счётчики (counter) для /metrics
+_GAUGE_FIELDS = ("size", "checked_out", "overflow", "wait_avg_ms", "wait_p95_ms", "wait_max_ms")
+_COUNTER_FIELDS = ("checkouts", "overflow_events", "timeouts", "invalidated")
+
+
+@dataclass
+class PoolSnapshot:
+    size: int
+    checked_out: int
+    checked_in: int
+    overflow: int
+    checkouts: int
+    overflow_events: int
+    timeouts: int
+    invalidated: int
+    wait_avg_ms: float
+    wait_p95_ms: float
+    wait_max_ms: float
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+
+class PoolMetrics:
+    """
+    Счётчики пула соединений PostgreSQL: ожидание соединения, выходы в overflow,
+    таймауты ожидания и инвалидированные соединения.
+    Текущее состояние пула (size, checked_out, overflow) берётся из самого пула в snapshot.
+    """
+
+    def __init__(self):
+        self.checkouts = 0
+        self.overflow_events = 0
+        self.timeouts = 0
+        self.invalidated = 0
+        self._wait_total = 0.0
+        self._wait_max = 0.0
+        self._waits: deque[float] = deque(maxlen=_WAIT_WINDOW)
+
+    def observe_wait(self, seconds: float, overflowed: bool) -> None:
+        self.checkouts += 1
+        self._wait_total += seconds
+        self._wait_max = max(self._wait_max, seconds)
+        self._waits.append(seconds)
+        if overflowed:
+            self.overflow_events += 1
+
+    def snapshot(self, pool) -> PoolSnapshot:
+        waits = sorted(self._waits)
+        p95 = waits[min(len(waits) - 1, int(len(waits) * 0.95))] if waits else 0.0
+        return PoolSnapshot(
+            size=pool.size(),
+            checked_out=pool.checkedout(),
+            checked_in=pool.checkedin(),
+            overflow=max(pool.overflow(), 0),
+            checkouts=self.checkouts,
+            overflow_events=self.overflow_events,
+            timeouts=self.timeouts,
+            invalidated=self.invalidated,
+            wait_avg_ms=round(self._wait_total / self.checkouts * 1000, 2) if self.checkouts else 0.0,
+            wait_p95_ms=round(p95 * 1000, 2),
+            wait_max_ms=round(self._wait_max * 1000, 2),
+        )
+
+
+pool_metrics = PoolMetrics()
+
+
+class MeteredQueuePool(AsyncAdaptedQueuePool):
+    """
+    AsyncAdaptedQueuePool, замеряющий время получения соединения из пула.
+    Выход в overflow — это checkout, при котором пул открыл соединение сверх pool_size.
+    """
+
+    def _do_get(self):
+        overflow_before = self._overflow
+        started = time.perf_counter()
+        try:
+            conn = super()._do_get()
+        except PoolTimeoutError:
+            pool_metrics.timeouts += 1
+            raise
+        pool_metrics.observe_wait(time.perf_counter() - started,
+                                  self._overflow > overflow_before and self._overflow > 0)
+        return conn
+
+
+def attach_pool_metrics(engine) -> None:
+    """
+    Подписывается на события пула движка (инвалидированные соединения)
+    и публикует состояние пула в /metrics.
+    """
+
+    @event.listens_for(engine.sync_engine, "invalidate")
+    def _on_invalidate(dbapi_connection, connection_record, exception):
+        pool_metrics.invalidated += 1
+
+    registry.gauge("db_pool", "Состояние пула соединений PostgreSQL и время ожидания соединения",
+                   lambda: _collect(engine, _GAUGE_FIELDS), ("field",))
+    for field in _COUNTER_FIELDS:
+        registry.collected_counter(f"db_pool_{field}_total", f"Пул соединений PostgreSQL: {field}",
+                                   lambda field=field: [((), getattr(pool_metrics, field))])
+
+
+def _collect(engine, fields: tuple[str, ...]) -> list[tuple[tuple[str, ...], float]]:
+    snapshot = get_pool_snapshot(engine).to_dict()
+    return [((field,), snapshot[field]) for field in fields]
+
+
+def get_pool_snapshot(engine) -> PoolSnapshot:
+    """Текущее состояние пула движка и накопленные счётчики."""
+    return pool_metrics.snapshot(engine.sync_engine.pool)
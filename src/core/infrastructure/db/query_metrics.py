@@ -0,0 +1,33 @@
+import time
+
+from sqlalchemy import event
+
+from core.infrastructure.metrics import db_query_seconds, db_query_failures
+
+_OPERATIONS = {"SELECT", "INSERT", "UPDATE", "DELETE", "WITH"}
+
+
+def _operation(statement: str) -> str:
+    """Тип запроса для метки метрики: первое слово SQL (SELECT, INSERT, ...) или OTHER."""
+    word = statement.lstrip().split(None, 1)[0].upper() if statement.strip() else ""
+    return word if word in _OPERATIONS else "OTHER"
+
+
+def attach_query_metrics(engine) -> None:
+    """Замеряет время выполнения SQL-запросов движка (db_query_duration_seconds)."""
+
+    @event.listens_for(engine.sync_engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+    @event.listens_for(engine.sync_engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        started = conn.info["query_started"].pop()
+        db_query_seconds.observe(time.perf_counter() - started, operation=_operation(statement))
+
+    @event.listens_for(engine.sync_engine, "handle_error")
+    def _on_error(exception_context):
+        conn = exception_context.connection
+        if conn is not None and conn.info.get("query_started"):
+            conn.info["query_started"].pop()
+        db_query_failures.inc(operation=_operation(exception_context.statement or ""))
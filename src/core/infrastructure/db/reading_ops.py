@@ -0,0 +1,43 @@
+from config.constants import COUNTER_COALESCING_ENABLED
+from core.infrastructure.db.connection import AsyncSessionLocal
+from core.infrastructure.db.counters import star_counter, theme_counter
+from core.infrastructure.db.models import TextGeneration
+from core.infrastructure.db.stats_summary import bump_stats_summary
+from core.infrastructure.db.user_ops import update_streak_and_accuracy, add_user_stars, add_theme_texts
+
+
+async def save_reading_result(uid: int,
+                              theme: str,
+                              stars: int,
+                              answered_ok: int,
+                              answered_total: int) -> tuple[int, int]:
+    """
+    Сохраняет итог викторины одной транзакцией (unit of work):
+    запись в журнал генераций, серия и точность, звёзды, счётчик темы и счётчики stats_summary.
+    Звёзды и счётчик темы увеличиваются upsert'ами на стороне БД, поэтому параллельные
+    викторины не теряют обновления. При COUNTER_COALESCING_ENABLED они откладываются
+    в CounterCoalescer и записываются пачкой вне этой транзакции.
+
+    Args:
+        uid (int): Идентификатор пользователя (telegram_id).
+        theme (str): Тема викторины.
+        stars (int): Звёзды за викторину без бонуса за серию.
+        answered_ok (int): Сколько ответов было верными.
+        answered_total (int): Сколько всего было ответов.
+
+    Returns:
+        tuple[int, int]: Всего начислено звёзд (с бонусом) и бонус за серию.
+    """
+    async with AsyncSessionLocal.begin() as session:
+        session.add(TextGeneration(user_id=uid, theme=theme))
+        bonus = await update_streak_and_accuracy(uid, answered_ok, answered_total, session)
+        earned = stars + bonus
+        if COUNTER_COALESCING_ENABLED:
+            # Счётчики пишутся пачкой фоновой задачей (см. counters)
+            star_counter.add(earned, user_id=uid)
+            theme_counter.add(1, user_id=uid, theme=theme)
+        else:
+            await add_user_stars(uid, earned, session)
+            await add_theme_texts(uid, theme, 1, session)
+        await bump_stats_summary(stars=earned, questions=1, session=session)
+    return earned, bonus
@@ -1,12 +1,13 @@
 from datetime import date
-from typing import Optional, List, Callable
+from typing import Optional, List, Callable, Sequence
 
-from sqlalchemy import select, func
+from sqlalchemy import select, func, update, delete, Row
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from core.application.interfaces.repositories.user_repository import UserRepositoryInterface
-from core.domain.models.user import User, Gender
+from core.domain.models.user import User, Gender, UserSummary
 from core.infrastructure.db.connection import AsyncSessionLocal
+from core.infrastructure.db.text_log import day_bounds
 from core.infrastructure.db.models import User as UserORM, ThemeStat, UserCards, UserStars, TextGeneration
 
 
@@ -68,7 +69,12 @@ class SQLAlchemyUserRepository(UserRepositoryInterface):
         pass
 
     async def update_user_status(self, user_id: int, status: str):
-        pass
+        await self.session.execute(
+            update(UserORM).where(UserORM.telegram_id == user_id).values(status=status)
+        )
+
+    async def delete_user(self, user_id: int):
+        await self.session.execute(delete(UserORM).where(UserORM.telegram_id == user_id))
 
     async def get_all(self) -> Optional[list[User]]:
         result = await self.session.execute(select(UserORM))
@@ -106,12 +112,94 @@ class SQLAlchemyUserRepository(UserRepositoryInterface):
         result = await self.session.execute(stmt)
         return result.scalar() or 0
 
+    async def get_summary(self, uid: int) -> Optional[UserSummary]:
+        """
+        Возвращает профиль пользователя со статистикой за один запрос:
+        звёзды, карточки, сумма вопросов и разбивка по темам считаются скалярными подзапросами к строке users.
+        """
+        stars = (select(func.coalesce(func.sum(UserStars.count), 0))
+                 .where(UserStars.user_id == uid)
+                 .scalar_subquery())
+        cards = (select(func.count())
+                 .select_from(UserCards)
+                 .where(UserCards.user_id == uid)
+                 .scalar_subquery())
+        questions = (select(func.coalesce(func.sum(ThemeStat.texts), 0))
+                     .where(ThemeStat.user_id == uid)
+                     .scalar_subquery())
+        themes = (select(func.json_object_agg(ThemeStat.theme, ThemeStat.texts))
+                  .where(ThemeStat.user_id == uid)
+                  .scalar_subquery())
+        stmt = (select(UserORM,
+                       stars.label("stars"),
+                       cards.label("cards"),
+                       questions.label("questions"),
+                       themes.label("themes"))
+                .where(UserORM.telegram_id == uid))
+        row = (await self.session.execute(stmt)).one_or_none()
+        if row is None:
+            return None
+        user_orm = row.User
+        return UserSummary(
+            user=self._map_to_domain(user_orm),
+            stars=row.stars,
+            card_count=row.cards,
+            questions_count=row.questions,
+            q_ok=user_orm.q_ok or 0,
+            q_tot=user_orm.q_tot or 0,
+            streak=user_orm.streak or 0,
+            themes=row.themes or {},
+        )
+
+    async def get_users_page(self,
+                             limit: int,
+                             after_id: Optional[int] = None,
+                             before_id: Optional[int] = None) -> tuple[Sequence[Row], int]:
+        """
+        Keyset-страница пользователей по users.id со звёздами и карточками и общее число пользователей.
+        Звёзды, карточки и total считаются подзапросами в том же запросе — только для строк страницы.
+        """
+        stars = (select(func.coalesce(func.sum(UserStars.count), 0))
+                 .where(UserStars.user_id == UserORM.telegram_id)
+                 .correlate(UserORM)
+                 .scalar_subquery())
+        cards = (select(func.count())
+                 .select_from(UserCards)
+                 .where(UserCards.user_id == UserORM.telegram_id)
+                 .correlate(UserORM)
+                 .scalar_subquery())
+        total = select(func.count()).select_from(UserORM).scalar_subquery()
+        stmt = select(UserORM.id,
+                      UserORM.telegram_id,
+                      UserORM.name,
+                      UserORM.status,
+                      UserORM.q_ok,
+                      UserORM.q_tot,
+                      UserORM.streak,
+                      stars.label("stars"),
+                      cards.label("cards"),
+                      total.label("total"))
+        if before_id is not None:
+            # Предыдущая страница: берём ближайшие записи в обратном порядке и разворачиваем
+            stmt = stmt.where(UserORM.id < before_id).order_by(UserORM.id.desc())
+        else:
+            if after_id is not None:
+                stmt = stmt.where(UserORM.id > after_id)
+            stmt = stmt.order_by(UserORM.id)
+        rows = (await self.session.execute(stmt.limit(limit))).all()
+        if before_id is not None:
+            rows.reverse()
+        return rows, rows[0].total if rows else 0
+
     async def get_generated_count_today_by_user(self, user_id: int, theme: str) -> int:
-        today = date.today()
+        # Диапазон по created_at вместо date(created_at): работает индекс (user_id, theme, created_at)
+        # и отсекаются лишние месячные секции
+        start, end = day_bounds()
         stmt = select(func.count()).select_from(TextGeneration).where(
             TextGeneration.user_id == user_id,
             TextGeneration.theme == theme,
-            func.date(TextGeneration.created_at) == today
+            TextGeneration.created_at >= start,
+            TextGeneration.created_at < end
         )
         result = await self.session.execute(stmt)
         return result.scalar()
@@ -0,0 +1,98 @@
+import asyncio
+import logging
+from datetime import datetime, UTC
+from typing import Optional
+
+from sqlalchemy import select, func, update, case, cast, Float
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.infrastructure.db.connection import AsyncSessionLocal
+from core.infrastructure.db.models import StatsSummary, User, UserStars, ThemeStat, UserCards
+
+logger = logging.getLogger(__name__)
+
+SUMMARY_ID = 1
+
+
+def _aggregates() -> dict:
+    """Скалярные подзапросы для всех полей stats_summary — пересчёт целиком на стороне БД."""
+    accuracy = case((User.q_tot > 0, cast(User.q_ok, Float) / User.q_tot), else_=0.0)
+    active_seconds = func.coalesce(func.extract("epoch", User.last_active - User.first_active), 0)
+    return {
+        "total_users": select(func.count()).select_from(User).scalar_subquery(),
+        "approved_users": select(func.count()).select_from(User).where(User.status == "approved").scalar_subquery(),
+        "avg_accuracy": select(func.coalesce(func.avg(accuracy), 0)).scalar_subquery(),
+        "total_stars": select(func.coalesce(func.sum(UserStars.count), 0)).scalar_subquery(),
+        "avg_active_seconds": select(func.coalesce(func.avg(active_seconds), 0)).scalar_subquery(),
+        "total_questions": select(func.coalesce(func.sum(ThemeStat.texts), 0)).scalar_subquery(),
+        "total_cards": select(func.count()).select_from(UserCards).scalar_subquery(),
+    }
+
+
+async def refresh_stats_summary(session: AsyncSession = None) -> None:
+    """
+    Пересчитывает stats_summary одним INSERT ... SELECT ... ON CONFLICT.
+    Средние значения обновляются только здесь, счётчики дополнительно подправляет bump_stats_summary.
+    """
+    if session is None:
+        async with AsyncSessionLocal.begin() as session:
+            return await refresh_stats_summary(session)
+
+    values = {**_aggregates(), "refreshed_at": datetime.now(UTC)}
+    stmt = insert(StatsSummary).values(id=SUMMARY_ID, **values)
+    stmt = stmt.on_conflict_do_update(index_elements=[StatsSummary.id], set_=values)
+    await session.execute(stmt)
+
+
+async def get_stats_summary() -> Optional[StatsSummary]:
+    """Возвращает строку stats_summary; при первом обращении пересчитывает её."""
+    async with AsyncSessionLocal() as session:
+        summary = await session.get(StatsSummary, SUMMARY_ID)
+        if summary is None:
+            await refresh_stats_summary(session)
+            await session.commit()
+            summary = await session.get(StatsSummary, SUMMARY_ID)
+        return summary
+
+
+async def bump_stats_summary(users: int = 0,
+                             stars: int = 0,
+                             questions: int = 0,
+                             cards: int = 0,
+                             session: AsyncSession = None) -> None:
+    """
+    Инкрементально обновляет счётчики stats_summary по событию пользователя,
+    не дожидаясь планового пересчёта. Ошибки только логируются — пересчёт их исправит.
+    С session обновление выполняется в транзакции вызывающего (в точке сохранения),
+    чтобы счётчики фиксировались вместе с самим событием.
+    """
+    deltas = {
+        StatsSummary.total_users: users,
+        StatsSummary.total_stars: stars,
+        StatsSummary.total_questions: questions,
+        StatsSummary.total_cards: cards,
+    }
+    values = {column: column + delta for column, delta in deltas.items() if delta}
+    if not values:
+        return
+    stmt = update(StatsSummary).where(StatsSummary.id == SUMMARY_ID).values(values)
+    try:
+        if session is None:
+            async with AsyncSessionLocal.begin() as session:
+                await session.execute(stmt)
+        else:
+            async with session.begin_nested():
+                await session.execute(stmt)
+    except Exception as e:
+        logger.warning(f"Не удалось обновить stats_summary: {e}")
+
+
+async def run_stats_refresh(interval: float) -> None:
+    """Фоновая задача: пересчитывает stats_summary каждые interval секунд."""
+    while True:
+        try:
+            await refresh_stats_summary()
+        except Exception as e:
+            logger.warning(f"Не удалось пересчитать stats_summary: {e}")
+        await asyncio.sleep(interval)
@@ -1,8 +1,82 @@
+import asyncio
+import logging
+import re
+from datetime import date, datetime, timedelta
+from zoneinfo import ZoneInfo
+
+from sqlalchemy import text
+
+from config.constants import DAILY_QUOTA_TIMEZONE
+from .connection import AsyncSessionLocal
 from .models import TextGeneration
-from datetime import date
-from sqlalchemy import select, func
+
+logger = logging.getLogger(__name__)
+
+_tz = ZoneInfo(DAILY_QUOTA_TIMEZONE)
+_PARTITION_NAME = re.compile(r"^text_generations_y(\d{4})m(\d{2})$")
 
 
 async def log_text_generation(session, user_id: int, theme: str):
     session.add(TextGeneration(user_id=user_id, theme=theme))
     await session.commit()
+
+
+def day_bounds(day: date | None = None) -> tuple[datetime, datetime]:
+    """Начало дня и начало следующего дня в DAILY_QUOTA_TIMEZONE (для диапазонных условий по created_at)."""
+    day = day or datetime.now(_tz).date()
+    start = datetime.combine(day, datetime.min.time(), tzinfo=_tz)
+    return start, start + timedelta(days=1)
+
+
+def _add_months(month: date, months: int) -> date:
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(month: date) -> str:
+    return f"text_generations_y{month.year:04d}m{month.month:02d}"
+
+
+async def ensure_text_log_partitions(months_ahead: int) -> None:
+    """Создаёт месячные секции text_generations на текущий месяц и months_ahead месяцев вперёд."""
+    current = date.today().replace(day=1)
+    async with AsyncSessionLocal.begin() as session:
+        for i in range(months_ahead + 1):
+            start = _add_months(current, i)
+            end = _add_months(start, 1)
+            await session.execute(text(
+                f"CREATE TABLE IF NOT EXISTS {partition_name(start)} PARTITION OF text_generations "
+                f"FOR VALUES FROM ('{start.isoformat()}') TO ('{end.isoformat()}')"
+            ))
+
+
+async def drop_expired_text_log_partitions(retention_months: int) -> list[str]:
+    """Удаляет секции text_generations старше retention_months месяцев. Возвращает имена удалённых секций."""
+    cutoff = _add_months(date.today().replace(day=1), -retention_months)
+    dropped = []
+    async with AsyncSessionLocal.begin() as session:
+        rows = await session.execute(text(
+            "SELECT c.relname FROM pg_inherits i "
+            "JOIN pg_class c ON c.oid = i.inhrelid "
+            "JOIN pg_class p ON p.oid = i.inhparent "
+            "WHERE p.relname = 'text_generations'"
+        ))
+        for (name,) in rows.all():
+            match = _PARTITION_NAME.match(name)
+            if match and date(int(match[1]), int(match[2]), 1) < cutoff:
+                await session.execute(text(f"DROP TABLE IF EXISTS {name}"))
+                dropped.append(name)
+    return dropped
+
+
+async def run_text_log_maintenance(months_ahead: int, retention_months: int, interval: float) -> None:
+    """Фоновая задача: заранее создаёт секции журнала и удаляет устаревшие."""
+    while True:
+        try:
+            await ensure_text_log_partitions(months_ahead)
+            dropped = await drop_expired_text_log_partitions(retention_months)
+            if dropped:
+                logger.info(f"Удалены устаревшие секции журнала генераций: {', '.join(dropped)}")
+        except Exception as e:
+            logger.warning(f"Обслуживание секций text_generations не удалось: {e}")
+        await asyncio.sleep(interval)
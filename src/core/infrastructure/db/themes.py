@@ -1,15 +1,7 @@
 from sqlalchemy import select
 
-from core.infrastructure.db.models import ThemeStat, UserCards, ThemeSetting
-
-
-async def inc_theme(uid: int, theme: str):
-    async with AsyncSessionLocal.begin() as s:
-        ts = await s.get(ThemeStat, {"user_id": uid, "theme": theme})
-        if ts:
-            ts.texts += 1
-        else:
-            s.add(ThemeStat(user_id=uid, theme=theme, texts=1))
+from core.infrastructure.db.connection import AsyncSessionLocal
+from core.infrastructure.db.models import UserCards, ThemeSetting
 
 
 async def all_cards(uid: int) -> dict[str, list[dict]]:
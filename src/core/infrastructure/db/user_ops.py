@@ -1,8 +1,9 @@
 from datetime import date, timedelta
-from datetime import datetime, UTC
+from datetime import datetime
 from typing import Optional
 
-from sqlalchemy import select, delete, func
+from sqlalchemy import select, delete, update, func
+from sqlalchemy.dialects.postgresql import insert, Insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from core.infrastructure.db.connection import AsyncSessionLocal
@@ -200,27 +201,28 @@ def delete_theme_stats_for_user(user_id: int) -> delete:
     return delete(ThemeStat).where(ThemeStat.user_id == user_id)
 
 
-async def update_user_accuracy(uid: int, correct: bool, session: AsyncSession):
+def upsert_theme_stat() -> Insert:
     """
-    Обновляет статистику точности пользователя.
+    Формирует INSERT ... ON CONFLICT DO UPDATE, увеличивающий ThemeStat.texts на стороне БД.
+    Параметры передаются при выполнении: {"user_id", "theme", "texts"} или их список (executemany).
 
-    Args:
-    uid (int): Идентификатор пользователя.
-    correct (bool): Был ли ответ верным.
-    session (AsyncSession): Асинхронная сессия SQLAlchemy.
+    Returns:
+        Insert: SQL-выражение insert.
     """
-    # Get user from session directly
-    user = await session.get(User, uid)
-    if user is None:
-        # Create a new user with default birthdate if not found
-        from datetime import date
-        default_birthdate = date(2000, 1, 1)
-        user = User(id=uid, birthdate=default_birthdate)
-        session.add(user)
-
-    user.q_tot = (user.q_tot or 0) + 1
-    user.q_ok = (user.q_ok or 0) + int(correct)
-    await session.commit()
+    stmt = insert(ThemeStat)
+    return stmt.on_conflict_do_update(
+        index_elements=[ThemeStat.user_id, ThemeStat.theme],
+        set_={"texts": ThemeStat.texts + stmt.excluded.texts}
+    )
+
+
+async def add_theme_texts(user_id: int, theme: str, count: int, session: AsyncSession) -> int:
+    """Атомарно увеличивает ThemeStat.texts одним upsert'ом и возвращает новое значение."""
+    result = await session.execute(
+        upsert_theme_stat().returning(ThemeStat.texts),
+        {"user_id": user_id, "theme": theme, "texts": count}
+    )
+    return result.scalar_one()
 
 
 async def get_total_questions(user_id: int, session: AsyncSession) -> int:
@@ -271,20 +273,25 @@ async def get_user_card_count(user_id: int, session: AsyncSession) -> int:
     return result.scalar() or 0
 
 
-async def add_user_stars(uid: int, count: int, session: AsyncSession) -> UserStars:
-    """Добавляет звёзды пользователю."""
-    stmt = select(UserStars).where(UserStars.user_id == uid)
-    result = await session.execute(stmt)
-    user_stars = result.scalar_one_or_none()
+def upsert_user_stars() -> Insert:
+    """
+    Формирует INSERT ... ON CONFLICT DO UPDATE, добавляющий звёзды на стороне БД (без гонок read-modify-write).
+    Параметры передаются при выполнении: {"user_id", "count"} или их список (executemany).
+    """
+    stmt = insert(UserStars)
+    return stmt.on_conflict_do_update(
+        index_elements=[UserStars.user_id],
+        set_={"count": UserStars.count + stmt.excluded.count, "updated_at": func.now()}
+    )
 
-    if user_stars:
-        user_stars.count += count
-        user_stars.updated_at = datetime.now(UTC)
-    else:
-        user_stars = UserStars(user_id=uid, count=count)
-        session.add(user_stars)
 
-    return user_stars
+async def add_user_stars(uid: int, count: int, session: AsyncSession) -> int:
+    """Атомарно добавляет звёзды пользователю одним upsert'ом и возвращает новое количество."""
+    result = await session.execute(
+        upsert_user_stars().returning(UserStars.count),
+        {"user_id": uid, "count": count}
+    )
+    return result.scalar_one()
 
 
 async def add_user_quiz(user_id: int, quiz_data: dict, session: AsyncSession = None) -> UserQuizzes:
@@ -301,35 +308,33 @@ async def add_user_quiz(user_id: int, quiz_data: dict, session: AsyncSession = N
     return quiz
 
 
-async def update_streak(uid: int, session: AsyncSession) -> int:
+async def update_streak_and_accuracy(uid: int, answered_ok: int, answered_total: int, session: AsyncSession) -> int:
     """
-    Обновляет серию активности пользователя.
+    Обновляет серию активности и точность пользователя за одну викторину.
+    Строка пользователя блокируется (SELECT ... FOR UPDATE) до конца транзакции вызывающего кода.
     Возвращает 5 за продолжение серии, иначе 0.
 
     Args:
-        uid (int): Идентификатор пользователя.
+        uid (int): Идентификатор пользователя (telegram_id).
+        answered_ok (int): Сколько ответов было верными.
+        answered_total (int): Сколько всего было ответов.
         session (AsyncSession): Асинхронная сессия SQLAlchemy.
 
     Returns:
         int: Бонус за продолжение streak (5 или 0).
     """
-    # Get user from session directly
-    user = await session.get(User, uid)
-    if user is None:
-        # Create a new user with default birthdate if not found
-        default_birthdate = date(2000, 1, 1)
-        user = User(id=uid, birthdate=default_birthdate)
-        session.add(user)
+    last = await session.scalar(
+        select(User.last).where(User.telegram_id == uid).with_for_update()
+    )
 
     today = date.today()
-    # Если streak уже сегодня обновлялся — возвращаем 0
-    if user.last == today:
-        return 0
-
-    # Бонус если предыдущий last — ровно вчера
-    bonus = 5 if user.last and (today - user.last == timedelta(days=1)) else 0
-    user.streak = (user.streak or 0) + 1 if bonus else 1
-    user.last = today
-
-    await session.commit()
+    values = {"q_ok": User.q_ok + answered_ok, "q_tot": User.q_tot + answered_total}
+    bonus = 0
+    # Если streak уже сегодня обновлялся — серию не трогаем
+    if last != today:
+        # Бонус если предыдущий last — ровно вчера
+        bonus = 5 if last and (today - last == timedelta(days=1)) else 0
+        values.update(streak=User.streak + 1 if bonus else 1, last=today)
+
+    await session.execute(update(User).where(User.telegram_id == uid).values(**values))
     return bonus
@@ -0,0 +1,215 @@
+import math
+import time
+from contextlib import contextmanager
+from typing import Callable, Iterable
+
+from config.constants import METRICS_LATENCY_BUCKETS, METRICS_LLM_BUCKETS
+
+LabelValues = tuple[str, ...]
+# Коллектор метрик, значения которых хранятся вне реестра: вызывается при рендере
+# и возвращает пары (значения меток, значение)
+Collector = Callable[[], Iterable[tuple[LabelValues, float]]]
+
+
+def _escape(value: str) -> str:
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_labels(names: tuple[str, ...], values: LabelValues, extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labels: tuple[str, ...] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labels = labels
+
+    def _key(self, labels: dict) -> LabelValues:
+        if set(labels) != set(self.labels):
+            raise ValueError(f"{self.name}: ожидаются метки {self.labels}, получены {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.labels)
+
+    def header(self) -> list[str]:
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+
+    def samples(self) -> list[str]:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    """Монотонно растущий счётчик."""
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labels: tuple[str, ...] = ()):
+        super().__init__(name, documentation, labels)
+        self._values: dict[LabelValues, float] = {}
+
+    def inc(self, amount: float = 1, **labels) -> None:
+        key = self._key(labels)
+        self._values[key] = self._values.get(key, 0) + amount
+
+    def samples(self) -> list[str]:
+        return [f"{self.name}{_format_labels(self.labels, key)} {_format_value(value)}"
+                for key, value in self._values.items()]
+
+
+class Histogram(_Metric):
+    """Гистограмма с фиксированными бакетами (кумулятивные счётчики, сумма и количество)."""
+    kind = "histogram"
+
+    def __init__(self,
+                 name: str,
+                 documentation: str,
+                 labels: tuple[str, ...] = (),
+                 buckets: tuple[float, ...] = METRICS_LATENCY_BUCKETS):
+        super().__init__(name, documentation, labels)
+        self.buckets = tuple(sorted(buckets)) + (math.inf,)
+        self._counts: dict[LabelValues, list[int]] = {}
+        self._sums: dict[LabelValues, float] = {}
+
+    def observe(self, value: float, **labels) -> None:
+        key = self._key(labels)
+        counts = self._counts.setdefault(key, [0] * len(self.buckets))
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                counts[i] += 1
+                break
+        self._sums[key] = self._sums.get(key, 0.0) + value
+
+    @contextmanager
+    def time(self, **labels):
+        """Замеряет время выполнения блока with (в том числе завершившегося исключением)."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, **labels)
+
+    def samples(self) -> list[str]:
+        lines = []
+        for key, counts in self._counts.items():
+            cumulative = 0
+            for bound, count in zip(self.buckets, counts):
+                cumulative += count
+                le = f'le="{_format_value(bound)}"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.labels, key, le)} {cumulative}")
+            labels = _format_labels(self.labels, key)
+            lines.append(f"{self.name}_sum{labels} {_format_value(self._sums[key])}")
+            lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+
+class Gauge(_Metric):
+    """Значение, которое читается из collector в момент рендера (например, состояние пула)."""
+    kind = "gauge"
+
+    def __init__(self, name: str, documentation: str, collector: Collector, labels: tuple[str, ...] = ()):
+        super().__init__(name, documentation, labels)
+        self._collector = collector
+
+    def samples(self) -> list[str]:
+        return [f"{self.name}{_format_labels(self.labels, key)} {_format_value(value)}"
+                for key, value in self._collector()]
+
+
+class CollectedCounter(Gauge):
+    """Монотонный счётчик, который ведётся вне реестра и читается из collector в момент рендера."""
+    kind = "counter"
+
+
+class MetricsRegistry:
+    """
+    Реестр метрик процесса. Рендерит их в текстовом формате Prometheus (exposition format 0.0.4).
+    Метрики обновляются из event loop, поэтому блокировки не нужны.
+    """
+
+    def __init__(self):
+        self._metrics: dict[str, _Metric] = {}
+
+    def _register(self, metric: _Metric) -> _Metric:
+        if metric.name in self._metrics:
+            raise ValueError(f"Метрика {metric.name} уже зарегистрирована")
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, documentation: str, labels: tuple[str, ...] = ()) -> Counter:
+        return self._register(Counter(name, documentation, labels))
+
+    def histogram(self,
+                  name: str,
+                  documentation: str,
+                  labels: tuple[str, ...] = (),
+                  buckets: tuple[float, ...] = METRICS_LATENCY_BUCKETS) -> Histogram:
+        return self._register(Histogram(name, documentation, labels, buckets))
+
+    def gauge(self, name: str, documentation: str, collector: Collector, labels: tuple[str, ...] = ()) -> Gauge:
+        return self._register(Gauge(name, documentation, collector, labels))
+
+    def collected_counter(self,
+                          name: str,
+                          documentation: str,
+                          collector: Collector,
+                          labels: tuple[str, ...] = ()) -> CollectedCounter:
+        return self._register(CollectedCounter(name, documentation, collector, labels))
+
+    def render(self) -> str:
+        lines = []
+        for metric in self._metrics.values():
+            try:
+                samples = metric.samples()
+            except Exception:
+                # Сбой коллектора не должен ломать весь /metrics
+                continue
+            lines.extend(metric.header())
+            lines.extend(samples)
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
+
+# HTTP (в том числе webhook Telegram)
+http_request_seconds = registry.histogram(
+    "http_request_duration_seconds", "Время обработки HTTP-запроса", ("method", "path", "status"))
+
+# Хендлеры aiogram
+handler_seconds = registry.histogram(
+    "bot_handler_duration_seconds", "Время работы хендлера бота", ("handler", "event"))
+handler_failures = registry.counter(
+    "bot_handler_failures_total", "Хендлеры бота, завершившиеся исключением", ("handler", "event"))
+
+# LLM и генерация изображений
+llm_request_seconds = registry.histogram(
+    "llm_request_duration_seconds", "Время запроса к провайдеру LLM", ("kind", "provider", "model"),
+    buckets=METRICS_LLM_BUCKETS)
+llm_requests = registry.counter(
+    "llm_requests_total", "Запросы к провайдерам LLM по исходу", ("kind", "provider", "model", "status"))
+llm_retries = registry.counter(
+    "llm_retries_total", "Повторные попытки генерации после ошибки провайдера", ("kind",))
+
+# PostgreSQL
+db_query_seconds = registry.histogram(
+    "db_query_duration_seconds", "Время выполнения SQL-запроса", ("operation",))
+db_query_failures = registry.counter(
+    "db_query_failures_total", "SQL-запросы, завершившиеся ошибкой", ("operation",))
+
+# Redis
+redis_roundtrip_seconds = registry.histogram(
+    "redis_roundtrip_duration_seconds", "Время от отправки команды (или пайплайна) Redis до ответа")
+
+# MinIO
+minio_upload_seconds = registry.histogram(
+    "minio_upload_duration_seconds", "Время загрузки объекта в MinIO", ("bucket",))
+minio_upload_failures = registry.counter(
+    "minio_upload_failures_total", "Неудачные загрузки в MinIO", ("bucket",))
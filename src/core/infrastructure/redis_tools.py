@@ -1,5 +1,7 @@
 import redis.asyncio as redis
 
+from core.infrastructure.clients.redis_client import TimedConnection
+
 class RedisClient:
     def __init__(self, url: str):
         self._url = url
@@ -7,7 +9,7 @@ class RedisClient:
 
     async def connect(self):
         if not self._redis:
-            self._redis = await redis.from_url(self._url, decode_responses=False)  # decode_responses=False чтобы хранить байты
+            self._redis = await redis.from_url(self._url, decode_responses=False, connection_class=TimedConnection)  # decode_responses=False чтобы хранить байты
         return self._redis
 
     async def set(self, key, value, ex=None):
@@ -22,6 +24,28 @@ class RedisClient:
         r = await self.connect()
         await r.delete(key)
 
+    async def hgetall(self, key) -> dict[bytes, bytes]:
+        r = await self.connect()
+        return await r.hgetall(key)
+
+    async def pipeline(self, transaction: bool = True):
+        """Пайплайн redis-py: команды копятся и отправляются одним запросом в execute()."""
+        r = await self.connect()
+        return r.pipeline(transaction=transaction)
+
+    async def publish(self, channel: str, message):
+        r = await self.connect()
+        return await r.publish(channel, message)
+
+    async def pubsub(self):
+        r = await self.connect()
+        return r.pubsub()
+
+    async def close(self):
+        if self._redis:
+            await self._redis.aclose()
+            self._redis = None
+
     async def incr(self, key):
         r = await self.connect()
         return await r.incr(key)
@@ -0,0 +1,43 @@
+import time
+import uuid
+
+from redis.asyncio import Redis
+
+
+class SlidingWindowCounter:
+    """
+    Точный счётчик событий пользователя за скользящее окно на sorted set Redis.
+
+    Каждое событие — элемент с score = время события. Устаревшие элементы
+    удаляются ZREMRANGEBYSCORE при записи, подсчёт — ZCOUNT по окну (O(log n)).
+    Ключ живёт не дольше окна после последнего события.
+
+    Пример:
+        attempts = SlidingWindowCounter(redis, "users:{user_id}:avatar_attempts", 24 * 60 * 60)
+        count, event_id = await attempts.hit(user_id)
+    """
+
+    def __init__(self, redis: Redis, key_template: str, window_seconds: int):
+        self.redis = redis
+        self.key_template = key_template
+        self.window_seconds = window_seconds
+
+    def _key(self, user_id) -> str:
+        return self.key_template.format(user_id=user_id)
+
+    async def hit(self, user_id) -> tuple[int, str]:
+        """Регистрирует событие. Возвращает число событий в окне (включая это) и id события."""
+        key = self._key(user_id)
+        now = time.time()
+        event_id = f"{now:.6f}:{uuid.uuid4().hex[:8]}"
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.zremrangebyscore(key, 0, now - self.window_seconds)
+            pipe.zadd(key, {event_id: now})
+            pipe.zcard(key)
+            pipe.expire(key, self.window_seconds)
+            _, _, count, _ = await pipe.execute()
+        return count, event_id
+
+    async def count(self, user_id) -> int:
+        """Число событий за последние window_seconds."""
+        return await self.redis.zcount(self._key(user_id), time.time() - self.window_seconds, "+inf")
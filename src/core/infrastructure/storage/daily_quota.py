@@ -0,0 +1,91 @@
+from config.constants import DAILY_QUOTA_KEY
+from config.settings import get_db_settings
+from core.infrastructure.db.repositories.sqlalchemy_user_repository import SQLAlchemyUserRepository
+from core.infrastructure.db.text_log import day_bounds
+from core.infrastructure.redis_tools import RedisClient
+
+_redis = RedisClient(get_db_settings().redis_url)
+
+
+# Резервирование слота: INCR и сравнение с лимитом одной атомарной операцией
+_RESERVE_LUA = """
+local count = redis.call('INCR', KEYS[1])
+if count > tonumber(ARGV[1]) then
+    redis.call('DECR', KEYS[1])
+    return 0
+end
+redis.call('EXPIREAT', KEYS[1], ARGV[2])
+return count
+"""
+
+# Возврат слота: счётчик не уходит ниже нуля
+_RELEASE_LUA = """
+if tonumber(redis.call('GET', KEYS[1]) or '0') > 0 then
+    return redis.call('DECR', KEYS[1])
+end
+return 0
+"""
+
+
+def _today_and_midnight() -> tuple[str, int]:
+    """Текущий день в DAILY_QUOTA_TIMEZONE и unix-время ближайшей полуночи (истечение счётчика)."""
+    start, end = day_bounds()
+    return start.date().isoformat(), int(end.timestamp())
+
+
+def _quota_key(uid: int, theme: str) -> tuple[str, int]:
+    day, midnight = _today_and_midnight()
+    return DAILY_QUOTA_KEY.format(user_id=uid, theme=theme, day=day), midnight
+
+
+async def _count_from_log(uid: int, theme: str) -> int:
+    """Число генераций за сегодня по журналу text_generations (только для заполнения счётчика)."""
+    async with SQLAlchemyUserRepository() as repo:
+        return await repo.get_generated_count_today_by_user(uid, theme) or 0
+
+
+async def _get_or_seed(r, key: str, midnight: int, uid: int, theme: str) -> int:
+    value = await r.get(key)
+    if value is not None:
+        return int(value)
+    count = await _count_from_log(uid, theme)
+    if not await r.set(key, count, nx=True, exat=midnight):
+        return int(await r.get(key) or 0)
+    return count
+
+
+async def get_daily_count(uid: int, theme: str) -> int:
+    """
+    Возвращает число генераций пользователя по теме за сегодня из Redis (вместе с начатыми чтениями).
+    Если счётчика ещё нет (первый запрос за день или Redis очищен), он заполняется
+    из журнала в БД через SET NX, чтобы не затереть параллельный INCR.
+    """
+    key, midnight = _quota_key(uid, theme)
+    return await _get_or_seed(await _redis.connect(), key, midnight, uid, theme)
+
+
+async def reserve_daily_slot(uid: int, theme: str, limit: int) -> bool:
+    """
+    Резервирует одну генерацию из дневного лимита: счётчик увеличивается, только если
+    после этого он не превысит limit (проверка и INCR атомарны, см. _RESERVE_LUA).
+    Возвращает False, если лимит исчерпан. Резерв учитывается сразу при начале чтения,
+    поэтому параллельные чтения не проходят сверх лимита; при неудачной генерации
+    слот возвращается через release_daily_slot.
+    """
+    key, midnight = _quota_key(uid, theme)
+    r = await _redis.connect()
+    await _get_or_seed(r, key, midnight, uid, theme)
+    reserve = r.register_script(_RESERVE_LUA)
+    return bool(await reserve(keys=[key], args=[limit, midnight]))
+
+
+async def release_daily_slot(uid: int, theme: str) -> None:
+    """Возвращает слот, зарезервированный reserve_daily_slot (генерация не удалась)."""
+    key, _ = _quota_key(uid, theme)
+    r = await _redis.connect()
+    release = r.register_script(_RELEASE_LUA)
+    await release(keys=[key])
+
+
+async def close_quota_store() -> None:
+    await _redis.close()
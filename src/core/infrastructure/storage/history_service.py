@@ -1,103 +1,110 @@
-import difflib
-from typing import List
+import hashlib
 
-from fastapi import Depends
+from pymongo.errors import DuplicateKeyError
 
-from core.infrastructure.clients.mongodb import get_history_collection
-
-# from sentence_transformers import SentenceTransformer
+from config.constants import MINHASH_SIMILARITY_THRESHOLD, MINHASH_INDEX_USERS, HISTORY_MAX_ITEMS
+from core.infrastructure.clients.mongodb import get_mongo_db
+from core.infrastructure.storage import semantic_index
+from core.infrastructure.storage.minhash import MinHashLSH, UserIndexCache, minhash_signature
 
 HISTORY_COLL = "history"
-# model = SentenceTransformer('all-MiniLM-L6-v2')
 
-async def texts_for(uid: int, mongo_db) -> List[str]:
-    """Возвращает список всех текстов, ранее сгенерированных пользователем."""
-    doc = await mongo_db.find_one({"_id": uid})
-    texts = doc.get("texts", []) if doc else []
-    return texts if isinstance(texts, list) else []
+_user_indexes: UserIndexCache[MinHashLSH] = UserIndexCache(MINHASH_INDEX_USERS)
+
+
+def text_hash(text: str) -> str:
+    """Ключ текста в истории: sha1 от текста без краевых пробелов."""
+    return hashlib.sha1(text.strip().encode()).hexdigest()
 
-async def remember_text(uid: int, text: str, max_items: int = 10_000) -> None:
+
+async def remember_text(uid: int, text: str, embedding=None, max_items: int = HISTORY_MAX_ITEMS) -> None:
     """
     Добавляет текст в историю пользователя, если его там ещё нет.
-    Хранит не более max_items уникальных записей для пользователя.
+    Хранит не более max_items последних записей для пользователя.
+
+    История — массив entries из отпечатков текста {hash, minhash[, emb]}, emb — эмбеддинг в float16
+    (см. semantic_index); сам текст не хранится, чтобы документ не упирался в лимит 16 МБ. Запись добавляется одним
+    атомарным $push с $slice; фильтр по entries.hash не даёт добавить текст дважды.
+    Если документ уже содержит этот hash, фильтр не совпадает и upsert падает
+    с DuplicateKeyError по _id — это значит, что текст уже есть.
     """
-    col = db[HISTORY_COLL]
-    doc = await col.find_one({"_id": uid})
-    if not doc:
-        await col.insert_one({"_id": uid, "texts": [text]})
+    col = get_mongo_db()[HISTORY_COLL]
+    entry = {"hash": text_hash(text), "minhash": minhash_signature(text)}
+    if embedding is not None:
+        entry["emb"] = semantic_index.to_bytes(embedding)
+    try:
+        await col.update_one(
+            {"_id": uid, "entries.hash": {"$ne": entry["hash"]}},
+            {"$push": {"entries": {"$each": [entry], "$slice": -max_items}}},
+            upsert=True,
+        )
+    except DuplicateKeyError:
         return
+    _add_to_index(uid, entry["minhash"])
+    if embedding is not None:
+        semantic_index.add_to_index(uid, embedding)
+
+
+async def has_text(uid: int, text: str) -> bool:
+    """
+    Проверяет, встречался ли текст в истории пользователя.
+    Поиск по hash выполняется на стороне MongoDB — история целиком не загружается.
+    """
+    col = get_mongo_db()[HISTORY_COLL]
+    doc = await col.find_one({"_id": uid, "entries.hash": text_hash(text)}, projection={"_id": 1})
+    return doc is not None
+
+
+def _add_to_index(uid: int, signature: list[int]) -> None:
+    """Дополняет уже загруженный индекс пользователя; незагруженный подтянет свежие данные сам."""
+    index = _user_indexes.get(uid)
+    if index is not None:
+        index.add(signature)
+
+
+async def _user_index(uid: int) -> MinHashLSH:
+    """LSH-индекс пользователя: при первом обращении загружается из MongoDB (только entries.minhash)."""
+    index = _user_indexes.get(uid)
+    if index is not None:
+        return index
+
+    col = get_mongo_db()[HISTORY_COLL]
+    doc = await col.find_one({"_id": uid}, projection={"entries.minhash": 1, "texts": 1})
+    if doc and "texts" in doc:
+        doc = await _migrate_legacy_history(uid, doc["texts"])
+    index = MinHashLSH()
+    for entry in (doc or {}).get("entries", []):
+        index.add(entry["minhash"])
+    _user_indexes.put(uid, index)
+    return index
+
+
+async def _migrate_legacy_history(uid: int, texts: list[str]) -> dict:
+    """Переводит историю старого формата (массив texts) в entries; выполняется один раз на пользователя."""
+    entries, seen = [], set()
+    for text in texts[-HISTORY_MAX_ITEMS:]:
+        h = text_hash(text)
+        if h not in seen:
+            seen.add(h)
+            entries.append({"hash": h, "minhash": minhash_signature(text)})
+    col = get_mongo_db()[HISTORY_COLL]
+    # $position: 0 — записи, добавленные уже в новом формате, остаются в конце истории
+    await col.update_one(
+        {"_id": uid},
+        {
+            "$push": {"entries": {"$each": entries, "$position": 0, "$slice": -HISTORY_MAX_ITEMS}},
+            "$unset": {"texts": "", "signatures": ""},
+        },
+    )
+    return await col.find_one({"_id": uid}, projection={"entries.minhash": 1})
 
-    texts = doc.get("texts", [])
-    if text in texts:
-        return
 
-    texts.append(text)
-    if len(texts) > max_items:
-        texts = texts[-max_items:]
-    await col.update_one({"_id": uid}, {"$set": {"texts": texts}})
-
-# async def remember_text_with_embedding(uid: int, text: str, max_items: int = 10_000):
-#     """
-#     Сохраняет текст и его эмбеддинг, если такого ещё нет у пользователя.
-#     """
-#     col = db[HISTORY_COLL]
-#     doc = await col.find_one({"_id": uid})
-#
-#     emb = model.encode(text, convert_to_numpy=True).tolist()
-#
-#     if not doc:
-#         await col.insert_one({"_id": uid, "texts": [{"text": text, "embedding": emb}]})
-#         return
-#
-#     texts = doc.get("texts", [])
-#     if any(t["text"] == text for t in texts):
-#         return
-#
-#     texts.append({"text": text, "embedding": emb})
-#     if len(texts) > max_items:
-#         texts = texts[-max_items:]
-#     await col.update_one({"_id": uid}, {"$set": {"texts": texts}})
-
-
-# async def text_is_semantically_similar_annoy(uid: int, new_text: str, threshold: float = 0.8) -> bool:
-#     """
-#     Проверяет, похож ли новый текст по смыслу на любой из сохранённых у пользователя.
-#     Использует сохранённые эмбеддинги + Annoy.
-#     """
-#     doc = await db[HISTORY_COLL].find_one({"_id": uid})
-#     if not doc or not doc.get("texts"):
-#         return False
-#
-#     texts_data = doc["texts"]
-#     embeddings = [t["embedding"] for t in texts_data if "embedding" in t]
-#     if not embeddings:
-#         return False
-#
-#     dim = len(embeddings[0])
-#     annoy_index = AnnoyIndex(dim, "angular")
-#     for idx, emb in enumerate(embeddings):
-#         annoy_index.add_item(idx, emb)
-#     annoy_index.build(10)
-#
-#     # Новый эмбеддинг
-#     new_emb = model.encode(new_text, convert_to_numpy=True)
-#
-#     # Получаем индекс самого похожего и расстояние
-#     idxs, dists = annoy_index.get_nns_by_vector(new_emb, 1, include_distances=True)
-#     if dists:
-#         angular_dist = dists[0]
-#         cos_sim = 1 - (angular_dist ** 2) / 2
-#     else:
-#         cos_sim = 0.0
-
-    # return cos_sim >= threshold
-
-async def text_is_semantically_similar(uid: int, new_text: str, threshold: float = 0.75) -> bool:
+async def text_is_semantically_similar(uid: int, new_text: str,
+                                       threshold: float = MINHASH_SIMILARITY_THRESHOLD) -> bool:
     """
     Проверяет, есть ли среди сохранённых пользователем текстов текст, похожий на new_text.
+    Сходство Жаккара по шинглам оценивается MinHash через LSH-индекс пользователя в памяти,
+    поэтому проверка не зависит от объёма истории.
     """
-    mongo_db = Depends(get_history_collection)
-    for old in await texts_for(uid, mongo_db):
-        if difflib.SequenceMatcher(None, new_text, old).ratio() >= threshold:
-            return True
-    return False
+    index = await _user_index(uid)
+    return index.max_similarity(minhash_signature(new_text)) >= threshold
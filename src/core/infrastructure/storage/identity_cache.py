@@ -0,0 +1,145 @@
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import date
+from typing import Optional
+
+from sqlalchemy import select
+
+from config.constants import IDENTITY_CACHE_TTL_SECONDS, IDENTITY_CACHE_SIZE, IDENTITY_INVALIDATE_CHANNEL
+from config.settings import get_db_settings
+from core.infrastructure.db.connection import AsyncSessionLocal
+from core.infrastructure.db.models import User as UserORM
+from core.infrastructure.redis_tools import RedisClient
+
+logger = logging.getLogger(__name__)
+
+_redis = RedisClient(get_db_settings().redis_url)
+
+
+@dataclass(frozen=True)
+class UserIdentity:
+    """Минимум данных о пользователе, нужный middleware и проверкам доступа."""
+    user_id: int  # users.id
+    telegram_id: int
+    is_admin: bool
+    status: str
+    birth_date: Optional[date]
+
+    @property
+    def is_approved(self) -> bool:
+        return self.status == "approved"
+
+
+class IdentityCache:
+    """
+    Общий кэш UserIdentity по telegram_id с TTL и LRU-вытеснением.
+
+    Запоминается и отсутствие пользователя (None), поэтому после регистрации, модерации
+    и удаления нужно вызывать invalidate: запись сбрасывается локально и в остальных
+    процессах через Redis pub/sub (см. listen). Одновременные промахи по одному
+    пользователю превращаются в один запрос к БД.
+
+    Загрузка, начатая до сброса, не попадает в кэш: drop убирает её future из _loading,
+    и результат сохраняется, только если future загрузки всё ещё текущий.
+    """
+
+    def __init__(self, ttl: float, maxsize: int):
+        self._ttl = ttl
+        self._maxsize = maxsize
+        self._items: OrderedDict[int, tuple[float, Optional[UserIdentity]]] = OrderedDict()
+        self._loading: dict[int, asyncio.Future] = {}
+
+    async def get(self, telegram_id: int) -> Optional[UserIdentity]:
+        item = self._items.get(telegram_id)
+        if item and item[0] > time.monotonic():
+            self._items.move_to_end(telegram_id)
+            return item[1]
+
+        future = self._loading.get(telegram_id)
+        if future:
+            return await asyncio.shield(future)
+        future = asyncio.get_running_loop().create_future()
+        self._loading[telegram_id] = future
+        try:
+            identity = await self._load(telegram_id)
+            future.set_result(identity)
+        except BaseException as e:
+            if self._loading.get(telegram_id) is future:
+                del self._loading[telegram_id]
+            if isinstance(e, asyncio.CancelledError):
+                future.cancel()
+            else:
+                future.set_exception(e)
+                # Исключение уже получили ожидающие; помечаем его как обработанное
+                future.exception()
+            raise
+
+        if self._loading.get(telegram_id) is not future:
+            # Во время загрузки запись сбросили — результат мог устареть, в кэш его не кладём
+            return identity
+        del self._loading[telegram_id]
+        self._items[telegram_id] = (time.monotonic() + self._ttl, identity)
+        self._items.move_to_end(telegram_id)
+        while len(self._items) > self._maxsize:
+            self._items.popitem(last=False)
+        return identity
+
+    def drop(self, telegram_id: int) -> None:
+        """Сбрасывает запись и незавершённую загрузку только в текущем процессе."""
+        self._items.pop(telegram_id, None)
+        self._loading.pop(telegram_id, None)
+
+    async def invalidate(self, telegram_id: int) -> None:
+        """Сбрасывает запись в текущем процессе и публикует сброс для остальных."""
+        self.drop(telegram_id)
+        try:
+            await _redis.publish(IDENTITY_INVALIDATE_CHANNEL, str(telegram_id))
+        except Exception as e:
+            logger.warning(f"Не удалось опубликовать сброс кэша пользователя {telegram_id}: {e}")
+
+    async def listen(self) -> None:
+        """Фоновая задача: принимает сбросы кэша из других процессов."""
+        while True:
+            try:
+                pubsub = await _redis.pubsub()
+                await pubsub.subscribe(IDENTITY_INVALIDATE_CHANNEL)
+                try:
+                    async for message in pubsub.listen():
+                        if message["type"] == "message":
+                            self.drop(int(message["data"]))
+                finally:
+                    await pubsub.aclose()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                # Пока подписка не работает, устаревание ограничено TTL
+                logger.warning(f"Подписка на сброс кэша пользователей прервана: {e}")
+                self._items.clear()
+                self._loading.clear()
+                await asyncio.sleep(1)
+
+    @staticmethod
+    async def _load(telegram_id: int) -> Optional[UserIdentity]:
+        stmt = select(UserORM.id, UserORM.telegram_id, UserORM.is_admin, UserORM.status, UserORM.birth_date) \
+            .where(UserORM.telegram_id == telegram_id)
+        async with AsyncSessionLocal() as session:
+            row = (await session.execute(stmt)).one_or_none()
+        if row is None:
+            return None
+        return UserIdentity(
+            user_id=row.id,
+            telegram_id=row.telegram_id,
+            is_admin=bool(row.is_admin),
+            status=row.status,
+            birth_date=row.birth_date,
+        )
+
+
+identity_cache = IdentityCache(ttl=IDENTITY_CACHE_TTL_SECONDS, maxsize=IDENTITY_CACHE_SIZE)
+
+
+async def close_identity_cache() -> None:
+    await _redis.close()
@@ -0,0 +1,99 @@
+import hashlib
+import random
+import re
+from collections import OrderedDict
+from typing import Generic, Iterable, TypeVar
+
+MINHASH_PERMUTATIONS = 64
+MINHASH_BANDS = 16
+MINHASH_ROWS = MINHASH_PERMUTATIONS // MINHASH_BANDS
+SHINGLE_SIZE = 3
+
+_MERSENNE_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 61) - 1
+# Фиксированный seed: сигнатуры хранятся в MongoDB и должны совпадать между перезапусками
+_rng = random.Random(20240601)
+_PERMUTATIONS = [
+    (_rng.randrange(1, _MERSENNE_PRIME), _rng.randrange(0, _MERSENNE_PRIME))
+    for _ in range(MINHASH_PERMUTATIONS)
+]
+
+Signature = list[int]
+IndexT = TypeVar("IndexT")
+
+
+def shingles(text: str, size: int = SHINGLE_SIZE) -> set[int]:
+    """Хэши словесных шинглов (по size слов) нормализованного текста."""
+    words = re.findall(r"\w+", text.lower())
+    if len(words) < size:
+        words_groups = [" ".join(words)] if words else []
+    else:
+        words_groups = (" ".join(words[i:i + size]) for i in range(len(words) - size + 1))
+    return {
+        int.from_bytes(hashlib.blake2b(group.encode(), digest_size=8).digest(), "big") & _MAX_HASH
+        for group in words_groups
+    }
+
+
+def minhash_signature(text: str) -> Signature:
+    """MinHash-сигнатура текста из MINHASH_PERMUTATIONS значений."""
+    hashes = shingles(text)
+    if not hashes:
+        return [_MAX_HASH] * MINHASH_PERMUTATIONS
+    return [min((a * h + b) % _MERSENNE_PRIME for h in hashes) for a, b in _PERMUTATIONS]
+
+
+def estimate_jaccard(left: Signature, right: Signature) -> float:
+    """Оценка сходства Жаккара множеств шинглов по двум сигнатурам."""
+    return sum(1 for x, y in zip(left, right) if x == y) / MINHASH_PERMUTATIONS
+
+
+class MinHashLSH:
+    """
+    LSH-индекс сигнатур: сигнатура режется на MINHASH_BANDS полос по MINHASH_ROWS значений,
+    тексты с совпавшей хотя бы одной полосой становятся кандидатами и сравниваются по сигнатуре.
+    Порог срабатывания полос ~ (1/bands)^(1/rows) = 0.5.
+    """
+
+    def __init__(self):
+        self._signatures: list[Signature] = []
+        self._buckets: dict[tuple[int, tuple[int, ...]], list[int]] = {}
+
+    def __len__(self) -> int:
+        return len(self._signatures)
+
+    @staticmethod
+    def _bands(signature: Signature) -> Iterable[tuple[int, tuple[int, ...]]]:
+        for band in range(MINHASH_BANDS):
+            yield band, tuple(signature[band * MINHASH_ROWS:(band + 1) * MINHASH_ROWS])
+
+    def add(self, signature: Signature) -> None:
+        idx = len(self._signatures)
+        self._signatures.append(signature)
+        for key in self._bands(signature):
+            self._buckets.setdefault(key, []).append(idx)
+
+    def max_similarity(self, signature: Signature) -> float:
+        """Наибольшее оценочное сходство с кандидатами из индекса (0.0, если кандидатов нет)."""
+        candidates = {idx for key in self._bands(signature) for idx in self._buckets.get(key, ())}
+        return max((estimate_jaccard(signature, self._signatures[idx]) for idx in candidates), default=0.0)
+
+
+class UserIndexCache(Generic[IndexT]):
+    """LRU-кэш индексов пользователей в памяти процесса."""
+
+    def __init__(self, max_users: int):
+        self.max_users = max_users
+        self._indexes: OrderedDict[int, IndexT] = OrderedDict()
+
+    def get(self, uid: int) -> IndexT | None:
+        index = self._indexes.get(uid)
+        if index is not None:
+            self._indexes.move_to_end(uid)
+        return index
+
+    def put(self, uid: int, index: IndexT) -> None:
+        self._indexes[uid] = index
+        self._indexes.move_to_end(uid)
+        while len(self._indexes) > self.max_users:
+            self._indexes.popitem(last=False)
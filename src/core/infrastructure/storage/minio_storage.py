@@ -4,6 +4,8 @@ from datetime import timedelta
 from minio import Minio
 from io import BytesIO
 
+from core.infrastructure.metrics import minio_upload_seconds, minio_upload_failures
+
 class MinioImageStorage:
     def __init__(self, minio_client: Minio, bucket_name: str, url_prefix: str):
         self.client = minio_client
@@ -12,16 +14,21 @@ class MinioImageStorage:
 
     async def save(self, image_bytes: bytes, object_name: str, ext: str = "png") -> str:
         from asyncio import get_running_loop
-        await get_running_loop().run_in_executor(
-            None,
-            lambda: self.client.put_object(
-                self.bucket,
-                object_name,
-                BytesIO(image_bytes),
-                length=len(image_bytes),
-                content_type=f"image/{ext}",
-            )
-        )
+        try:
+            with minio_upload_seconds.time(bucket=self.bucket):
+                await get_running_loop().run_in_executor(
+                    None,
+                    lambda: self.client.put_object(
+                        self.bucket,
+                        object_name,
+                        BytesIO(image_bytes),
+                        length=len(image_bytes),
+                        content_type=f"image/{ext}",
+                    )
+                )
+        except Exception:
+            minio_upload_failures.inc(bucket=self.bucket)
+            raise
         return object_name
 
     def get_presigned_url(self, object_name: str, expires_minutes: int = 60) -> str:
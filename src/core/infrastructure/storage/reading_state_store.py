@@ -0,0 +1,108 @@
+from typing import Optional
+
+import msgpack
+
+from config.constants import READING_SESSION_KEY, READING_SESSION_TTL
+from config.settings import get_db_settings
+from core.domain.models.state import ReadingState
+from core.infrastructure.redis_tools import RedisClient
+
+# Отдельный клиент с decode_responses=False: поля сессии хранятся в msgpack (байты)
+_redis = RedisClient(get_db_settings().redis_url)
+
+# Поля хэша сессии: static пишется один раз, остальные — маленькие изменяемые значения
+F_STATIC = "static"
+F_WRONG = "wrong"
+F_ASKED = "asked"
+F_CURRENT = "cur"
+F_FEEDBACK = "fb"
+F_OPTIONS = "opts"
+
+
+def _pack(value) -> bytes:
+    return msgpack.packb(value, use_bin_type=True)
+
+
+def _unpack(raw: bytes):
+    return msgpack.unpackb(raw, raw=False)
+
+
+def _asked_mask(qs: ReadingState) -> int:
+    """asked (множество текстов вопросов) -> битовая маска индексов вопросов."""
+    return sum(1 << i for i, item in enumerate(qs.qa) if item["question"] in qs.asked)
+
+
+def _progress(qs: ReadingState, options: list[str]) -> dict[str, bytes]:
+    return {
+        F_WRONG: _pack(qs.wrong),
+        F_ASKED: _pack(_asked_mask(qs)),
+        F_CURRENT: _pack(qs.current),
+        F_FEEDBACK: _pack(qs.feedback_msg_id),
+        F_OPTIONS: _pack(options),
+    }
+
+
+async def _write(uid: int, fields: dict[str, bytes]) -> None:
+    key = READING_SESSION_KEY.format(user_id=uid)
+    pipe = await _redis.pipeline(transaction=False)
+    pipe.hset(key, mapping=fields)
+    pipe.expire(key, READING_SESSION_TTL)
+    await pipe.execute()
+
+
+async def save_session(qs: ReadingState, options: list[str]) -> None:
+    """
+    Сохраняет новую сессию чтения. Неизменяемая часть (текст, вопросы, карточка)
+    пишется один раз в поле static; прогресс — в отдельные поля.
+    """
+    static = {
+        "theme": qs.theme,
+        "qa": [[item["question"], item["options"]] for item in qs.qa],
+        "card": qs.card_title,
+        "words": qs.word_count,
+        "text": qs.full_text,
+        "age": qs.age_prompt_id,
+    }
+    await _write(qs.uid, {F_STATIC: _pack(static), **_progress(qs, options)})
+
+
+async def save_progress(qs: ReadingState, options: list[str]) -> None:
+    """
+    Обновляет только изменяемые поля сессии одной записью:
+    ошибки, заданные вопросы, текущий вопрос, фидбек, варианты.
+    """
+    await _write(qs.uid, _progress(qs, options))
+
+
+async def load_session(uid: int) -> Optional[tuple[ReadingState, list[str]]]:
+    """Загружает сессию одним HGETALL: состояние викторины и перемешанные варианты текущего вопроса."""
+    raw = await _redis.hgetall(READING_SESSION_KEY.format(user_id=uid))
+    if not raw or F_STATIC.encode() not in raw:
+        return None
+    fields = {k.decode(): _unpack(v) for k, v in raw.items()}
+    static = fields[F_STATIC]
+    qa = [{"question": question, "options": options} for question, options in static["qa"]]
+    asked = fields[F_ASKED]
+    qs = ReadingState(
+        uid=uid,
+        theme=static["theme"],
+        qa=qa,
+        asked={item["question"] for i, item in enumerate(qa) if asked & (1 << i)},
+        correct=qa[fields[F_CURRENT]]["options"][0],
+        wrong=fields[F_WRONG],
+        card_title=static["card"],
+        word_count=static["words"],
+        full_text=static["text"],
+        age_prompt_id=static["age"],
+        feedback_msg_id=fields[F_FEEDBACK],
+        current=fields[F_CURRENT],
+    )
+    return qs, fields[F_OPTIONS]
+
+
+async def delete_session(uid: int) -> None:
+    await _redis.delete(READING_SESSION_KEY.format(user_id=uid))
+
+
+async def close_store() -> None:
+    await _redis.close()
@@ -0,0 +1,116 @@
+import asyncio
+import logging
+from typing import Optional
+
+from config.constants import (
+    SEMANTIC_MODEL_NAME,
+    SEMANTIC_SIMILARITY_THRESHOLD,
+    SEMANTIC_INDEX_USERS
+)
+from core.infrastructure.clients.mongodb import get_mongo_db
+from core.infrastructure.storage.minhash import UserIndexCache
+
+try:
+    import numpy as np
+    from sentence_transformers import SentenceTransformer
+except ImportError:  # extras "semantic" не установлены — смысловая проверка отключена
+    np = None
+    SentenceTransformer = None
+
+logger = logging.getLogger(__name__)
+
+HISTORY_COLL = "history"
+
+_model = None
+_model_lock = asyncio.Lock()
+_user_indexes = UserIndexCache(SEMANTIC_INDEX_USERS)
+
+
+def is_available() -> bool:
+    return SentenceTransformer is not None
+
+
+async def _get_model():
+    """Локальная CPU-модель эмбеддингов; загружается один раз и в отдельном потоке."""
+    global _model
+    if _model is None:
+        async with _model_lock:
+            if _model is None:
+                loop = asyncio.get_running_loop()
+                _model = await loop.run_in_executor(None, lambda: SentenceTransformer(SEMANTIC_MODEL_NAME,
+                                                                                      device="cpu"))
+                logger.info(f"✅ Embedding model {SEMANTIC_MODEL_NAME} loaded")
+    return _model
+
+
+async def embed_text(text: str) -> Optional["np.ndarray"]:
+    """Нормализованный эмбеддинг текста (float32) либо None, если модель недоступна."""
+    if not is_available():
+        return None
+    model = await _get_model()
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        None, lambda: model.encode(text, convert_to_numpy=True, normalize_embeddings=True)
+    )
+
+
+def to_bytes(embedding: "np.ndarray") -> bytes:
+    """Компактное хранение эмбеддинга: float16, 2 байта на измерение."""
+    return embedding.astype(np.float16).tobytes()
+
+
+class EmbeddingIndex:
+    """
+    Матрица эмбеддингов пользователя (float16), дополняемая по одному вектору.
+    Поиск — скалярное произведение со всеми векторами (эмбеддинги нормализованы,
+    так что это косинусное сходство); на истории в пару тысяч текстов это доли миллисекунды.
+    """
+
+    def __init__(self, dim: int, capacity: int = 64):
+        self._matrix = np.zeros((capacity, dim), dtype=np.float16)
+        self._size = 0
+
+    def add(self, embedding: "np.ndarray") -> None:
+        if self._size == len(self._matrix):
+            grown = np.zeros((len(self._matrix) * 2, self._matrix.shape[1]), dtype=np.float16)
+            grown[:self._size] = self._matrix[:self._size]
+            self._matrix = grown
+        self._matrix[self._size] = embedding
+        self._size += 1
+
+    def max_similarity(self, embedding: "np.ndarray") -> float:
+        if not self._size:
+            return 0.0
+        scores = self._matrix[:self._size].astype(np.float32) @ embedding.astype(np.float32)
+        return float(scores.max())
+
+
+async def _user_index(uid: int, dim: int) -> EmbeddingIndex:
+    """Индекс пользователя: при первом обращении загружается из MongoDB (только entries.emb)."""
+    index = _user_indexes.get(uid)
+    if index is not None:
+        return index
+
+    index = EmbeddingIndex(dim)
+    doc = await get_mongo_db()[HISTORY_COLL].find_one({"_id": uid}, projection={"entries.emb": 1})
+    for entry in (doc or {}).get("entries", []):
+        if entry.get("emb"):
+            index.add(np.frombuffer(entry["emb"], dtype=np.float16))
+    _user_indexes.put(uid, index)
+    return index
+
+
+def add_to_index(uid: int, embedding: "np.ndarray") -> None:
+    """Дополняет уже загруженный индекс пользователя."""
+    index = _user_indexes.get(uid)
+    if index is not None:
+        index.add(embedding)
+
+
+async def text_is_semantic_duplicate(uid: int, embedding: Optional["np.ndarray"],
+                                     threshold: float = SEMANTIC_SIMILARITY_THRESHOLD) -> bool:
+    """Проверяет, есть ли в истории пользователя текст, близкий по смыслу (косинус >= threshold)."""
+    if embedding is None:
+        return False
+    index = await _user_index(uid, embedding.shape[0])
+    return index.max_similarity(embedding) >= threshold
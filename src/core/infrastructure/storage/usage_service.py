@@ -0,0 +1,84 @@
+from datetime import timedelta
+
+from core.domain.models.usage import UsageRecord, UsageRollup
+from core.infrastructure.clients.mongodb import get_mongo_db
+from core.infrastructure.db.text_log import day_bounds
+
+USAGE_COLL = "llm_usage"
+USAGE_DAILY_COLL = "llm_usage_daily"
+
+
+async def save_usage(record: UsageRecord) -> None:
+    """
+    Добавляет запись расхода в журнал (только вставка) и обновляет дневной итог
+    по ключу (день, тип, провайдер, модель, тема) одним upsert с $inc.
+    День считается в DAILY_QUOTA_TIMEZONE, как и в отчёте (get_usage_rollups).
+    """
+    db = get_mongo_db()
+    doc = {k: v for k, v in record.__dict__.items() if v is not None}
+    await db[USAGE_COLL].insert_one(doc)
+
+    today_start, _ = day_bounds()
+    day = record.created_at.astimezone(today_start.tzinfo).date().isoformat()
+    theme = record.theme or "-"
+    await db[USAGE_DAILY_COLL].update_one(
+        {"_id": f"{day}|{record.kind}|{record.provider}|{record.model}|{theme}"},
+        {
+            "$setOnInsert": {
+                "day": day,
+                "kind": record.kind,
+                "provider": record.provider,
+                "model": record.model,
+                "theme": theme,
+            },
+            "$inc": {
+                "calls": 1,
+                "failed": 0 if record.success else 1,
+                "retries": record.retries,
+                "tokens_in": record.tokens_in or 0,
+                "tokens_out": record.tokens_out or 0,
+                "cost": record.cost,
+                "latency_ms": record.latency_ms,
+            },
+        },
+        upsert=True,
+    )
+
+
+async def get_usage_rollups(days: int, group_by: str) -> list[UsageRollup]:
+    """
+    Суммирует дневные итоги за последние days дней.
+    group_by: "model" — по провайдеру и модели, "theme" — по теме, "day" — по дням.
+    """
+    today_start, _ = day_bounds()
+    since = (today_start.date() - timedelta(days=days - 1)).isoformat()
+    group_keys = {
+        "model": {"$concat": ["$kind", ":", "$provider", "/", "$model"]},
+        "theme": "$theme",
+        "day": "$day",
+    }
+    pipeline = [
+        {"$match": {"day": {"$gte": since}}},
+        {"$group": {
+            "_id": group_keys[group_by],
+            "calls": {"$sum": "$calls"},
+            "failed": {"$sum": "$failed"},
+            "tokens_in": {"$sum": "$tokens_in"},
+            "tokens_out": {"$sum": "$tokens_out"},
+            "cost": {"$sum": "$cost"},
+            "latency_ms": {"$sum": "$latency_ms"},
+        }},
+        {"$sort": {"cost": -1, "calls": -1}},
+    ]
+    rollups = []
+    async for row in get_mongo_db()[USAGE_DAILY_COLL].aggregate(pipeline):
+        rollups.append(UsageRollup(
+            key=row["_id"],
+            calls=row["calls"],
+            failed=row["failed"],
+            tokens_in=row["tokens_in"],
+            tokens_out=row["tokens_out"],
+            cost=round(row["cost"], 6),
+            avg_latency_ms=row["latency_ms"] // row["calls"] if row["calls"] else 0,
+        ))
+    return rollups
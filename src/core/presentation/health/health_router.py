@@ -4,11 +4,14 @@ from fastapi import APIRouter, Request, status, Depends
 from starlette.responses import JSONResponse
 
 from core.application.services.health_service import HealthService
+from core.infrastructure.db.connection import sqlalchemy_engine
+from core.infrastructure.db.pool_metrics import get_pool_snapshot
 from core.presentation.deps import verify_api_key, get_health_service
 from core.presentation.health.schemas.response_health import (
     MongoHealthResponse,
     RedisHealthResponse,
     DBHealthResponse,
+    DBPoolHealthResponse,
     HealthStatusResponse,
     HealthCheckResponse,
 )
@@ -99,6 +102,17 @@ async def health_db(service: HealthService = Depends(get_health_service)) -> JSO
         )
 
 
+@router.get("/postgre/pool",
+            summary="PostgreSQL pool",
+            response_model=DBPoolHealthResponse,
+            response_description="Состояние пула соединений Postgre")
+async def health_db_pool() -> DBPoolHealthResponse:
+    """
+    Состояние пула соединений PostgreSQL: занятые соединения, overflow, время ожидания соединения.
+    """
+    return DBPoolHealthResponse(**get_pool_snapshot(sqlalchemy_engine).to_dict())
+
+
 @router.get("/summary",
             summary="Backend Server Info",
             response_model=HealthStatusResponse,
@@ -41,6 +41,19 @@ class DBHealthResponse(BaseModel):
     tables_count: Optional[int] = None
     error: Optional[str] = None
 
+class DBPoolHealthResponse(BaseModel):
+    size: int
+    checked_out: int
+    checked_in: int
+    overflow: int
+    checkouts: int
+    overflow_events: int
+    timeouts: int
+    invalidated: int
+    wait_avg_ms: float
+    wait_p95_ms: float
+    wait_max_ms: float
+
 class DiskStatus(BaseModel):
     total_gb: float
     used_gb: float
@@ -0,0 +1,22 @@
+from fastapi import APIRouter, Depends
+from starlette.responses import PlainTextResponse
+
+from core.infrastructure.metrics import registry
+from core.presentation.deps import verify_api_key
+
+router = APIRouter(
+    tags=["metrics"],
+    dependencies=[Depends(verify_api_key)],
+)
+
+
+@router.get("/metrics",
+            summary="Metrics",
+            response_class=PlainTextResponse,
+            response_description="Метрики процесса в текстовом формате Prometheus")
+async def metrics() -> PlainTextResponse:
+    """
+    Гистограммы задержек (HTTP и webhook, хендлеры бота, LLM, SQL, Redis, MinIO),
+    счётчики ошибок и ретраев, состояние пула PostgreSQL.
+    """
+    return PlainTextResponse(registry.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
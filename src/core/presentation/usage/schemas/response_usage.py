@@ -0,0 +1,19 @@
+from pydantic import BaseModel
+from typing import List
+
+
+class UsageRollupResponse(BaseModel):
+    key: str
+    calls: int
+    failed: int
+    tokens_in: int
+    tokens_out: int
+    cost: float
+    avg_latency_ms: int
+
+
+class UsageReportResponse(BaseModel):
+    days: int
+    group_by: str
+    total_cost: float
+    items: List[UsageRollupResponse]
@@ -0,0 +1,34 @@
+from typing import Literal
+
+from fastapi import APIRouter, Depends, Query
+
+from config.constants import USAGE_REPORT_DAYS
+from core.infrastructure.storage.usage_service import get_usage_rollups
+from core.presentation.deps import verify_api_key
+from core.presentation.usage.schemas.response_usage import UsageReportResponse, UsageRollupResponse
+
+router = APIRouter(
+    prefix="/api/v1/usage",
+    tags=["usage"],
+    dependencies=[Depends(verify_api_key)],
+    responses={404: {"description": "Not found"}},
+)
+
+
+@router.get("/report",
+            summary="LLM usage",
+            response_model=UsageReportResponse,
+            response_description="Расход токенов и стоимость генераций по дневным итогам")
+async def usage_report(days: int = Query(USAGE_REPORT_DAYS, ge=1, le=365),
+                       group_by: Literal["model", "theme", "day"] = Query("model")) -> UsageReportResponse:
+    """
+    Расход LLM и генерации картинок за последние days дней,
+    сгруппированный по провайдеру/модели, теме или дню.
+    """
+    rollups = await get_usage_rollups(days, group_by)
+    return UsageReportResponse(
+        days=days,
+        group_by=group_by,
+        total_cost=round(sum(r.cost for r in rollups), 6),
+        items=[UsageRollupResponse(**r.__dict__) for r in rollups],
+    )
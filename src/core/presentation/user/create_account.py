@@ -5,8 +5,11 @@ from sqlalchemy import select
 
 from config.settings import get_tg_settings
 from core.domain.models.user import UserResponse
+from core.domain.services.users.user_progress import invalidate_user_summary
 from core.infrastructure.db.models import User as UserORM
 from core.infrastructure.db.repositories.sqlalchemy_user_repository import SQLAlchemyUserRepository
+from core.infrastructure.db.stats_summary import bump_stats_summary
+from core.infrastructure.storage.identity_cache import identity_cache
 from core.infrastructure.telegram.telegram_validation_service import validate_telegram_webapp_data
 from core.presentation.user.schemas.user_schema import RegistrationRequest
 from core.utils.telegram_utils import notify_admin_about_registration
@@ -61,6 +64,8 @@ async def register_user(
                     status="pending"
                 )
 
+                await bump_stats_summary(users=1, session=repo.session)
+
                 # Обновляем аватар пользователя
                 q = select(UserORM).where(UserORM.telegram_id == request.telegram_id)
                 result = await repo.session.execute(q)
@@ -87,6 +92,10 @@ async def register_user(
             logging.error(f"Ошибка при сохранении пользователя в базу данных: {e}")
             raise HTTPException(status_code=500, detail=f"Database error: {str(e)}")
 
+        # До регистрации в кэше могло остаться «пользователь не найден»
+        await identity_cache.invalidate(request.telegram_id)
+        invalidate_user_summary(request.telegram_id)
+
         # Отправляем уведомление администратору в фоне
         background_tasks.add_task(
             notify_admin_about_registration,
@@ -5,7 +5,7 @@ from config.settings import get_openai_settings, get_minio_settings
 from core.application.services.avatar_service import AvatarService
 from core.domain.models.user import UserProfileResponse
 from core.infrastructure.ai.openai_image_generator import OpenAIImageGenerator
-from core.infrastructure.db.repositories.sqlalchemy_user_repository import SQLAlchemyUserRepository
+from core.domain.services.users.user_progress import get_user_summary
 from core.infrastructure.image_tools import ImageTools
 from core.infrastructure.storage.minio_storage import MinioImageStorage
 from core.presentation.user.schemas.user_schema import GenerateAvatarResponse, GenerateAvatarRequest
@@ -37,16 +37,20 @@ def get_avatar_service(request: Request) -> AvatarService:
 @router.get("/profile", response_model=UserProfileResponse)
 async def get_user_profile(user_id: int = Query(..., alias="userId")):
     try:
-        async with SQLAlchemyUserRepository() as repo:
-            user_data = await repo.get_by_id(user_id)
+        summary = await get_user_summary(user_id)
 
-        if not user_data:
+        if not summary:
             return JSONResponse(
                 status_code=200,
                 content={"success": False, "error": "User not found", "data": None}
             )
 
-        return UserProfileResponse(success=True, data=user_data.model_dump())
+        return UserProfileResponse(success=True, data={
+            **summary.user.model_dump(),
+            "stars": summary.stars,
+            "total_questions": summary.questions_count,
+            "card_count": summary.card_count,
+        })
 
     except HTTPException:
         raise
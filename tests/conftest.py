@@ -0,0 +1,5 @@
+import sys
+from pathlib import Path
+
+# Код приложения импортируется от src (from core..., from config...)
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
@@ -0,0 +1,50 @@
+import pytest
+
+from core.infrastructure.clients.ai.utils.tolerant_json import parse_llm_json, REPAIR_INNER_QUOTES
+
+# Неэкранированные кавычки внутри строк: (ответ LLM, ожидаемый объект)
+INNER_QUOTE_CASES = [
+    ('{"text": "Он сказал "привет" и ушёл", "n": 1}',
+     {"text": 'Он сказал "привет" и ушёл', "n": 1}),
+    ('{"text": "Мама сказала "нет", потом ушла"}',
+     {"text": 'Мама сказала "нет", потом ушла'}),
+    ('{"text": "Он ответил "да", true story"}',
+     {"text": 'Он ответил "да", true story'}),
+    ('{"text": "Купил "три", 5 яблок", "n": 2}',
+     {"text": 'Купил "три", 5 яблок', "n": 2}),
+    ('{"text": "Это "null", а не ноль"}',
+     {"text": 'Это "null", а не ноль'}),
+    ('{"text": "Скобка "}" внутри"}',
+     {"text": 'Скобка "}" внутри'}),
+    ('{"text": "Слово "ключ": и дальше"}',
+     {"text": 'Слово "ключ": и дальше'}),
+    ('{"options": ["а "б", в", "г"]}',
+     {"options": ['а "б", в', "г"]}),
+    ('{"options": ["сказал "да", 5 раз", 7]}',
+     {"options": ['сказал "да", 5 раз', 7]}),
+    ('{"qa": [{"question": "Что значит "дом"?", "answer": "жильё"}]}',
+     {"qa": [{"question": 'Что значит "дом"?', "answer": "жильё"}]}),
+]
+
+
+@pytest.mark.parametrize("raw, expected", INNER_QUOTE_CASES)
+def test_inner_quotes(raw, expected):
+    data, repairs = parse_llm_json(raw)
+    assert data == expected
+    assert REPAIR_INNER_QUOTES in repairs
+
+
+# Кавычки, которые действительно закрывают строку, не должны приниматься за внутренние
+CLOSING_QUOTE_CASES = [
+    ('{"a": "x", "b": true, }', {"a": "x", "b": True}),
+    ('{"a": ["x", 1, null, "y"], "b": "z"}\nНадеюсь, это поможет', {"a": ["x", 1, None, "y"], "b": "z"}),
+    ('{"a": {"b": "c"}, "d": "e"', {"a": {"b": "c"}, "d": "e"}),
+    ('{"a": "x", "b": "обрез', {"a": "x", "b": "обрез"}),
+]
+
+
+@pytest.mark.parametrize("raw, expected", CLOSING_QUOTE_CASES)
+def test_closing_quotes(raw, expected):
+    data, repairs = parse_llm_json(raw)
+    assert data == expected
+    assert REPAIR_INNER_QUOTES not in repairs